@@ -0,0 +1,132 @@
+"""Measure the CPU time of one real-time viewer tick, before and after
+batching the processing.
+
+A tick filters the 5 s window of the 6 EXG channels, estimates their
+Welch PSD and the power of the 5 bands, and prepares the curves' data.
+"legacy" is the former per-channel Graph.update (DataFilter calls and
+.tolist() conversions); "batched" is EEGProcessor on the whole block;
+"streaming" filters only the samples of one update period (50 ms) with
+StreamingFilter into the display RingBuffer and updates IncrementalWelch,
+as Graph.update now does.
+Runs headless on a synthetic window; the legacy path needs the mindrove
+package.
+
+Run from Application/Data Collection/EEG:
+
+    python benchmarks/bench_eeg_processing.py --ticks 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+VIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "real_time_visualization")
+sys.path.insert(0, VIS_DIR)
+
+from eeg_processing import EEG_BANDS, EEGProcessor
+from ring_buffer import RingBuffer
+
+try:
+    from mindrove.data_filter import DataFilter, FilterTypes, WindowOperations, DetrendOperations
+except ImportError:
+    DataFilter = None
+
+
+def synthetic_window(n_channels, sampling_rate, seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(sampling_rate * seconds)) / sampling_rate
+    # Alpha and beta rhythms, mains hum, electrode offset and noise (uV)
+    rhythms = 20 * np.sin(2 * np.pi * 10 * t) + 5 * np.sin(2 * np.pi * 20 * t)
+    hum = 30 * np.sin(2 * np.pi * 50 * t)
+    offsets = rng.uniform(-500, 500, size=(n_channels, 1))
+    return offsets + rhythms + hum + 10 * rng.standard_normal((n_channels, len(t)))
+
+
+def legacy_tick(data, sampling_rate, psd_size):
+    band_sums = [0] * len(EEG_BANDS)
+    curves = []
+    for channel in data:
+        signal = channel.copy()
+        DataFilter.detrend(signal, DetrendOperations.CONSTANT.value)
+        DataFilter.perform_bandpass(signal, sampling_rate, 0.5, 50.0, 2,
+                                    FilterTypes.BUTTERWORTH.value, 0)
+        DataFilter.perform_bandstop(signal, sampling_rate, 49.0, 51.0, 2,
+                                    FilterTypes.BUTTERWORTH.value, 0)
+        curves.append(signal.tolist())
+        psd_data = DataFilter.get_psd_welch(
+            signal, psd_size, psd_size // 2, sampling_rate,
+            WindowOperations.BLACKMAN_HARRIS.value
+        )
+        lim = min(70, len(psd_data[0]))
+        curves.append((psd_data[1][:lim].tolist(), psd_data[0][:lim].tolist()))
+        for band, (_, low, high) in enumerate(EEG_BANDS):
+            band_sums[band] += DataFilter.get_band_power(psd_data, low, high)
+    return np.array(band_sums)
+
+
+def batched_tick(data, processor):
+    filtered = processor.filter(data)
+    psd, band_powers = processor.spectrum(filtered)
+    return band_powers.sum(axis=0)
+
+
+def streaming_tick(new_samples, stream_filter, window, spectrum):
+    window.extend(stream_filter.process(new_samples))
+    spectrum.update(window)
+    return spectrum.band_powers().sum(axis=0)
+
+
+def cpu_per_tick(tick, n_ticks):
+    tick()
+    start = time.process_time()
+    for _ in range(n_ticks):
+        tick()
+    return (time.process_time() - start) / n_ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sampling-rate", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--window", type=float, default=5.0)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--update-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    data = synthetic_window(args.channels, args.sampling_rate, args.window)
+    processor = EEGProcessor(args.sampling_rate)
+    psd_size = processor.welch.size
+
+    batched = cpu_per_tick(lambda: batched_tick(data, processor), args.ticks)
+    new_samples = data[:, :int(args.sampling_rate * args.update_ms / 1000)]
+    stream_filter = processor.streaming_filter()
+    window = RingBuffer(args.channels, data.shape[1])
+    spectrum = processor.incremental_welch(args.channels, data.shape[1])
+    window.extend(stream_filter.process(data))
+    spectrum.update(window)
+    streaming = cpu_per_tick(
+        lambda: streaming_tick(new_samples, stream_filter, window, spectrum), args.ticks
+    )
+    print(
+        f"streaming ({new_samples.shape[1]} new samples/tick): "
+        f"{streaming * 1e3:.3f} ms CPU/tick"
+    )
+    if DataFilter is None:
+        print("mindrove is not installed, only the batched path is measured")
+        print(f"batched: {batched * 1e3:.3f} ms CPU/tick")
+        return
+
+    legacy = cpu_per_tick(lambda: legacy_tick(data, args.sampling_rate, psd_size), args.ticks)
+    expected = legacy_tick(data, args.sampling_rate, psd_size)
+    band_error = np.max(np.abs(batched_tick(data, processor) / expected - 1))
+    print(
+        f"{args.channels} channels x {data.shape[1]} samples: "
+        f"legacy {legacy * 1e3:.3f} ms, batched {batched * 1e3:.3f} ms CPU/tick "
+        f"({legacy / batched:.1f}x), band power max rel. error {band_error:.1e}"
+    )
+
+
+if __name__ == "__main__":
+    main()
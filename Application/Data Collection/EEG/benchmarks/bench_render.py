@@ -0,0 +1,173 @@
+"""Measure the live plots' redraw with and without min/max decimation.
+
+First checks minmax_decimate on a synthetic window with spikes: every
+channel keeps its extrema, and the points of the bins shared by two
+successive windows do not move as the window scrolls. Then, when a Qt
+binding is installed, renders the 6 stacked time-series plots offscreen
+(full resolution vs decimated to their pixel width) and reports the cost
+of a frame. Finally replays frame times through FrameScheduler to show
+the redraw interval it settles on.
+Exits with status 1 if the decimation loses a peak or shimmers.
+
+Run from Application/Data Collection/EEG:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_render.py
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+VIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "real_time_visualization")
+sys.path.insert(0, VIS_DIR)
+
+from render import DecimatedCurves, FrameScheduler, minmax_decimate
+from ring_buffer import RingBuffer
+from bench_eeg_processing import synthetic_window
+
+try:
+    import pyqtgraph as pg
+except ImportError:
+    pg = None
+
+
+def spiky_stream(n_channels, sampling_rate, seconds):
+    stream = synthetic_window(n_channels, sampling_rate, seconds, seed=1)
+    rng = np.random.default_rng(2)
+    # One-sample artifacts, the kind averaging downsamplers hide
+    spikes = rng.integers(0, stream.shape[1], size=(n_channels, 20))
+    for channel, positions in enumerate(spikes):
+        stream[channel, positions] += rng.choice([-1, 1], size=positions.size) * 500
+    return stream
+
+
+def check_decimation(stream, span, bins, step):
+    failures = []
+    window = RingBuffer(stream.shape[0], span)
+    previous = None
+    for end in range(span, stream.shape[1], step):
+        window.extend(stream[:, window.written:end])
+        block = window.latest()
+        x, y = minmax_decimate(block, bins, window.written)
+        if not np.array_equal(y.max(axis=1), block.max(axis=1)) \
+                or not np.array_equal(y.min(axis=1), block.min(axis=1)):
+            failures.append(f"extrema lost in the window ending at {end}")
+        # Stream positions of the kept samples, compared with the previous
+        # window on the stream range both cover but their edge bins
+        positions = x + (window.written - span)
+        if previous is not None:
+            per_bin = -(-span // bins)
+            low = positions[0, 0] + 2 * per_bin
+            high = previous[0, -1] - 2 * per_bin
+            now = positions[:, (positions[0] >= low) & (positions[0] <= high)]
+            before = previous[:, (previous[0] >= low) & (previous[0] <= high)]
+            if not np.array_equal(now, before):
+                failures.append(f"points moved when scrolling to {end}")
+        previous = positions
+    return failures
+
+
+def frame_cost(stream, span, frames, decimate, width=800, height=600):
+    app = pg.mkQApp()
+    win = pg.GraphicsLayoutWidget()
+    win.resize(width, height)
+    plots, curves = [], []
+    for i in range(stream.shape[0]):
+        plot = win.addPlot(row=i, col=0)
+        plot.hideAxis('left')
+        plot.hideAxis('bottom')
+        plots.append(plot)
+        curves.append(plot.plot())
+    win.show()
+    app.processEvents()
+    traces = DecimatedCurves(plots, curves)
+    window = RingBuffer(stream.shape[0], span)
+    window.extend(stream[:, :span])
+    step = (stream.shape[1] - span) // frames
+
+    elapsed = 0.0
+    for frame in range(frames):
+        window.extend(stream[:, window.written:window.written + step])
+        start = time.perf_counter()
+        if decimate:
+            traces.set_window(window.latest(), window.written)
+        else:
+            for curve, samples in zip(curves, window.latest()):
+                curve.setData(samples)
+        # Renders the scene, as the next paint event would
+        win.grab()
+        elapsed += time.perf_counter() - start
+    bins = traces.bins()
+    win.close()
+    return elapsed / frames, bins
+
+
+class ReplayTimer:
+    """The interval()/setInterval() of a QTimer, for the replay."""
+
+    def __init__(self, interval):
+        self._interval = interval
+        self.changes = 0
+
+    def interval(self):
+        return self._interval
+
+    def setInterval(self, interval):
+        self._interval = interval
+        self.changes += 1
+
+
+def replay_scheduler(interval_ms):
+    timer = ReplayTimer(interval_ms)
+    scheduler = FrameScheduler(timer, min_interval_ms=interval_ms)
+    rng = np.random.default_rng(4)
+    # A fast machine, then a laptop under load, then fast again (seconds)
+    for label, frame_time in (("8 ms frames", 0.008), ("60 ms frames", 0.060),
+                              ("100 ms frames", 0.100), ("8 ms frames again", 0.008)):
+        for _ in range(50):
+            scheduler.record(frame_time * rng.uniform(0.8, 1.2))
+        print(f"  {label:>18}: redraw every {timer.interval()} ms")
+    print(f"  {timer.changes} interval changes over {scheduler.frames} frames")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sampling-rate", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--window", type=float, default=5.0)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--bins", type=int, default=745, help="plot width in pixels for the check")
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    span = int(args.window * args.sampling_rate)
+    stream = spiky_stream(args.channels, args.sampling_rate, args.seconds)
+    # 25 samples per 50 ms update at 500 Hz
+    failures = check_decimation(stream, span, args.bins, max(1, args.sampling_rate // 20))
+    x, _ = minmax_decimate(stream[:, :span], args.bins)
+    print(f"decimation: {span} -> {x.shape[1]} points per channel, "
+          f"{'ok' if not failures else 'FAILED'}")
+
+    if pg is None:
+        print("render cost: skipped (no Qt binding installed)")
+    else:
+        # Warm-up (Qt start-up, first paints)
+        frame_cost(stream, span, 10, decimate=False)
+        full, _ = frame_cost(stream, span, args.frames, decimate=False)
+        decimated, bins = frame_cost(stream, span, args.frames, decimate=True)
+        print(f"render cost per frame ({args.channels} plots, {bins} px wide): "
+              f"full {full * 1e3:.2f} ms, decimated {decimated * 1e3:.2f} ms")
+
+    print("adaptive refresh:")
+    replay_scheduler(50)
+
+    if failures:
+        for failure in failures[:10]:
+            print(f"FAILED: {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
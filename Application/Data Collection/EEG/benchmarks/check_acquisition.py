@@ -0,0 +1,195 @@
+"""Check the background acquisition and its shared ring buffer.
+
+A mock board produces samples in real time (or the MindRove synthetic
+board with --synthetic); BoardAcquisition drains it into a deliberately
+small SharedRingBuffer while two consumers read it concurrently:
+
+- a fast reader, which must see every sample, in order, with no drop;
+- a slow reader, which stalls longer than the buffer holds: its dropped
+  counter must equal the samples it missed, and what it reads must stay
+  contiguous.
+
+Snapshots taken meanwhile must be contiguous too. The acquisition stats
+(latency, poll duration, drops) are printed. Exits with status 1 on a
+failure.
+
+Run from Application/Data Collection/EEG:
+
+    python benchmarks/check_acquisition.py [--synthetic]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+VIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "real_time_visualization")
+sys.path.insert(0, VIS_DIR)
+
+from acquisition import BoardAcquisition
+
+
+class MockBoard:
+    """Stand-in for a started BoardShim: ``sampling_rate`` samples per
+    second, row 0 holding the sample's index in the stream and the last
+    row its timestamp."""
+
+    board_id = -100
+
+    def __init__(self, sampling_rate=500, n_rows=12):
+        self.sampling_rate = sampling_rate
+        self.n_rows = n_rows
+        self.counter_channel = 0
+        self.start_time = time.time()
+        self.taken = 0
+        self._lock = threading.Lock()
+
+    def get_board_id(self):
+        return self.board_id
+
+    def get_sampling_rate(self, board_id):
+        return self.sampling_rate
+
+    def get_num_rows(self, board_id):
+        return self.n_rows
+
+    def get_timestamp_channel(self, board_id):
+        return self.n_rows - 1
+
+    def get_exg_channels(self, board_id):
+        return list(range(1, self.n_rows - 1))
+
+    def _produced(self):
+        return int((time.time() - self.start_time) * self.sampling_rate)
+
+    def get_board_data_count(self):
+        return self._produced() - self.taken
+
+    def get_board_data(self, count):
+        with self._lock:
+            count = min(count, self._produced() - self.taken)
+            index = np.arange(self.taken, self.taken + count)
+            self.taken += count
+        data = np.random.standard_normal((self.n_rows, count))
+        data[self.counter_channel] = index
+        data[-1] = self.start_time + index / self.sampling_rate
+        return data
+
+
+def open_synthetic_board():
+    from mindrove.board_shim import BoardShim, MindRoveInputParams, BoardIds
+
+    board_shim = BoardShim(BoardIds.SYNTHETIC_BOARD, MindRoveInputParams())
+    board_shim.prepare_session()
+    board_shim.start_stream()
+    return board_shim
+
+
+def contiguous(values):
+    return values.size < 2 or bool(np.all(np.diff(values) == 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", action="store_true",
+                        help="use the MindRove synthetic board instead of the mock")
+    parser.add_argument("--sampling-rate", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=6.0)
+    parser.add_argument("--buffer-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        board_shim = open_synthetic_board()
+        # The synthetic board has a package counter, not a stream index
+        counter_channel = board_shim.get_package_num_channel(board_shim.get_board_id())
+        counter_step = None
+    else:
+        board_shim = MockBoard(args.sampling_rate)
+        counter_channel = board_shim.counter_channel
+        counter_step = 1
+
+    acquisition = BoardAcquisition(board_shim, buffer_seconds=args.buffer_seconds)
+    fast = acquisition.reader("fast")
+    slow = acquisition.reader("slow")
+    failures = []
+    deadline = time.time() + args.seconds
+
+    def read_fast():
+        previous = None
+        while time.time() < deadline:
+            counters = fast.read()[counter_channel]
+            if counters.size and previous is not None:
+                counters = np.concatenate(([previous], counters))
+            if counter_step and not contiguous(counters):
+                failures.append("fast reader: samples out of order or missing")
+            if counters.size:
+                previous = counters[-1]
+            time.sleep(0.02)
+
+    def read_slow():
+        time.sleep(0.2)
+        slow.read()
+        start = slow.position
+        # Stalls for longer than the buffer holds
+        time.sleep(2 * args.buffer_seconds)
+        first_read = slow.position
+        block = slow.read()
+        expected_drop = slow.position - block.shape[1] - first_read
+        if slow.dropped != expected_drop or slow.dropped == 0:
+            failures.append(f"slow reader: dropped {slow.dropped}, expected {expected_drop} > 0")
+        if counter_step and not contiguous(block[counter_channel]):
+            failures.append("slow reader: torn read after the stall")
+        if counter_step and block.shape[1] and block[counter_channel, 0] != start + slow.dropped:
+            failures.append("slow reader: dropped count does not match the stream index")
+        while time.time() < deadline:
+            counters = slow.read()[counter_channel]
+            if counter_step and not contiguous(counters):
+                failures.append("slow reader: samples out of order or missing")
+            time.sleep(0.05)
+
+    def take_snapshots():
+        count = int(args.buffer_seconds * acquisition.sampling_rate)
+        snapshots = 0
+        while time.time() < deadline:
+            block = acquisition.buffer.snapshot(count)
+            if counter_step and not contiguous(block[counter_channel]):
+                failures.append("snapshot: not contiguous")
+            snapshots += 1
+            time.sleep(0.003)
+        print(f"{snapshots} snapshots of up to {count} samples")
+
+    consumers = [threading.Thread(target=target) for target in (read_fast, read_slow, take_snapshots)]
+    acquisition.start()
+    for consumer in consumers:
+        consumer.start()
+    for consumer in consumers:
+        consumer.join()
+    acquisition.stop()
+    if args.synthetic:
+        board_shim.stop_stream()
+        board_shim.release_session()
+
+    stats = acquisition.stats()
+    print(f"{stats['samples']} samples in {stats['polls']} polls "
+          f"({stats['samples'] / args.seconds:.0f} samples/s)")
+    print(f"latency: last {stats['latency_last'] * 1e3:.1f} ms, "
+          f"average {stats['latency_avg'] * 1e3:.1f} ms, max {stats['latency_max'] * 1e3:.1f} ms; "
+          f"longest poll {stats['poll_duration_max'] * 1e3:.2f} ms")
+    print(f"dropped per reader: {stats['dropped']}")
+
+    if acquisition.error is not None:
+        failures.append(f"acquisition failed: {acquisition.error!r}")
+    if stats["dropped"]["fast"]:
+        failures.append("fast reader dropped samples")
+    if not stats["samples"]:
+        failures.append("no samples acquired")
+    if failures:
+        for failure in sorted(set(failures)):
+            print(f"FAILED: {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
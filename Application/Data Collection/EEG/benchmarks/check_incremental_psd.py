@@ -0,0 +1,96 @@
+"""Check the incremental Welch estimator against a full recompute.
+
+A synthetic filtered stream is pushed in blocks of random sizes into the
+display RingBuffer and IncrementalWelch. After every update, its PSD and
+band powers must equal a Welch recompute over the same samples (the
+segments it covers). The difference between the band percentages shown
+by the viewer and those of a recompute over the whole window (whose
+segments are aligned on the window start rather than on the stream) is
+reported too, with the cost of both per update.
+Exits with status 1 on a mismatch.
+
+Run from Application/Data Collection/EEG:
+
+    python benchmarks/check_incremental_psd.py
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+VIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "real_time_visualization")
+sys.path.insert(0, VIS_DIR)
+
+from eeg_processing import EEGProcessor, EEG_BANDS, parse_bands
+from ring_buffer import RingBuffer
+from bench_eeg_processing import synthetic_window
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sampling-rate", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--window", type=float, default=5.0)
+    parser.add_argument("--max-block", type=int, default=100)
+    parser.add_argument("--bands", type=parse_bands, default=EEG_BANDS)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    processor = EEGProcessor(args.sampling_rate, bands=args.bands)
+    stream = processor.streaming_filter().process(
+        synthetic_window(args.channels, args.sampling_rate, args.seconds)
+    )
+    span = int(args.window * args.sampling_rate)
+    window = RingBuffer(args.channels, span)
+    spectrum = processor.incremental_welch(args.channels, span)
+
+    position, updates = 0, 0
+    psd_error = band_error = 0.0
+    window_deviation = []
+    incremental_time = full_time = 0.0
+    while position < stream.shape[1]:
+        block = stream[:, position:position + int(rng.integers(1, args.max_block + 1))]
+        window.extend(block)
+        position += block.shape[1]
+
+        start = time.perf_counter()
+        spectrum.update(window)
+        psd, band_powers = spectrum.psd(), spectrum.band_powers()
+        incremental_time += time.perf_counter() - start
+        start = time.perf_counter()
+        full = processor.spectrum(window.latest())
+        full_time += time.perf_counter() - start
+        if psd is None:
+            continue
+
+        first, end = spectrum.covered()
+        expected = processor.welch.psd(stream[:, first:end])
+        psd_error = max(psd_error, np.max(np.abs(psd - expected)) / np.max(expected))
+        band_error = max(band_error, np.max(np.abs(
+            band_powers / processor.welch.band_powers(expected) - 1
+        )))
+        if full[1] is not None:
+            shown = band_powers.sum(axis=0) / band_powers.sum()
+            recomputed = full[1].sum(axis=0) / full[1].sum()
+            window_deviation.append(100 * np.max(np.abs(shown - recomputed)))
+        updates += 1
+
+    print(f"{updates} updates, {len(spectrum)} segments of {processor.welch.size} samples")
+    print(f"vs recompute over the covered samples: PSD max rel. error {psd_error:.1e}, "
+          f"band powers {band_error:.1e}")
+    print(f"vs recompute over the whole window: band percentages differ by "
+          f"{np.median(window_deviation):.2f} points (median), "
+          f"{np.max(window_deviation):.2f} at most")
+    print(f"per update: incremental {incremental_time / updates * 1e3:.3f} ms, "
+          f"full recompute {full_time / updates * 1e3:.3f} ms")
+    if max(psd_error, band_error) > args.tolerance:
+        print("FAILED: the incremental estimate does not match the recompute")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
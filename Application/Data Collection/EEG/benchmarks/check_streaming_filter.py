@@ -0,0 +1,78 @@
+"""Check the streaming filter of the real-time viewer against offline
+filtering.
+
+A synthetic multi-channel signal (EEG rhythms, mains hum, electrode
+offsets, noise) is fed to StreamingFilter in blocks of random sizes, as
+the board delivers them, and the display RingBuffer keeps the last
+window. Both must match one offline filtering of the whole signal. The
+former approach (re-filtering the last window from rest at every
+update) is shown for comparison: its error is the edge transient.
+Exits with status 1 on a mismatch.
+
+Run from Application/Data Collection/EEG:
+
+    python benchmarks/check_streaming_filter.py
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+from scipy import signal
+
+VIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "real_time_visualization")
+sys.path.insert(0, VIS_DIR)
+
+from eeg_processing import EEGProcessor
+from ring_buffer import RingBuffer
+from bench_eeg_processing import synthetic_window
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sampling-rate", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--window", type=float, default=5.0)
+    parser.add_argument("--max-block", type=int, default=100)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    stream = synthetic_window(args.channels, args.sampling_rate, args.seconds)
+    processor = EEGProcessor(args.sampling_rate)
+    window_size = int(args.window * args.sampling_rate)
+
+    # Offline: the whole recording at once, from the same initial state
+    zi = signal.sosfilt_zi(processor.sos)[:, None, :] * stream[None, :, :1]
+    offline, _ = signal.sosfilt(processor.sos, stream, axis=1, zi=zi)
+
+    stream_filter = processor.streaming_filter()
+    window = RingBuffer(args.channels, window_size)
+    blocks, position, window_error = [], 0, 0.0
+    while position < stream.shape[1]:
+        size = int(rng.integers(0, args.max_block + 1))
+        filtered = stream_filter.process(stream[:, position:position + size])
+        blocks.append(filtered)
+        window.extend(filtered)
+        position += filtered.shape[1]
+        expected = offline[:, max(0, position - window_size):position]
+        window_error = max(window_error, np.max(np.abs(window.latest() - expected), initial=0.0))
+    stream_error = np.max(np.abs(np.concatenate(blocks, axis=1) - offline))
+
+    refiltered = processor.filter(stream[:, -window_size:])
+    scale = np.max(np.abs(offline[:, -window_size:]))
+    edge = np.max(np.abs(refiltered - offline[:, -window_size:])[:, :args.sampling_rate])
+
+    print(f"{len(blocks)} blocks, {stream.shape[1]} samples x {args.channels} channels")
+    print(f"streaming vs offline: max abs error {stream_error:.2e}")
+    print(f"display window vs offline: max abs error {window_error:.2e}")
+    print(f"re-filtered window vs offline, first second: max abs error {edge:.2e} "
+          f"({100 * edge / scale:.0f}% of the signal peak)")
+    if max(stream_error, window_error) > args.tolerance:
+        print("FAILED: the streaming filter does not match offline filtering")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
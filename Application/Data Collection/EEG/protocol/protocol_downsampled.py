@@ -13,6 +13,13 @@ from mindrove.board_shim import BoardShim, MindRoveInputParams, BoardIds
 from pyqtgraph.Qt import QtGui, QtCore
 import pyqtgraph as pg
 
+# Board acquisition and buffers shared with the real-time viewer
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'real_time_visualization'))
+from acquisition import BoardAcquisition
+from render import DecimatedCurves, FrameScheduler
+from ring_buffer import RingBuffer
+
 
 # ---------- Protocol Parameters ----------
 TIME_TO_BRING_FOOD_TO_MOUTH = 5   # seconds
@@ -23,7 +30,7 @@ AUDIO_FILE        = os.path.join('sounds', 'beep.mp3')
 CSV_FILE          = 'eeg_tasting_raw_data.csv'
 EEG_CHANNEL_COUNT = 6                   # first 6 EXG channels (the other 2 are the bias and reference channels)
 RECORD_DURATION   = TIME_TO_TASTE_FOOD  # duration (in seconds) of EEG recording
-PLOT_UPDATE_MS    = 50                  # redraw every 50 ms
+PLOT_UPDATE_MS    = 50                  # redraw at most every 50 ms
 SAMPLING_RATE     = 250                 # Hz (must evenly divide native rate)
 
 # ---------- Audio Setup ----------
@@ -36,13 +43,16 @@ def play_beep():
 
 # ---------- Real-time Plotting Thread ----------
 class PlotThread(threading.Thread):
-    def __init__(self, board_shim):
+    def __init__(self, acquisition):
         super().__init__(daemon=True)
-        self.board_shim  = board_shim
-        self.board_id    = board_shim.get_board_id()
+        self.board_id    = acquisition.board_id
         self.exg_chs     = BoardShim.get_exg_channels(self.board_id)[:EEG_CHANNEL_COUNT]
         self.fs          = BoardShim.get_sampling_rate(self.board_id)
         self.window_size = 5  # seconds of the window to display
+        # Reads the samples acquired since the last redraw; the board itself
+        # is only polled by the acquisition thread
+        self.reader = acquisition.reader('plot')
+        self.window = RingBuffer(len(self.exg_chs), int(self.fs * self.window_size))
         
         print(f"Board ID: {self.board_id}")
         print(f"EEG channels: {self.exg_chs}")
@@ -53,18 +63,22 @@ class PlotThread(threading.Thread):
         self.app = QtGui.QApplication([])
         self.win = pg.GraphicsLayoutWidget(title='Real-time EEG')
         self.win.resize(800, 600)
-        self.curves = []
+        self.plots, self.curves = [], []
         for i, ch in enumerate(self.exg_chs):
             p = self.win.addPlot(row=i, col=0)
             p.hideAxis('left')
             p.hideAxis('bottom')
             if i == 0:
                 p.setTitle('EEG Time Series')
+            self.plots.append(p)
             self.curves.append(p.plot())
+        # the window is drawn decimated to the plots' width
+        self.traces = DecimatedCurves(self.plots, self.curves)
         self.win.show()
 
-        # timer to fetch & draw
+        # timer to fetch & draw, slowed down when frames get slow
         self.timer = QtCore.QTimer()
+        self.scheduler = FrameScheduler(self.timer, min_interval_ms=PLOT_UPDATE_MS)
         self.timer.timeout.connect(self._update)
         self.timer.start(PLOT_UPDATE_MS)
 
@@ -72,12 +86,18 @@ class PlotThread(threading.Thread):
         self.app.exec_()
 
     def _update(self):
-        # number of points
-        npts = int(self.fs * self.window_size)
-        # fetch data and update curves
-        data = self.board_shim.get_current_board_data(npts)
-        for curve, ch in zip(self.curves, self.exg_chs):
-            curve.setData(data[ch].tolist())
+        # append the samples acquired since the last redraw to the window
+        data = self.reader.read()
+        if data.shape[1] == 0 and not self.traces.resized():
+            # nothing new to draw
+            self.scheduler.skip()
+            return
+        with self.scheduler.frame():
+            self.window.extend(data[self.exg_chs])
+            # update curves (min/max of each pixel column)
+            self.traces.set_window(self.window.latest(), self.window.written)
+            # paint now, so that the frame time includes the drawing
+            self.app.processEvents()
 
     def stop(self):
         # schedule quit() in the Qt event loop
@@ -114,6 +134,7 @@ def main():
     BoardShim.enable_dev_board_logger()
     params     = MindRoveInputParams()
     board_shim = BoardShim(BoardIds.MINDROVE_WIFI_BOARD, params)
+    acquisition = None
 
     # Check if the desired sampling rate divides the native sampling rate
     native_fs = board_shim.get_sampling_rate(BoardIds.MINDROVE_WIFI_BOARD)
@@ -134,8 +155,13 @@ def main():
             print("ERROR: Too few EEG samples received. Check Cap connection and try again.")
             sys.exit(1)
 
+        # From now on only the acquisition thread polls the board; the plot
+        # and the recording read what it buffered
+        acquisition = BoardAcquisition(board_shim)
+        acquisition.start()
+
         # Launch real-time plot in its own thread
-        plot_thread = PlotThread(board_shim)
+        plot_thread = PlotThread(acquisition)
         plot_thread.start()
 
         time.sleep(1)
@@ -169,7 +195,7 @@ def main():
 
         # Fetch full-rate data
         total_samples = int(native_fs * RECORD_DURATION)
-        raw = board_shim.get_current_board_data(total_samples)
+        raw = acquisition.buffer.snapshot(total_samples)
 
         # For each channel, apply anti-alias filter + decimate
         factor = native_fs // SAMPLING_RATE
@@ -187,8 +213,10 @@ def main():
             df[f'ch{idx}'] = dec_data[idx]
         df['subject']    = subject
         df['experiment_number'] = exp_num
-        # Tear down plot & board
+        # Tear down plot, acquisition & board
         plot_thread.stop()
+        acquisition.stop()
+        print(f"Acquisition: {acquisition.stats()}")
         board_shim.stop_stream()
         board_shim.release_session()
 
@@ -214,6 +242,8 @@ def main():
     except Exception as e:
         print("Error during session:", e)
     finally:
+        if acquisition is not None:
+            acquisition.stop()
         if board_shim.is_prepared():
             board_shim.release_session()
 
@@ -0,0 +1,94 @@
+"""Board acquisition in a thread of its own.
+
+The acquisition thread is the only one that talks to the board once the
+stream is started: it drains the board's buffer into a SharedRingBuffer
+holding every row of the board (EXG channels, timestamps, ...). The
+plots, the recorder and the analytics read from that buffer, each with
+its own reader, so a slow redraw never delays acquisition and no two
+threads share the board.
+"""
+import logging
+import threading
+import time
+
+from ring_buffer import SharedRingBuffer
+
+
+class BoardAcquisition(threading.Thread):
+    """Polls ``board_shim`` every ``poll_interval`` seconds and keeps the
+    last ``buffer_seconds`` of data.
+
+    ``board_shim`` is a started MindRove BoardShim, or any object with the
+    same data methods (see benchmarks/check_acquisition.py for a mock).
+    """
+
+    def __init__(self, board_shim, buffer_seconds=30, poll_interval=0.005):
+        super().__init__(name='board-acquisition', daemon=True)
+        self.board_shim = board_shim
+        self.board_id = board_shim.get_board_id()
+        self.sampling_rate = board_shim.get_sampling_rate(self.board_id)
+        self.timestamp_channel = board_shim.get_timestamp_channel(self.board_id)
+        self.poll_interval = poll_interval
+        self.buffer = SharedRingBuffer(board_shim.get_num_rows(self.board_id),
+                                       int(buffer_seconds * self.sampling_rate))
+        self.error = None
+        self._readers = {}
+        self._stop_event = threading.Event()
+
+        # Counters, updated by the acquisition thread only
+        self.polls = 0
+        self.samples = 0
+        # Age of the newest sample of a poll when it reaches the buffer
+        self.latency_last = 0.0
+        self.latency_max = 0.0
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        # Time spent in one poll (board calls and buffer write)
+        self.poll_duration_max = 0.0
+
+    def reader(self, name):
+        """New reader of the buffer, starting at the current position;
+        its dropped samples are reported in stats() under ``name``."""
+        reader = self.buffer.reader()
+        self._readers[name] = reader
+        return reader
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                self.poll()
+                self._stop_event.wait(self.poll_interval)
+        except Exception as e:
+            self.error = e
+            logging.warning('Acquisition stopped', exc_info=True)
+
+    def poll(self):
+        start = time.perf_counter()
+        count = self.board_shim.get_board_data_count()
+        if count > 0:
+            data = self.board_shim.get_board_data(count)
+            self.buffer.extend(data)
+            self.samples += data.shape[1]
+            latency = time.time() - data[self.timestamp_channel, -1]
+            self.latency_last = latency
+            self.latency_max = max(self.latency_max, latency)
+            self._latency_sum += latency
+            self._latency_count += 1
+        self.polls += 1
+        self.poll_duration_max = max(self.poll_duration_max, time.perf_counter() - start)
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def stats(self):
+        return {
+            'polls': self.polls,
+            'samples': self.samples,
+            'latency_last': self.latency_last,
+            'latency_avg': self._latency_sum / self._latency_count if self._latency_count else 0.0,
+            'latency_max': self.latency_max,
+            'poll_duration_max': self.poll_duration_max,
+            'dropped': {name: reader.dropped for name, reader in self._readers.items()},
+        }
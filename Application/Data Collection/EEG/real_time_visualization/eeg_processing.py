@@ -0,0 +1,268 @@
+"""Batched EEG processing for the real-time viewers.
+
+Works on a whole (channels, samples) block at once instead of channel by
+channel, with the same results as the MindRove DataFilter calls it
+replaces:
+
+- detrend + Butterworth band-pass + notch, as second-order sections
+  (DataFilter.perform_bandpass/perform_bandstop are causal Butterworth
+  filters with the same poles and zeros);
+- Welch PSD with DataFilter.get_psd_welch's window and scaling;
+- the power of every band in one matrix product, with the trapezoids of
+  DataFilter.get_band_power.
+
+StreamingFilter applies the same filters to a live stream, only to the
+samples that arrived since the previous call, and IncrementalWelch keeps
+the PSD and band powers of the displayed window up to date from the
+Welch segments completed since then.
+"""
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+
+# (name, low Hz, high Hz) of the bands shown in the band power plot
+EEG_BANDS = (
+    ('delta', 1.0, 4.0),
+    ('theta', 4.0, 8.0),
+    ('alpha', 8.0, 13.0),
+    ('beta', 13.0, 30.0),
+    ('gamma', 30.0, 50.0),
+)
+
+
+def parse_bands(text):
+    """Bands from "name:low-high,..." (e.g. "alpha:8-13,beta:13-30")."""
+    bands = []
+    for item in text.split(','):
+        name, limits = item.split(':')
+        low, high = (float(limit) for limit in limits.split('-'))
+        if not 0 <= low < high:
+            raise ValueError(f"Invalid band {item!r}")
+        bands.append((name.strip(), low, high))
+    return tuple(bands)
+
+
+def nearest_power_of_two(value):
+    """Same as DataFilter.get_nearest_power_of_two."""
+    lower = 1 << (int(value).bit_length() - 1)
+    upper = lower << 1
+    return lower if value - lower < upper - value else upper
+
+
+def design_filter(sampling_rate, bandpass=(0.5, 50.0), notch=(49.0, 51.0), order=2):
+    """Second-order sections of the band-pass followed by the notch
+    (a band-stop around the mains frequency)."""
+    sections = [signal.butter(order, bandpass, btype='bandpass',
+                              fs=sampling_rate, output='sos')]
+    if notch is not None:
+        sections.append(signal.butter(order, notch, btype='bandstop',
+                                      fs=sampling_rate, output='sos'))
+    return np.vstack(sections)
+
+
+def psd_window(size):
+    # DataFilter's BLACKMAN_HARRIS window: a periodic 4-term cosine window
+    # with Nuttall's continuous-derivative coefficients
+    return signal.windows.general_cosine(
+        size, (0.355768, 0.487396, 0.144232, 0.012604), sym=False
+    )
+
+
+class WelchEstimator:
+    """Welch PSD and band powers of all channels at once.
+
+    Segments of ``size`` samples overlapping by half are windowed and
+    transformed with a single rfft over a strided view of the block (no
+    copy of the segments).
+    """
+
+    def __init__(self, sampling_rate, size, bands=EEG_BANDS):
+        self.sampling_rate = sampling_rate
+        self.size = size
+        self.step = size // 2
+        self.bands = tuple(bands)
+        self.window = psd_window(size)
+        self.freqs = np.fft.rfftfreq(size, 1.0 / sampling_rate)
+        # One-sided density: every bin but DC and Nyquist counts twice
+        self.scale = np.full(len(self.freqs), 2.0 / (size * sampling_rate))
+        self.scale[0] /= 2
+        self.scale[-1] /= 2
+        self.band_weights = self._band_weights()
+
+    def _band_weights(self):
+        """(frequencies, bands) matrix such that psd @ weights integrates
+        each band with the trapezoidal rule over the bins from the first
+        one >= low to the first one >= high."""
+        weights = np.zeros((len(self.freqs), len(self.bands)))
+        step = self.freqs[1] - self.freqs[0]
+        for band, (_, low, high) in enumerate(self.bands):
+            start = np.searchsorted(self.freqs, low)
+            stop = min(np.searchsorted(self.freqs, high), len(self.freqs) - 1)
+            if stop > start:
+                weights[start:stop + 1, band] = step
+                weights[start, band] = weights[stop, band] = step / 2
+        return weights
+
+    def segment_powers(self, segments):
+        """|rfft|^2 of windowed segments (..., size), already scaled."""
+        spectrum = np.fft.rfft(segments * self.window, axis=-1)
+        return (spectrum.real ** 2 + spectrum.imag ** 2) * self.scale
+
+    def psd(self, block):
+        """(channels, frequencies) PSD of a (channels, samples) block with
+        at least ``size`` samples."""
+        segments = sliding_window_view(block, self.size, axis=-1)[:, ::self.step]
+        return self.segment_powers(segments).mean(axis=1)
+
+    def band_powers(self, psd):
+        """(channels, bands) powers of a (channels, frequencies) PSD."""
+        return psd @ self.band_weights
+
+
+class StreamingFilter:
+    """Causal multi-channel filter of a stream, fed block by block.
+
+    The state of every section (``zi``) is carried from one block to the
+    next, so the concatenated outputs equal one filtering of the whole
+    stream, and each call only costs the new samples. The state starts at
+    the steady state of the first samples, which removes the electrodes'
+    DC offset without the transient of a filter starting from rest.
+    """
+
+    def __init__(self, sos):
+        self.sos = sos
+        self.zi = None
+
+    def reset(self):
+        self.zi = None
+
+    def process(self, block):
+        """Filtered copy of a (channels, samples) block of new samples."""
+        if block.shape[1] == 0:
+            return np.empty(block.shape)
+        if self.zi is None:
+            # (sections, channels, 2), scaled by each channel's first sample
+            self.zi = signal.sosfilt_zi(self.sos)[:, None, :] * block[None, :, :1]
+        filtered, self.zi = signal.sosfilt(self.sos, block, axis=1, zi=self.zi)
+        return filtered
+
+
+class IncrementalWelch:
+    """Welch PSD and band powers of the last ``span`` samples of a
+    stream, updated with the new samples only.
+
+    Segments are aligned on the stream (they start at multiples of the
+    half-segment step), so a finished segment never changes: its power
+    spectrum and band powers are computed once, when its last sample
+    arrives, and kept until it leaves the span. The estimate is the mean
+    of the kept segments, maintained as running sums, so an update costs
+    one rfft per new segment whatever the span.
+    """
+
+    def __init__(self, welch, n_channels, span):
+        if span < welch.size:
+            raise ValueError("The span must hold at least one segment")
+        self.welch = welch
+        self.span = span
+        self.max_segments = (span - welch.size) // welch.step + 1
+        # (start, segment PSD, segment band powers), oldest first
+        self._segments = deque()
+        self._psd_sum = np.zeros((n_channels, len(welch.freqs)))
+        self._band_sum = np.zeros((n_channels, len(welch.bands)))
+        self._updates = 0
+        self.written = 0
+
+    def __len__(self):
+        return len(self._segments)
+
+    def update(self, buffer):
+        """Takes in the samples appended to ``buffer`` (a RingBuffer of
+        the same stream) since the previous update."""
+        size, step = self.welch.size, self.welch.step
+        written = buffer.written
+        # Segments ending after the previous update and still in the buffer
+        first = max(-(-(self.written - size + 1) // step),
+                    -(-(written - len(buffer)) // step), 0)
+        last = (written - size) // step
+        self.written = written
+        if last < first:
+            return
+        samples = buffer.latest(written - first * step)
+        segments = sliding_window_view(samples, size, axis=-1)[:, ::step][:, :last - first + 1]
+        powers = self.welch.segment_powers(segments.transpose(1, 0, 2))
+        for offset, psd in enumerate(powers):
+            self._add(first + offset, psd, psd @ self.welch.band_weights)
+        # Segments that have left the span
+        oldest = (written - self.span) / step
+        while self._segments and self._segments[0][0] < oldest:
+            self._remove()
+
+    def _add(self, index, psd, band_powers):
+        if len(self._segments) == self.max_segments:
+            self._remove()
+        self._segments.append((index, psd, band_powers))
+        self._psd_sum += psd
+        self._band_sum += band_powers
+        self._updates += 1
+        if self._updates >= self.max_segments:
+            # Re-summed once per turnover, so rounding errors never pile up
+            self._psd_sum = sum(segment[1] for segment in self._segments)
+            self._band_sum = sum(segment[2] for segment in self._segments)
+            self._updates = 0
+
+    def _remove(self):
+        _, psd, band_powers = self._segments.popleft()
+        self._psd_sum -= psd
+        self._band_sum -= band_powers
+
+    def psd(self):
+        """(channels, frequencies) mean of the segments, None before the
+        first one is complete."""
+        return self._psd_sum / len(self._segments) if self._segments else None
+
+    def band_powers(self):
+        """(channels, bands) powers, None before the first segment."""
+        return self._band_sum / len(self._segments) if self._segments else None
+
+    def covered(self):
+        """(first, end) stream positions of the samples in the estimate."""
+        if not self._segments:
+            return None
+        step = self.welch.step
+        return (self._segments[0][0] * step,
+                self._segments[-1][0] * step + self.welch.size)
+
+
+class EEGProcessor:
+    """Filters a window of EEG and estimates its spectrum, as Graph.update
+    did channel by channel with DataFilter."""
+
+    def __init__(self, sampling_rate, bandpass=(0.5, 50.0), notch=(49.0, 51.0),
+                 order=2, psd_size=None, bands=EEG_BANDS):
+        self.sampling_rate = sampling_rate
+        self.sos = design_filter(sampling_rate, bandpass, notch, order)
+        if psd_size is None:
+            psd_size = nearest_power_of_two(sampling_rate)
+        self.welch = WelchEstimator(sampling_rate, psd_size, bands)
+
+    def streaming_filter(self):
+        return StreamingFilter(self.sos)
+
+    def incremental_welch(self, n_channels, span):
+        return IncrementalWelch(self.welch, n_channels, span)
+
+    def filter(self, block):
+        """Detrended (constant) and filtered copy of a (channels, samples)
+        block; filtering starts from rest at the first sample."""
+        block = block - block.mean(axis=1, keepdims=True)
+        return signal.sosfilt(self.sos, block, axis=1)
+
+    def spectrum(self, filtered):
+        """(PSD, band powers) of filtered channels; both None when the block
+        is shorter than one Welch segment."""
+        if filtered.shape[1] < self.welch.size:
+            return None, None
+        psd = self.welch.psd(filtered)
+        return psd, self.welch.band_powers(psd)
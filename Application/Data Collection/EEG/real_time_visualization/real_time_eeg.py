@@ -1,20 +1,29 @@
 import argparse
 import logging
 
+import numpy as np
 import pyqtgraph as pg
 from pyqtgraph.Qt import QtGui, QtCore
 
 from mindrove.board_shim import BoardShim, MindRoveInputParams, BoardIds
-from mindrove.data_filter import DataFilter, FilterTypes, WindowOperations, DetrendOperations
+
+from acquisition import BoardAcquisition
+from eeg_processing import EEG_BANDS, EEGProcessor, parse_bands
+from render import DecimatedCurves, FrameScheduler
+from ring_buffer import RingBuffer
 
 
 class Graph:
-    def __init__(self, board_shim):
+    def __init__(self, acquisition, bands=EEG_BANDS):
         pg.setConfigOption('background', 'w')
         pg.setConfigOption('foreground', 'k')
 
-        self.board_id = board_shim.get_board_id()
-        self.board_shim = board_shim
+        # The board is polled by the acquisition thread; the plots read the
+        # samples it buffered since the last update
+        self.board_id = acquisition.board_id
+        self.acquisition = acquisition
+        self.reader = acquisition.reader('viewer')
+        self.dropped = 0
         # Only first 6 EXG channels (exclude bias & reference)
         all_channels = BoardShim.get_exg_channels(self.board_id)
         self.exg_channels = all_channels[:6]
@@ -22,6 +31,19 @@ class Graph:
         self.update_speed_ms = 50
         self.window_size = 5
         self.num_points = self.window_size * self.sampling_rate
+        # Band-pass 0.5-50 Hz (typical EEG range) and notch around the mains
+        # at 50 Hz, applied to all channels at once
+        self.processor = EEGProcessor(self.sampling_rate,
+                                      bandpass=(0.5, 50.0), notch=(49.0, 51.0),
+                                      bands=bands)
+        # Only the new samples are filtered at each update (the filter state
+        # is kept between updates); the filtered window is kept for display
+        self.stream_filter = self.processor.streaming_filter()
+        self.window = RingBuffer(len(self.exg_channels), self.num_points)
+        # PSD and band powers of the window, from the Welch segments
+        # completed since the last update only
+        self.spectrum = self.processor.incremental_welch(
+            len(self.exg_channels), self.num_points)
 
         self.app = QtGui.QApplication([])
         self.win = pg.GraphicsWindow(title='Mindrove Plot', size=(800, 600))
@@ -31,10 +53,13 @@ class Graph:
         self._init_psd()
         self._init_band_plot()
 
-        timer = QtCore.QTimer()
-        timer.timeout.connect(self.update)
-        timer.start(self.update_speed_ms)
+        # Redraws every update_speed_ms, less often when frames get slow
+        self.timer = QtCore.QTimer()
+        self.scheduler = FrameScheduler(self.timer, min_interval_ms=self.update_speed_ms)
+        self.timer.timeout.connect(self.update)
+        self.timer.start(self.update_speed_ms)
         QtGui.QApplication.instance().exec_()
+        logging.info(f'Rendering: {self.scheduler.stats()}')
 
     def _init_pens(self):
         self.pens = []
@@ -57,6 +82,8 @@ class Graph:
             self.plots.append(p)
             curve = p.plot(pen=self.pens[i % len(self.pens)])
             self.curves.append(curve)
+        # The window is drawn decimated to the plots' width
+        self.traces = DecimatedCurves(self.plots, self.curves)
 
     def _init_psd(self):
         self.psd_plot = self.win.addPlot(row=0, col=1,
@@ -64,7 +91,9 @@ class Graph:
         self.psd_plot.setTitle('PSD Plot')
         self.psd_plot.setLogMode(False, True)
         self.psd_curves = []
-        self.psd_size = DataFilter.get_nearest_power_of_two(self.sampling_rate)
+        self.psd_size = self.processor.welch.size
+        # Frequencies shown in the PSD plot (up to 70 bins)
+        self.psd_lim = min(70, len(self.processor.welch.freqs))
         for i in range(len(self.exg_channels)):
             c = self.psd_plot.plot(pen=self.pens[i % len(self.pens)])
             c.setDownsampling(auto=True, method='mean', ds=3)
@@ -78,81 +107,86 @@ class Graph:
         self.band_plot.hideAxis('left')
         self.band_plot.showAxis('bottom')
         self.band_plot.setTitle('BandPower Plot')
-        x = [1, 2, 3, 4, 5]
-        self.band_bar = pg.BarGraphItem(x=x, height=[0]*5, width=0.8,
+        labels = [name for name, _, _ in self.processor.welch.bands]
+        x = list(range(1, len(labels) + 1))
+        self.band_bar = pg.BarGraphItem(x=x, height=[0]*len(labels), width=0.8,
                                        pen=self.pens[0], brush=self.brushes[0])
         self.band_plot.addItem(self.band_bar)
         # Set captions under each bar
-        labels = ['delta', 'theta', 'alpha', 'beta', 'gamma']
         ticks = [(i+1, labels[i]) for i in range(len(labels))]
         self.band_plot.getAxis('bottom').setTicks([ticks])
 
     def update(self):
-        data = self.board_shim.get_current_board_data(self.num_points)
-        band_sums = [0] * 5
-
-        for idx, ch in enumerate(self.exg_channels):
-            signal = data[ch]
-
-            # 1) Detrend
-            DataFilter.detrend(signal, DetrendOperations.CONSTANT.value)
-
-            # 2) Band-pass 0.5-50 Hz (typical EEG range)
-            DataFilter.perform_bandpass(signal, self.sampling_rate,
-                                       0.5, 50.0, 2,
-                                       FilterTypes.BUTTERWORTH.value, 0)
-
-            # 3) Notch filter: narrow around main at 50 Hz (i.e.  power frequency noise)
-            DataFilter.perform_bandstop(signal, self.sampling_rate,
-                                        49.0, 51.0, 2,
-                                        FilterTypes.BUTTERWORTH.value, 0)
-
-            # Update time-series plot
-            self.curves[idx].setData(signal.tolist())
-
-            # PSD & band power
-            if data.shape[1] > self.psd_size:
-                # Tuple of Amplitude and Frequency arrays
-                psd_data = DataFilter.get_psd_welch(
-                    signal, self.psd_size, self.psd_size//2,
-                    self.sampling_rate, WindowOperations.BLACKMAN_HARRIS.value
-                )
-                lim = min(70, len(psd_data[0]))
-                self.psd_curves[idx].setData(psd_data[1][:lim].tolist(), psd_data[0][:lim].tolist())
-
-                # Sum power in 5 bands
-                band_sums[0] += DataFilter.get_band_power(psd_data, 1.0, 4.0)
-                band_sums[1] += DataFilter.get_band_power(psd_data, 4.0, 8.0)
-                band_sums[2] += DataFilter.get_band_power(psd_data, 8.0, 13.0)
-                band_sums[3] += DataFilter.get_band_power(psd_data, 13.0, 30.0)
-                band_sums[4] += DataFilter.get_band_power(psd_data, 30.0, 50.0)
-
-        # Normalize across bands to get true percentage contributions
-        total = sum(band_sums)
-        if total > 0:
-            percents = [int(100 * bs / total) for bs in band_sums]
-        else:
-            percents = [0] * 5
-
-        self.band_bar.setOpts(height=percents)
-
-        self.app.processEvents()
+        # 1) Band-pass and notch of the samples acquired since the last update
+        data = self.reader.read()
+        if self.reader.dropped > self.dropped:
+            logging.warning(f'Viewer fell behind: {self.reader.dropped - self.dropped} '
+                            f'samples dropped')
+            self.dropped = self.reader.dropped
+        if data.shape[1] == 0 and not self.traces.resized():
+            # Nothing new to draw
+            self.scheduler.skip()
+            return
+
+        with self.scheduler.frame():
+            if data.shape[1] > 0:
+                self.window.extend(self.stream_filter.process(data[self.exg_channels]))
+                self.spectrum.update(self.window)
+
+            # Update time-series plots (min/max of each pixel column)
+            self.traces.set_window(self.window.latest(), self.window.written)
+
+            # 2) PSD & band powers of all channels
+            psd = self.spectrum.psd()
+            if psd is not None:
+                freqs = self.processor.welch.freqs[:self.psd_lim]
+                for idx, curve in enumerate(self.psd_curves):
+                    curve.setData(freqs, psd[idx, :self.psd_lim])
+
+                # Normalize across bands to get true percentage contributions
+                band_sums = self.spectrum.band_powers().sum(axis=0)
+                total = band_sums.sum()
+                if total > 0:
+                    percents = (100 * band_sums / total).astype(int)
+                else:
+                    percents = np.zeros(len(band_sums), dtype=int)
+                self.band_bar.setOpts(height=percents)
+
+            # Paints now, so that the frame time includes the drawing
+            self.app.processEvents()
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Real-time MindRove EEG viewer.')
+    parser.add_argument('--bands', type=parse_bands,
+                        default=EEG_BANDS,
+                        help='Bands of the band power plot, as name:low-high,... '
+                             '(default: delta:1-4,theta:4-8,alpha:8-13,beta:13-30,gamma:30-50)')
+    parser.add_argument('--board', choices=['wifi', 'synthetic'], default='wifi',
+                        help='MindRove WiFi board, or the synthetic board for testing')
+    args = parser.parse_args()
+
     BoardShim.enable_dev_board_logger()
     logging.basicConfig(level=logging.DEBUG)
 
     params = MindRoveInputParams()
+    board_id = (BoardIds.SYNTHETIC_BOARD if args.board == 'synthetic'
+                else BoardIds.MINDROVE_WIFI_BOARD)
+    board_shim = BoardShim(board_id, params)
+    acquisition = None
 
     try:
-        board_shim = BoardShim(BoardIds.MINDROVE_WIFI_BOARD, params)
         board_shim.prepare_session()
         board_shim.start_stream()
-        Graph(board_shim)
+        acquisition = BoardAcquisition(board_shim)
+        acquisition.start()
+        Graph(acquisition, args.bands)
     except BaseException:
         logging.warning('Exception', exc_info=True)
     finally:
+        if acquisition is not None:
+            acquisition.stop()
+            logging.info(f'Acquisition: {acquisition.stats()}')
         if board_shim.is_prepared():
             logging.info('Releasing session')
             board_shim.release_session()
@@ -0,0 +1,139 @@
+"""Rendering helpers for the live plots.
+
+A 5 s window at the native rate holds thousands of samples per channel,
+several per pixel of a plot: DecimatedCurves draws each channel with the
+minimum and maximum of every pixel-sized bin instead, which looks the
+same (spikes and artifacts included) for a fraction of the points.
+FrameScheduler measures what a redraw costs and spaces the redraws so
+that rendering never takes more than a share of the GUI thread; ticks
+with nothing new to draw are skipped.
+"""
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def minmax_decimate(block, bins, end=None):
+    """(x, y) of a (channels, samples) block reduced to the minimum and
+    maximum of each of about ``bins`` bins, in the order they occur.
+
+    ``x`` are the indices of the kept samples in the block, per channel.
+    ``end`` is the stream position just after the block: bins are aligned
+    on the stream rather than on the block, so the points of a bin do not
+    change as the window scrolls. Blocks with at most two samples per bin
+    are returned as they are.
+    """
+    n_channels, size = block.shape
+    if size <= 2 * bins:
+        return np.broadcast_to(np.arange(size), block.shape), block
+    per_bin = -(-size // bins)
+    end = size if end is None else end
+    # Samples before the first aligned bin, then the full bins
+    head = (per_bin - (end - size) % per_bin) % per_bin
+    count = (size - head) // per_bin
+    tail = head + count * per_bin
+
+    middle = block[:, head:tail].reshape(n_channels, count, per_bin)
+    starts = head + per_bin * np.arange(count)
+    lows, highs = [], []
+    # The partial bins at both ends of the window are kept too
+    if head:
+        lows.append(block[:, :head].argmin(axis=1, keepdims=True))
+        highs.append(block[:, :head].argmax(axis=1, keepdims=True))
+    lows.append(starts + middle.argmin(axis=2))
+    highs.append(starts + middle.argmax(axis=2))
+    if tail < size:
+        lows.append(tail + block[:, tail:].argmin(axis=1, keepdims=True))
+        highs.append(tail + block[:, tail:].argmax(axis=1, keepdims=True))
+    lows, highs = np.hstack(lows), np.hstack(highs)
+
+    x = np.stack((np.minimum(lows, highs), np.maximum(lows, highs)), axis=2)
+    x = x.reshape(n_channels, -1)
+    return x, np.take_along_axis(block, x, axis=1)
+
+
+class DecimatedCurves:
+    """The curves of stacked time-series plots (one channel per plot, all
+    the same width), drawn with min/max decimation to the plots' width
+    in pixels."""
+
+    def __init__(self, plots, curves):
+        self.plots = plots
+        self.curves = curves
+        self.drawn_bins = None
+
+    def bins(self):
+        return max(1, int(self.plots[0].getViewBox().width()))
+
+    def resized(self):
+        """Whether the plots changed width since the last draw."""
+        return self.bins() != self.drawn_bins
+
+    def set_window(self, block, end=None):
+        """Draws a (channels, samples) window whose last sample is at
+        stream position ``end``."""
+        self.drawn_bins = self.bins()
+        x, y = minmax_decimate(block, self.drawn_bins, end)
+        for curve, curve_x, curve_y in zip(self.curves, x, y):
+            curve.setData(curve_x, curve_y)
+
+
+class FrameScheduler:
+    """Adapts the interval of the QTimer driving the redraws to their
+    measured cost.
+
+    The interval is the smoothed frame time divided by ``load`` (the
+    share of the GUI thread left to rendering), within
+    [min_interval_ms, max_interval_ms]: a slow laptop redraws less often
+    instead of lagging behind, and recovers the full rate when frames get
+    cheap again. Skipped ticks (nothing new to draw) are only counted.
+    """
+
+    def __init__(self, timer, min_interval_ms=50, max_interval_ms=250,
+                 load=0.5, smoothing=0.2):
+        self.timer = timer
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.load = load
+        self.smoothing = smoothing
+        # Smoothed duration of a frame, in seconds
+        self.frame_time = 0.0
+        self.frame_time_max = 0.0
+        self.frames = 0
+        self.skipped = 0
+
+    @contextmanager
+    def frame(self):
+        """Times the redraw run in the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - start)
+
+    def skip(self):
+        self.skipped += 1
+
+    def record(self, duration):
+        self.frames += 1
+        self.frame_time_max = max(self.frame_time_max, duration)
+        if self.frames == 1:
+            self.frame_time = duration
+        else:
+            self.frame_time += self.smoothing * (duration - self.frame_time)
+        interval = round(min(max(self.frame_time * 1000 / self.load, self.min_interval_ms),
+                             self.max_interval_ms))
+        current = self.timer.interval()
+        # Small variations do not restart the timer
+        if abs(interval - current) >= max(2, current // 10):
+            self.timer.setInterval(interval)
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'frame_time': self.frame_time,
+            'frame_time_max': self.frame_time_max,
+            'interval_ms': self.timer.interval(),
+        }
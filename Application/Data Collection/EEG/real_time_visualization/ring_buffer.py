@@ -0,0 +1,130 @@
+"""Fixed-size multi-channel sample buffers.
+
+RingBuffer keeps the window of a live plot; SharedRingBuffer is filled by
+the acquisition thread and read concurrently by the plots, the recorder
+and the analytics, each through its own BufferReader.
+"""
+import numpy as np
+
+
+class RingBuffer:
+    """The last ``capacity`` samples of ``n_channels`` channels.
+
+    Memory is allocated once. Every sample is stored twice, ``capacity``
+    columns apart, so the most recent samples are always one contiguous
+    slice of the storage: latest() returns a view, without copying or
+    reordering, whatever the write position.
+    """
+
+    def __init__(self, n_channels, capacity, dtype=np.float64):
+        self.n_channels = n_channels
+        self.capacity = capacity
+        self._data = np.zeros((n_channels, 2 * capacity), dtype=dtype)
+        # Samples written since the creation (or the last clear())
+        self.written = 0
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def clear(self):
+        self.written = 0
+
+    def extend(self, block):
+        """Appends a (channels, samples) block; only its last ``capacity``
+        samples are kept when it is longer than the buffer."""
+        size = block.shape[1]
+        if size == 0:
+            return
+        skipped = max(0, size - self.capacity)
+        block = block[:, skipped:]
+        size -= skipped
+        start = (self.written + skipped) % self.capacity
+        head = min(size, self.capacity - start)
+        for offset in (0, self.capacity):
+            self._data[:, offset + start:offset + start + head] = block[:, :head]
+            self._data[:, offset:offset + size - head] = block[:, head:]
+        self.written += skipped + size
+
+    def latest(self, count=None):
+        """(channels, n) view of the last ``count`` samples (all of the
+        stored ones by default, fewer when fewer were written), oldest
+        first. It is overwritten by the next extend()."""
+        available = len(self)
+        count = available if count is None else min(count, available)
+        return self._span(self.written - count, self.written)
+
+    def _span(self, first, end):
+        """View of the samples at stream positions [first, end), which must
+        be in the buffer."""
+        # Ends in the second copy, so the span never wraps
+        stop = (end - 1) % self.capacity + self.capacity + 1
+        return self._data[:, stop - (end - first):stop]
+
+
+class SharedRingBuffer(RingBuffer):
+    """RingBuffer written by one thread and read by any number of others,
+    without locks.
+
+    The writer announces how far its next write goes (``reserved``) before
+    writing and publishes ``written`` after it. A reader copies the
+    samples it wants, then drops from the copy the ones the writer may
+    have been overwriting meanwhile (those more than ``capacity`` behind
+    ``reserved``): readers never block the writer, and a reader that fell
+    too far behind loses its oldest samples instead of reading torn ones.
+    """
+
+    def __init__(self, n_channels, capacity, dtype=np.float64):
+        super().__init__(n_channels, capacity, dtype)
+        self.reserved = 0
+
+    def clear(self):
+        super().clear()
+        self.reserved = 0
+
+    def extend(self, block):
+        self.reserved = self.written + block.shape[1]
+        super().extend(block)
+
+    def read(self, since):
+        """(position, copy) of the samples written from stream position
+        ``since`` on; ``position`` is that of the first returned sample,
+        later than ``since`` for the samples that were lost."""
+        end = self.written
+        first = max(since, end - self.capacity)
+        if first >= end:
+            return end, np.empty((self.n_channels, 0), dtype=self._data.dtype)
+        block = self._span(first, end).copy()
+        # Samples overwritten while they were copied
+        valid = self.reserved - self.capacity
+        if valid > first:
+            block = block[:, valid - first:]
+            first = valid
+        return first, block
+
+    def snapshot(self, count):
+        """Copy of the last ``count`` samples (fewer if not available)."""
+        position, block = self.read(max(0, self.written - count))
+        return block
+
+    def reader(self):
+        return BufferReader(self)
+
+
+class BufferReader:
+    """A consumer's cursor in a SharedRingBuffer: read() returns the
+    samples written since the previous read, and ``dropped`` counts those
+    overwritten before they could be read."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.position = buffer.written
+        self.dropped = 0
+
+    def pending(self):
+        return self.buffer.written - self.position
+
+    def read(self):
+        first, block = self.buffer.read(self.position)
+        self.dropped += first - self.position
+        self.position = first + block.shape[1]
+        return block
@@ -1,27 +1,90 @@
 from flask import Flask
 from flask_jwt_extended import JWTManager
-from core import db
+from core import db, schema_registry, password_hasher, user_profile_cache
+from core import pool_metrics, rate_limiter, metrics, predictor, job_queue
+from core import token_blocklist, schema_migrations
+from core.json_provider import FastJSONProvider
 from config.config import Config
-from controllers import UserController, AuthController
+from controllers import UserController, AuthController, StatsController
+from controllers import PredictController, SessionController, JobController
+from controllers import RatingController
+from repositories import JobRepository, RevokedTokenRepository
+from services import PreprocessingService
 
-def main():
+def create_app(config=Config):
     app = Flask(__name__)
     
-    app.config.from_object(Config)
+    app.config.from_object(config)
+    app.json = FastJSONProvider(app)
+    
+    jwt = JWTManager(app)
     
-    JWTManager(app)
+    metrics.init_app(app)
     
+    pool_metrics.init_app(app)
     db.init_app(app)
+    schema_migrations.init_app(app)
+    schema_registry.init_app(app)
+    password_hasher.init_app(app)
+    rate_limiter.init_app(app)
+    predictor.init_app(app)
+    token_blocklist.init_app(
+        app, jwt,
+        RevokedTokenRepository()
+        if app.config["TOKEN_BLOCKLIST_BACKEND"] == "database" else None
+    )
+    job_queue.init_app(app, JobRepository())
+    job_queue.register(
+        "preprocess_session", PreprocessingService().preprocess_session
+    )
+    user_profile_cache.configure(
+        app.config["USER_CACHE_SIZE"], app.config["USER_CACHE_TTL"]
+    )
+    metrics.register_collector(
+        "user_profile_cache", "User profile cache statistics",
+        user_profile_cache.stats
+    )
+    metrics.register_collector(
+        "db_pool", "Database connection pool statistics",
+        lambda: pool_metrics.stats(db.engine.pool)
+    )
     
     user_controller = UserController()
     auth_controller = AuthController()
+    stats_controller = StatsController()
+    predict_controller = PredictController()
+    session_controller = SessionController()
+    job_controller = JobController()
+    rating_controller = RatingController()
     app.register_blueprint(user_controller.bp)
     app.register_blueprint(auth_controller.bp)
+    app.register_blueprint(stats_controller.bp)
+    app.register_blueprint(predict_controller.bp)
+    app.register_blueprint(session_controller.bp)
+    app.register_blueprint(job_controller.bp)
+    app.register_blueprint(rating_controller.bp)
     
     with app.app_context():
-        db.create_all()     
+        if app.config["DB_MIGRATE_ON_START"]:
+            schema_migrations.upgrade()
+        # Handy while iterating on models; the schema itself is owned by
+        # the migrations, so this never runs in production
+        if app.config["APP_ENV"] == "development":
+            db.create_all()
+    
+    job_queue.start()
         
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    return app
+
+def main():
+    if Config.APP_ENV == "development":
+        app = create_app()
+        app.run(host=Config.SERVER_HOST, port=Config.SERVER_PORT, debug=True)
+    else:
+        # Imported here so the dev server also works where gunicorn
+        # is not available (e.g. Windows)
+        from core.server import serve
+        serve(create_app, Config)
     
 if __name__ == "__main__":
     try:
@@ -29,4 +92,4 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("[ERROR] Server stopped by user.")
     except Exception as e:
-        print(f"[ERROR] An error occurred: {e}")
\ No newline at end of file
+        print(f"[ERROR] An error occurred: {e}")
@@ -1,13 +1,73 @@
 import os
 from datetime import timedelta
+from sqlalchemy.engine import make_url
+
+
+def _uses_queue_pool(database_uri):
+    """Whether Flask-SQLAlchemy gives this database a QueuePool: every
+    backend does but in-memory SQLite, which gets a StaticPool (a single
+    shared connection) that takes none of the pool sizing options."""
+    url = make_url(database_uri)
+    return not (url.get_backend_name() == "sqlite"
+                and url.database in (None, "", ":memory:"))
+
 
 class Config:
+    # "development" runs Flask's debug server, anything else the worker pool
+    APP_ENV = os.getenv("APP_ENV", "development")
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", 5000))
+
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", 2 * (os.cpu_count() or 1) + 1))
+    WEB_THREADS = int(os.getenv("WEB_THREADS", 4))
+    WEB_KEEPALIVE = int(os.getenv("WEB_KEEPALIVE", 5))
+    WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", 60))
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", 30))
+    WEB_MAX_REQUESTS = int(os.getenv("WEB_MAX_REQUESTS", 0))
+    WEB_MAX_REQUESTS_JITTER = int(os.getenv("WEB_MAX_REQUESTS_JITTER", 0))
+
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_NAME = os.getenv("DB_NAME", "foodback_database")
-    SQLALCHEMY_DATABASE_URI = (
+    # DATABASE_URL overrides the MySQL settings (e.g. a SQLite file for benchmarks)
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL") or (
         f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
         f"@{os.getenv('DB_HOST')}:3306/{os.getenv('DB_NAME')}"
     )
+
+    # Connection pool, sized per server worker process: with WEB_WORKERS
+    # workers the server can open WEB_WORKERS * (size + overflow) connections.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    # Below MySQL's wait_timeout (8 h by default) so idle connections are
+    # recycled before the server drops them
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 5))
+    DB_READ_TIMEOUT = int(os.getenv("DB_READ_TIMEOUT", 30))
+    DB_WRITE_TIMEOUT = int(os.getenv("DB_WRITE_TIMEOUT", 30))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 10000))
+    # Requests waiting longer than this for a connection are logged
+    DB_SLOW_CHECKOUT_MS = float(os.getenv("DB_SLOW_CHECKOUT_MS", 100))
+
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if _uses_queue_pool(SQLALCHEMY_DATABASE_URI):
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        })
+    if SQLALCHEMY_DATABASE_URI.startswith("mysql"):
+        SQLALCHEMY_ENGINE_OPTIONS["connect_args"] = {
+            "connect_timeout": DB_CONNECT_TIMEOUT,
+            "read_timeout": DB_READ_TIMEOUT,
+            "write_timeout": DB_WRITE_TIMEOUT,
+            # MAX_EXECUTION_TIME bounds read-only SELECT statements
+            "init_command": f"SET SESSION MAX_EXECUTION_TIME={DB_STATEMENT_TIMEOUT_MS}",
+        }
     SECRET_KEY = os.getenv("SECRET_KEY", "secret_key")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     
@@ -15,4 +75,94 @@ class Config:
     JWT_COOKIE_SECURE = False
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30) 
-    
\ No newline at end of file
+
+    # Werkzeug method spec ("scrypt:N:r:p" or "pbkdf2:sha256:iterations").
+    # Stored hashes with different parameters are upgraded on next login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+    # 0 runs the hashes on the request thread (still bounded by MAX_PENDING)
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 16))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", 0.5))
+
+    # Per-process cache of /auth/me profiles, invalidated on user writes
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 4096))
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 300))
+
+    USERS_PAGE_DEFAULT_LIMIT = int(os.getenv("USERS_PAGE_DEFAULT_LIMIT", 100))
+    USERS_PAGE_MAX_LIMIT = int(os.getenv("USERS_PAGE_MAX_LIMIT", 1000))
+    USERS_STREAM_BATCH_SIZE = int(os.getenv("USERS_STREAM_BATCH_SIZE", 500))
+
+    BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", 1000))
+    BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", 500))
+
+    # Token buckets per server process, as "<count>/<second|minute|hour|day>"
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+    RATE_LIMITS = {
+        "login_ip": os.getenv("RATE_LIMIT_LOGIN_IP", "30/minute"),
+        "login_email": os.getenv("RATE_LIMIT_LOGIN_EMAIL", "10/minute"),
+        "signup_ip": os.getenv("RATE_LIMIT_SIGNUP_IP", "10/minute"),
+    }
+
+    # When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+    TFLITE_MODEL_PATH = os.getenv("TFLITE_MODEL_PATH", os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..", "..", "..", "..", "ML Model", "eegnet_preproc.tflite"
+    ))
+    INFERENCE_INTERPRETERS = int(os.getenv("INFERENCE_INTERPRETERS", 2))
+    INFERENCE_THREADS_PER_INTERPRETER = int(os.getenv("INFERENCE_THREADS_PER_INTERPRETER", 1))
+    # Concurrent requests are grouped into one invoke for up to this long
+    INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", 5))
+    INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", 32))
+    INFERENCE_MAX_EPOCHS_PER_REQUEST = int(os.getenv("INFERENCE_MAX_EPOCHS_PER_REQUEST", 32))
+    INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", 10))
+
+    # Raw uploaded session streams, one directory per session
+    SESSION_DATA_DIR = os.getenv("SESSION_DATA_DIR", os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sessions"
+    ))
+    SESSION_MAX_CHUNK_BYTES = int(os.getenv("SESSION_MAX_CHUNK_BYTES", 8 * 1024 * 1024))
+
+    # Background jobs (session preprocessing) run in worker threads of every
+    # server process; 0 disables them
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 1))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 2.0))
+    JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", 5.0))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    # Running jobs not finished after this many seconds are assumed lost
+    JOB_STALE_AFTER = int(os.getenv("JOB_STALE_AFTER", 900))
+
+    # Revoked tokens: "memory" is per process, so anything but a single
+    # server process needs the shared "database" store
+    TOKEN_BLOCKLIST_BACKEND = os.getenv(
+        "TOKEN_BLOCKLIST_BACKEND",
+        "memory" if APP_ENV == "development" or WEB_WORKERS == 1 else "database"
+    )
+
+    # Versioned schema migrations (migrations/NNNN_name.py), applied at
+    # startup unless disabled; "flask --app app:create_app migrate upgrade"
+    # applies them by hand
+    MIGRATIONS_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations"
+    )
+    DB_MIGRATE_ON_START = os.getenv("DB_MIGRATE_ON_START", "true").lower() == "true"
+    DB_MIGRATE_LOCK_TIMEOUT = int(os.getenv("DB_MIGRATE_LOCK_TIMEOUT", 60))
+
+    # Seconds clients may reuse a user resource (/auth/me, /users) without
+    # revalidating it; with 0 they send its ETag back and get a 304 until
+    # the user changes
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", 0))
+
+    # Rating history pages and trend windows (days of daily summaries)
+    RATINGS_PAGE_DEFAULT_LIMIT = int(os.getenv("RATINGS_PAGE_DEFAULT_LIMIT", 50))
+    RATINGS_PAGE_MAX_LIMIT = int(os.getenv("RATINGS_PAGE_MAX_LIMIT", 500))
+    RATING_TRENDS_MAX_DAYS = int(os.getenv("RATING_TRENDS_MAX_DAYS", 366))
+
+    SCHEMAS_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schemas"
+    )
+    # Check and compile every JSON schema at startup instead of on first use
+    SCHEMAS_PRELOAD = os.getenv("SCHEMAS_PRELOAD", "false").lower() == "true"
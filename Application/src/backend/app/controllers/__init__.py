@@ -1,2 +1,7 @@
 from .auth_controller import AuthController
-from .user_controller import UserController
\ No newline at end of file
+from .user_controller import UserController
+from .stats_controller import StatsController
+from .predict_controller import PredictController
+from .session_controller import SessionController
+from .job_controller import JobController
+from .rating_controller import RatingController
@@ -1,10 +1,17 @@
-import json
 from flask_jwt_extended import create_access_token, create_refresh_token
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request, get_jwt
+from flask_jwt_extended import get_jwt_identity, get_jwt
+from flask_jwt_extended import decode_token
 from flask import Blueprint, request, jsonify, make_response
 from services import AuthService, UserService
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from core import schema_registry, rate_limiter, token_blocklist
+from core.rate_limiter import client_ip, json_field
+from core.authorization import requires_role
+from core.http_cache import conditional_response, user_etag
+from serializers import user_profile_serializer
 from exceptions import InvalidCredentialsError, UserNotFoundError, UserAlreadyExistsError
+from exceptions import HashingPoolSaturatedError
+from logger import log
 
 class AuthController:
     def __init__(self):
@@ -16,24 +23,46 @@ class AuthController:
     def _register_routes(self):
         self.bp.add_url_rule(
             '/auth/signup',
-            view_func=self.register_user,
+            view_func=rate_limiter.limit(
+                ('signup_ip', client_ip)
+            )(self.register_user),
             methods=['POST']
         )
         self.bp.add_url_rule(
             '/auth/login',
-            view_func=self.login,
+            view_func=rate_limiter.limit(
+                ('login_ip', client_ip),
+                ('login_email', json_field('email'))
+            )(self.login),
             methods=['POST']
         )
         self.bp.add_url_rule(
             '/auth/me',
-            view_func=self.get_current_user,
+            view_func=requires_role()(self.get_current_user),
             methods=['GET']
         )
         self.bp.add_url_rule(
             '/auth/refresh',
-            view_func=self.refresh_token,
+            view_func=requires_role(refresh=True)(self.refresh_token),
             methods=['POST']
         )
+        self.bp.add_url_rule(
+            '/auth/logout',
+            view_func=requires_role(verify_type=False)(self.logout),
+            methods=['POST']
+        )
+        self.bp.add_url_rule(
+            '/auth/revoke',
+            view_func=requires_role('admin')(self.revoke_token),
+            methods=['POST']
+        )
+
+    def _server_busy(self):
+        response = make_response(
+            jsonify({"error": "Server busy, please retry later"}), 429
+        )
+        response.headers["Retry-After"] = "1"
+        return response
 
     def register_user(self):
         
@@ -41,15 +70,10 @@ class AuthController:
         if not data:
             return make_response(jsonify({"error": "No input data provided"}), 400)
         
-        schema_path = 'schemas/registration_schema.json'
-        with open(schema_path, 'r') as schema_file:
-            schema = json.load(schema_file)
         try:
-            validate(instance=data, schema=schema)
+            schema_registry.validate('registration_schema', data)
         except ValidationError as e:    
             return make_response(jsonify({"error": e.message}), 400)
-        except FileNotFoundError:
-            return make_response(jsonify({"error": "Schema file not found"}), 500)
 
         # Extracting data from the request        
         name = data.get('name')
@@ -72,6 +96,8 @@ class AuthController:
             return make_response(
                 jsonify({"error": "Email already registered"}), 409
             )
+        except HashingPoolSaturatedError:
+            return self._server_busy()
         except Exception as e:
             return make_response(
                 jsonify({"error": "User registration failed"}), 500
@@ -83,14 +109,9 @@ class AuthController:
             return make_response(jsonify({"error": "No input data provided"}), 400)
 
         try:
-            schema_path = 'schemas/login_schema.json'
-            with open(schema_path, 'r') as schema_file:
-                schema = json.load(schema_file)
-            validate(instance=data, schema=schema)
+            schema_registry.validate('login_schema', data)
         except ValidationError as e:
             return make_response(jsonify({"error": e.message}), 400)
-        except FileNotFoundError:
-            return make_response(jsonify({"error": "Schema file not found"}), 500)
         
         email = data.get('email')
         password = data.get('password')
@@ -103,6 +124,8 @@ class AuthController:
             return make_response(jsonify({"error": "Invalid credentials"}), 401)            
         except UserNotFoundError:
             return make_response(jsonify({"error": "User not found"}), 404)
+        except HashingPoolSaturatedError:
+            return self._server_busy()
         except Exception as e:
             return make_response(jsonify({"error": str(e)}), 500)
 
@@ -114,42 +137,27 @@ class AuthController:
         refresh_token = create_refresh_token(identity=str(user.id))
         
         return make_response(jsonify({
-            "id": user.id,
-            "name": user.name,
-            "surname": user.surname,
-            "email": user.email,
-            "user_type": user.user_type,
+            **user_profile_serializer.dump(user),
             "token_type": "Bearer",
             "access_token": access_token,
             "refresh_token": refresh_token
         }), 200)
 
     def get_current_user(self):
-        try:
-            verify_jwt_in_request()
-        except Exception as e:
-            return make_response(jsonify({"error": str(e)}), 401)
         current_user_id = get_jwt_identity()
-        # Getting the current user
-        current_user = self.user_service.get_user_by_id(current_user_id)
-        if not current_user:
+        # Getting the current user (served from the profile cache when warm)
+        entry = self.user_service.get_user_profile(current_user_id)
+        if not entry:
             return make_response(jsonify({"error": "User not found"}), 404)
+        current_user, version, updated_at = entry
 
-        # Same response as in the login        
-        return make_response(jsonify({
-            "id": current_user.id,
-            "name": current_user.name,
-            "surname": current_user.surname,
-            "email": current_user.email,
-            "user_type": current_user.user_type
-        }), 200)        
+        # Same response as in the login, or a 304 if the client has it
+        return conditional_response(
+            lambda: current_user, user_etag(current_user_id, version), updated_at
+        )
 
 
     def refresh_token(self):
-        try:
-            verify_jwt_in_request(refresh=True)
-        except Exception as e:
-            return make_response(jsonify({"error": str(e)}), 401)
         current_user = get_jwt_identity()
         new_access_token = create_access_token(
             identity=current_user,
@@ -160,4 +168,49 @@ class AuthController:
         return make_response(jsonify({
             "access_token": new_access_token,
             "token_type": "Bearer"
-        }), 200)
\ No newline at end of file
+        }), 200)
+
+    def logout(self):
+        """Revokes the token used for the request and, when given in the
+        body, the refresh token of the same user."""
+        data = request.get_json(silent=True) or {}
+        try:
+            schema_registry.validate('logout_schema', data)
+        except ValidationError as e:
+            return make_response(jsonify({"error": e.message}), 400)
+
+        refresh_payload = None
+        if data.get('refresh_token'):
+            try:
+                refresh_payload = decode_token(data['refresh_token'])
+            except Exception:
+                return make_response(jsonify({"error": "Invalid refresh token"}), 400)
+            if (
+                refresh_payload.get('type') != 'refresh'
+                or refresh_payload.get('sub') != get_jwt_identity()
+            ):
+                return make_response(jsonify({"error": "Invalid refresh token"}), 400)
+
+        token_blocklist.revoke(get_jwt())
+        if refresh_payload:
+            token_blocklist.revoke(refresh_payload)
+        return make_response(jsonify({"message": "Logged out"}), 200)
+
+    def revoke_token(self):
+        data = request.get_json(silent=True)
+        if not data:
+            return make_response(jsonify({"error": "No input data provided"}), 400)
+        try:
+            schema_registry.validate('revoke_schema', data)
+        except ValidationError as e:
+            return make_response(jsonify({"error": e.message}), 400)
+
+        # Revoking an already revoked token is a no-op
+        try:
+            payload = decode_token(data['token'])
+        except Exception:
+            return make_response(jsonify({"error": "Invalid token"}), 400)
+
+        token_blocklist.revoke(payload)
+        log.info(f"API: Revoked {payload.get('type')} token of user {payload.get('sub')}")
+        return make_response(jsonify({"jti": payload["jti"], "revoked": True}), 200)
@@ -0,0 +1,37 @@
+from flask import Blueprint, jsonify, make_response
+from flask_jwt_extended import get_jwt_identity
+from core import job_queue
+from core.authorization import requires_role, is_admin
+
+
+class JobController:
+    def __init__(self):
+        self.bp = Blueprint('job_bp', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        self.bp.add_url_rule(
+            '/jobs/<int:job_id>',
+            view_func=requires_role()(self.get_job),
+            methods=['GET']
+            )
+
+    def _serialize_job(self, job):
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "last_error": job.last_error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+
+    def get_job(self, job_id):
+        job = job_queue.get(job_id)
+        # Other users' jobs are reported as missing
+        if not job or (not is_admin() and job.user_id != int(get_jwt_identity())):
+            return make_response(jsonify({"error": "Job not found"}), 404)
+        return make_response(jsonify(self._serialize_job(job)), 200)
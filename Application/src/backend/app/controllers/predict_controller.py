@@ -0,0 +1,95 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import numpy as np
+from flask import Blueprint, current_app, request, jsonify, make_response
+from core import predictor
+from core.authorization import requires_role
+from logger import log
+
+
+def _as_epochs(values, shape):
+    """(n, *shape) array of one epoch or a batch of epochs, None when the
+    layout does not match ``shape``.
+
+    Only the batch axis and singleton axes may be left out (they do not
+    change the order of the values); transposed or flattened epochs are
+    rejected instead of being reshaped into garbage.
+    """
+    epoch = tuple(dim for dim in shape if dim != 1)
+    if tuple(dim for dim in values.shape if dim != 1) == epoch:
+        return values.reshape(1, *shape)
+    if values.ndim > 0 and values.shape[0] > 0 \
+            and tuple(dim for dim in values.shape[1:] if dim != 1) == epoch:
+        return values.reshape(-1, *shape)
+    return None
+
+
+class PredictController:
+    def __init__(self):
+        self.bp = Blueprint('predict_bp', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        self.bp.add_url_rule(
+            '/predict',
+            view_func=requires_role()(self.predict),
+            methods=['POST']
+            )
+
+    def predict(self):
+        if not predictor.available:
+            return make_response(
+                jsonify({"error": "Prediction service unavailable"}), 503
+            )
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return make_response(jsonify({"error": "No input data provided"}), 400)
+
+        # Each input holds one epoch or a list of epochs, e.g. eeg_input as
+        # (6, 1000) or (n, 6, 1000); singleton axes are optional.
+        inputs = {}
+        epochs = None
+        for name, shape in predictor.input_shapes.items():
+            if name not in data:
+                return make_response(jsonify({"error": f"Missing {name}"}), 400)
+            try:
+                values = np.asarray(data[name], dtype=np.float32)
+            except (TypeError, ValueError):
+                return make_response(jsonify({"error": f"Invalid {name}"}), 400)
+            inputs[name] = _as_epochs(values, shape)
+            if inputs[name] is None:
+                return make_response(
+                    jsonify({"error": f"{name} must contain epochs of shape {list(shape)}"}),
+                    400
+                )
+            if epochs is None:
+                epochs = inputs[name].shape[0]
+            elif inputs[name].shape[0] != epochs:
+                return make_response(
+                    jsonify({"error": "Inputs have different numbers of epochs"}), 400
+                )
+
+        if epochs > current_app.config["INFERENCE_MAX_EPOCHS_PER_REQUEST"]:
+            return make_response(jsonify({"error": "Too many epochs"}), 413)
+
+        try:
+            scores = predictor.predict(
+                inputs, timeout=current_app.config["INFERENCE_TIMEOUT"]
+            )
+        except FutureTimeoutError:
+            return make_response(jsonify({"error": "Prediction timed out"}), 504)
+        except Exception as e:
+            log.error(f"Prediction failed: {e}")
+            return make_response(jsonify({"error": "Prediction failed"}), 500)
+
+        # Same convention as the mobile app: the predicted rating is the
+        # index of the highest softmax score
+        return make_response(jsonify({
+            "predictions": [
+                {
+                    "predicted_rating": int(np.argmax(epoch_scores)),
+                    "scores": epoch_scores.tolist()
+                }
+                for epoch_scores in scores
+            ]
+        }), 200)
@@ -0,0 +1,188 @@
+from flask import Blueprint, current_app, request, jsonify, make_response
+from flask_jwt_extended import get_jwt_identity
+from core.authorization import requires_role, is_admin
+from services import RatingService
+from serializers import rating_history_serializer
+
+
+class RatingController:
+    """Rating history and aggregates.
+
+    The aggregates are read from the rating_summaries counters, kept up to
+    date as sessions are rated, so no request aggregates the sessions.
+    Users see their own ratings; other users', per-food and overall
+    figures are for admins.
+    """
+
+    def __init__(self):
+        self.rating_service = RatingService()
+        self.bp = Blueprint('rating_bp', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        self.bp.add_url_rule(
+            '/ratings',
+            view_func=requires_role()(self.get_history),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/ratings/summary',
+            view_func=requires_role()(self.get_user_summary),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/ratings/summary/overall',
+            view_func=requires_role('admin')(self.get_overall_summary),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/ratings/summary/foods',
+            view_func=requires_role('admin')(self.get_food_summaries),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/ratings/summary/foods/<food>',
+            view_func=requires_role('admin')(self.get_food_summary),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/ratings/trends',
+            view_func=requires_role()(self.get_user_trend),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/ratings/trends/overall',
+            view_func=requires_role('admin')(self.get_overall_trend),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/ratings/trends/foods/<food>',
+            view_func=requires_role('admin')(self.get_food_trend),
+            methods=['GET']
+            )
+
+    def _serialize_summary(self, summary):
+        return {
+            "count": summary.count,
+            "mean": round(summary.mean, 3) if summary.count else None,
+            "distribution": {
+                str(value): count for value, count in summary.distribution.items()
+            },
+            "first_rated_at": summary.first_rated_at,
+            "last_rated_at": summary.last_rated_at
+        }
+
+    def _target_user(self):
+        """(user_id, error): the ?user_id= of the request (the caller by
+        default), or the error response when it is malformed or the caller
+        may not see that user's ratings."""
+        own_id = int(get_jwt_identity())
+        user_id = request.args.get('user_id')
+        if user_id is None:
+            return own_id, None
+        try:
+            user_id = int(user_id)
+        except ValueError:
+            return None, make_response(jsonify({"error": "Invalid user_id"}), 400)
+        if user_id != own_id and not is_admin():
+            return None, make_response(jsonify({"error": "Forbidden"}), 403)
+        return user_id, None
+
+    def get_history(self):
+        user_id, error = self._target_user()
+        if error is not None:
+            return error
+        # A malformed cursor is an error, not the first page again
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            try:
+                cursor = int(cursor)
+            except ValueError:
+                return make_response(jsonify({"error": "Invalid cursor"}), 400)
+        try:
+            limit = int(request.args.get(
+                'limit', current_app.config["RATINGS_PAGE_DEFAULT_LIMIT"]
+            ))
+        except ValueError:
+            return make_response(jsonify({"error": "Invalid limit"}), 400)
+        if limit < 1:
+            return make_response(jsonify({"error": "Invalid limit"}), 400)
+        limit = min(limit, current_app.config["RATINGS_PAGE_MAX_LIMIT"])
+
+        try:
+            ratings = self.rating_service.get_history(user_id, cursor, limit)
+        except ValueError:
+            return make_response(jsonify({"error": "Invalid cursor"}), 400)
+        response = make_response(
+            jsonify(rating_history_serializer.dump_many(ratings)), 200
+        )
+        # Same paging as /users: a plain list, the next page in headers
+        if len(ratings) == limit:
+            next_cursor = ratings[-1].id
+            response.headers['X-Next-Cursor'] = str(next_cursor)
+            response.headers['Link'] = (
+                f'</ratings?user_id={user_id}&cursor={next_cursor}&limit={limit}>; '
+                'rel="next"'
+            )
+        return response
+
+    def get_user_summary(self):
+        user_id, error = self._target_user()
+        if error is not None:
+            return error
+        summary = self.rating_service.get_summary('user', user_id)
+        return make_response(
+            jsonify({"user_id": user_id, **self._serialize_summary(summary)}), 200
+        )
+
+    def get_overall_summary(self):
+        summary = self.rating_service.get_summary('all')
+        return make_response(jsonify(self._serialize_summary(summary)), 200)
+
+    def get_food_summaries(self):
+        summaries = self.rating_service.get_food_summaries()
+        return make_response(jsonify([
+            {"food": summary.subject, **self._serialize_summary(summary)}
+            for summary in summaries
+        ]), 200)
+
+    def get_food_summary(self, food):
+        summary = self.rating_service.get_summary('food', food)
+        return make_response(
+            jsonify({"food": food, **self._serialize_summary(summary)}), 200
+        )
+
+    def _trend(self, scope, subject, **fields):
+        """?days= (default 30) and ?bucket=day|week|month (default day)."""
+        try:
+            days = int(request.args.get('days', 30))
+        except ValueError:
+            return make_response(jsonify({"error": "Invalid days"}), 400)
+        if not 1 <= days <= current_app.config["RATING_TRENDS_MAX_DAYS"]:
+            return make_response(jsonify({"error": "Invalid days"}), 400)
+        bucket = request.args.get('bucket', 'day')
+        try:
+            trend = self.rating_service.get_trend(scope, subject, days, bucket)
+        except ValueError:
+            return make_response(jsonify({"error": "Invalid bucket"}), 400)
+        return make_response(jsonify({
+            **fields,
+            "bucket": bucket,
+            "days": days,
+            "trend": [
+                {"period_start": row.period_start, **self._serialize_summary(row)}
+                for row in trend
+            ]
+        }), 200)
+
+    def get_user_trend(self):
+        user_id, error = self._target_user()
+        if error is not None:
+            return error
+        return self._trend('user', user_id, user_id=user_id)
+
+    def get_overall_trend(self):
+        return self._trend('all', '')
+
+    def get_food_trend(self, food):
+        return self._trend('food', food, food=food)
@@ -0,0 +1,157 @@
+from flask import Blueprint, current_app, request, jsonify, make_response
+from flask_jwt_extended import get_jwt_identity
+from jsonschema import ValidationError
+from core import schema_registry
+from core.authorization import requires_role, is_admin
+from services import SessionService
+from models import TastingSession
+from exceptions import SessionNotFoundError, SessionClosedError
+from exceptions import InvalidChunkError, ChunkOffsetMismatchError
+from logger import log
+
+
+class SessionController:
+    def __init__(self):
+        self.session_service = SessionService()
+        self.bp = Blueprint('session_bp', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        self.bp.add_url_rule(
+            '/sessions',
+            view_func=requires_role()(self.create_session),
+            methods=['POST']
+            )
+        self.bp.add_url_rule(
+            '/sessions/<int:session_id>',
+            view_func=requires_role()(self.get_session),
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/sessions/<int:session_id>/streams/<stream>',
+            view_func=requires_role()(self.upload_chunk),
+            methods=['POST']
+            )
+        self.bp.add_url_rule(
+            '/sessions/<int:session_id>/complete',
+            view_func=requires_role()(self.complete_session),
+            methods=['POST']
+            )
+
+    def _serialize_session(self, session):
+        return {
+            "id": session.id,
+            "user_id": session.user_id,
+            "food": session.food,
+            "rating": session.rating,
+            "status": session.status,
+            "started_at": session.started_at.isoformat() if session.started_at else None,
+            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
+            "streams": {
+                stream: {
+                    "channels": session.channels(stream),
+                    "sampling_rate": getattr(session, f"{stream}_sampling_rate"),
+                    "bytes": getattr(session, f"{stream}_bytes"),
+                    "frames": getattr(session, f"{stream}_bytes") // session.frame_size(stream)
+                }
+                for stream in TastingSession.STREAMS
+            }
+        }
+
+    def create_session(self):
+        data = request.get_json(silent=True)
+        if not data:
+            return make_response(jsonify({"error": "No input data provided"}), 400)
+        try:
+            schema_registry.validate('session_schema', data)
+        except ValidationError as e:
+            return make_response(jsonify({"error": e.message}), 400)
+
+        try:
+            session = self.session_service.create_session(
+                get_jwt_identity(),
+                data['eeg_sampling_rate'],
+                data['hr_sampling_rate'],
+                data['eda_sampling_rate'],
+                data.get('eeg_channels', 6),
+                data.get('food'),
+                data.get('started_at')
+            )
+        except ValueError:
+            return make_response(jsonify({"error": "Invalid started_at"}), 400)
+        return make_response(jsonify(self._serialize_session(session)), 201)
+
+    def get_session(self, session_id):
+        try:
+            session = self.session_service.get_session(
+                session_id, get_jwt_identity(), is_admin()
+            )
+        except SessionNotFoundError:
+            return make_response(jsonify({"error": "Session not found"}), 404)
+        return make_response(jsonify(self._serialize_session(session)), 200)
+
+    def upload_chunk(self, session_id, stream):
+        """Appends a chunk of little-endian float32 frames to a stream.
+
+        The body is streamed to disk as it arrives. The optional
+        X-Chunk-Offset header must equal the bytes already stored for the
+        stream; on mismatch the expected offset is returned with a 409.
+        """
+        if stream not in TastingSession.STREAMS:
+            return make_response(jsonify({"error": "Unknown stream"}), 404)
+        length = request.content_length
+        if length is None:
+            return make_response(jsonify({"error": "Content-Length required"}), 411)
+        if length > current_app.config["SESSION_MAX_CHUNK_BYTES"]:
+            return make_response(jsonify({"error": "Chunk too large"}), 413)
+        offset = request.headers.get('X-Chunk-Offset', type=int)
+
+        try:
+            session = self.session_service.get_session(session_id, get_jwt_identity())
+            size = self.session_service.append_chunk(
+                session, stream, request.stream, length, offset
+            )
+        except SessionNotFoundError:
+            return make_response(jsonify({"error": "Session not found"}), 404)
+        except SessionClosedError:
+            return make_response(jsonify({"error": "Session already complete"}), 409)
+        except ChunkOffsetMismatchError as e:
+            return make_response(jsonify({
+                "error": "Chunk offset mismatch",
+                "expected_offset": e.expected_offset
+            }), 409)
+        except InvalidChunkError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        return make_response(jsonify({
+            "stream": stream,
+            "bytes": size,
+            "frames": size // session.frame_size(stream)
+        }), 200)
+
+    def complete_session(self, session_id):
+        data = request.get_json(silent=True)
+        if not data:
+            return make_response(jsonify({"error": "No input data provided"}), 400)
+        try:
+            schema_registry.validate('session_complete_schema', data)
+        except ValidationError as e:
+            return make_response(jsonify({"error": e.message}), 400)
+
+        try:
+            session = self.session_service.get_session(session_id, get_jwt_identity())
+            session, job = self.session_service.complete_session(
+                session, data['rating'], data.get('food')
+            )
+        except SessionNotFoundError:
+            return make_response(jsonify({"error": "Session not found"}), 404)
+        except SessionClosedError:
+            return make_response(jsonify({"error": "Session already complete"}), 409)
+        log.info(f"API: Session {session.id} completed (rating={session.rating})")
+        # Preprocessing runs in the background: poll the job for its outcome
+        response = make_response(jsonify({
+            "session": self._serialize_session(session),
+            "job_id": job.id
+        }), 202)
+        response.headers['Location'] = f"/jobs/{job.id}"
+        return response
@@ -0,0 +1,33 @@
+from flask import Blueprint, jsonify, make_response
+from core import db, user_profile_cache, pool_metrics
+from core.authorization import role_guard
+
+
+class StatsController:
+    def __init__(self):
+        self.bp = Blueprint('stats_bp', __name__)
+        # Every stats route is admin only
+        self.bp.before_request(role_guard('admin'))
+        self._register_routes()
+
+    def _register_routes(self):
+        self.bp.add_url_rule(
+            '/stats/cache',
+            view_func=self.get_cache_stats,
+            methods=['GET']
+            )
+        self.bp.add_url_rule(
+            '/stats/db-pool',
+            view_func=self.get_db_pool_stats,
+            methods=['GET']
+            )
+
+    def get_cache_stats(self):
+        return make_response(
+            jsonify({"user_profile": user_profile_cache.stats()}), 200
+        )
+
+    def get_db_pool_stats(self):
+        return make_response(
+            jsonify({"db_pool": pool_metrics.stats(db.engine.pool)}), 200
+        )
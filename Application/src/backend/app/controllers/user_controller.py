@@ -1,9 +1,14 @@
-from flask import Blueprint, request, jsonify, make_response
+import csv
+import io
+from itertools import islice
+from flask import Blueprint, Response, current_app, request, jsonify, make_response
+from flask import stream_with_context
 from services import UserService
-from jsonschema import validate, ValidationError
+from exceptions import HashingPoolSaturatedError
 from logger import log
-import json
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from core.authorization import requires_role
+from core.http_cache import conditional_response, listing_etag, user_etag
+from serializers import user_serializer
 
 
 class UserController:
@@ -15,70 +20,142 @@ class UserController:
     def _register_routes(self):
         self.bp.add_url_rule(
             '/users/<int:user_id>', 
-            view_func=self.get_user, 
+            view_func=requires_role('admin')(self.get_user), 
             methods=['GET']
             )
         self.bp.add_url_rule(
             '/users', 
-            view_func=self.get_users, 
+            view_func=requires_role('admin')(self.get_users), 
             methods=['GET']
             )
+        self.bp.add_url_rule(
+            '/users/bulk', 
+            view_func=requires_role('admin')(self.bulk_create_users), 
+            methods=['POST']
+            )
     
     def get_users(self):
-        
         log.info("API: Get Users")
-        try:
-            verify_jwt_in_request()
-            claims = get_jwt()
-            if claims.get('user_type') != 'admin':
+        # A malformed cursor is an error, not the first page again (a
+        # client following it would loop forever)
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            try:
+                cursor = int(cursor)
+            except ValueError:
+                cursor = -1
+            if cursor < 0:
                 return make_response(
-                    jsonify({"error": "Unauthorized"}), 401
+                    jsonify({"error": "Invalid cursor"}), 400
                 )
-        except Exception as e:
-            log.error(f"JWT verification failed: {e}")
+        try:
+            limit = int(request.args.get(
+                'limit', current_app.config["USERS_PAGE_DEFAULT_LIMIT"]
+            ))
+        except ValueError:
             return make_response(
-                jsonify({"error": "Unauthorized"}), 401
+                jsonify({"error": "Invalid limit"}), 400
             )
-            
-        users = self.user_service.get_all_users()
-        return make_response(
-            jsonify([{
-                "id": user.id,
-                "name": user.name,
-                "surname": user.surname,
-                "user_type": user.user_type,
-                "dateOfBirth": user.dateOfBirth.isoformat(),
-                "email": user.email
-            } for user in users]), 200
-        )
-    
-    def get_user(self, user_id):
-        try:
-            verify_jwt_in_request()
-            claims = get_jwt()
-            if claims.get('user_type') != 'admin':
+        if limit < 1:
+            return make_response(
+                jsonify({"error": "Invalid limit"}), 400
+            )
+        # Optional projection, e.g. ?fields=id,email
+        serializer = user_serializer
+        if request.args.get('fields'):
+            try:
+                serializer = user_serializer.only(request.args['fields'].split(','))
+            except KeyError as e:
                 return make_response(
-                    jsonify({"error": "Unauthorized"}), 401
+                    jsonify({"error": f"Unknown fields: {e.args[0]}"}), 400
                 )
-        except Exception as e:
-            log.error(f"JWT verification failed: {e}")
-            return make_response(
-                jsonify({"error": "Unauthorized"}), 401
+
+        if (request.args.get('format') == 'ndjson'
+                or request.accept_mimetypes.best == 'application/x-ndjson'):
+            return self._stream_users(
+                cursor, limit if 'limit' in request.args else None, serializer
             )
+
+        limit = min(limit, current_app.config["USERS_PAGE_MAX_LIMIT"])
+        users = self.user_service.get_users_page(cursor, limit)
+        response = conditional_response(
+            lambda: serializer.dump_many(users), listing_etag(users, serializer.names)
+        )
+        # The body stays a plain list; the next page is advertised in headers
+        if len(users) == limit:
+            next_cursor = users[-1].id
+            response.headers['X-Next-Cursor'] = str(next_cursor)
+            response.headers['Link'] = (
+                f'</users?cursor={next_cursor}&limit={limit}>; rel="next"'
+            )
+        return response
+
+    def _stream_users(self, cursor, limit, serializer):
+        users = self.user_service.iter_users(
+            cursor, current_app.config["USERS_STREAM_BATCH_SIZE"]
+        )
+        if limit is not None:
+            users = islice(users, limit)
+        dumps = current_app.json.dumps
+
+        def generate():
+            for user in users:
+                yield dumps(serializer.dump(user)) + "\n"
+
+        return Response(
+            stream_with_context(generate()),
+            status=200,
+            mimetype='application/x-ndjson'
+        )
+
+    def get_user(self, user_id):
         user = self.user_service.get_user_by_id(user_id)
         if user:
-            return make_response(
-                jsonify({
-                    "id": user.id,
-                    "name": user.name,
-                    "surname": user.surname,
-                    "dateOfBirth": user.dateOfBirth.isoformat(),
-                    "email": user.email,
-                    "user_type": user.user_type
-                }), 200
+            return conditional_response(
+                lambda: user_serializer.dump(user),
+                user_etag(user.id, user.version),
+                user.updated_at
             )
         return make_response(
             jsonify({"error": "User not found"}), 404
         )
 
-    
+    def bulk_create_users(self):
+        if request.mimetype == 'text/csv':
+            reader = csv.DictReader(io.StringIO(request.get_data(as_text=True)))
+            rows = [row for row in reader if any(row.values())]
+        else:
+            rows = request.get_json(silent=True)
+            if not isinstance(rows, list):
+                return make_response(
+                    jsonify({"error": "Expected a JSON array or CSV body"}), 400
+                )
+        if not rows:
+            return make_response(
+                jsonify({"error": "No input data provided"}), 400
+            )
+        if len(rows) > current_app.config["BULK_IMPORT_MAX_ROWS"]:
+            return make_response(
+                jsonify({"error": "Too many rows"}), 413
+            )
+
+        try:
+            results = self.user_service.bulk_create_users(
+                rows, current_app.config["BULK_INSERT_BATCH_SIZE"]
+            )
+        except HashingPoolSaturatedError:
+            response = make_response(
+                jsonify({"error": "Server busy, please retry later"}), 429
+            )
+            response.headers["Retry-After"] = "1"
+            return response
+
+        created = sum(1 for result in results if result["status"] == "created")
+        log.info(f"API: Bulk import, {created}/{len(results)} users created")
+        return make_response(
+            jsonify({
+                "created": created,
+                "failed": len(results) - created,
+                "results": results
+            }), 200
+        )
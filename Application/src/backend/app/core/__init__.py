@@ -1 +1,20 @@
-from .database import db
\ No newline at end of file
+from .database import db
+from .metrics import metrics
+from .schema_registry import SchemaRegistry
+from .password_hasher import PasswordHasher
+from .cache import TTLCache
+from .db_pool import pool_metrics
+from .rate_limiter import RateLimiter
+from .inference import BatchedPredictor
+from .job_queue import JobQueue
+from .token_blocklist import TokenBlocklist
+from .schema_migrations import MigrationRunner
+
+schema_registry = SchemaRegistry()
+password_hasher = PasswordHasher()
+user_profile_cache = TTLCache()
+rate_limiter = RateLimiter()
+predictor = BatchedPredictor()
+job_queue = JobQueue()
+token_blocklist = TokenBlocklist()
+schema_migrations = MigrationRunner()
@@ -0,0 +1,83 @@
+import json
+from functools import wraps
+from flask import Response, g
+from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from logger import log
+
+# Bodies serialized once; only the Response wrapper is built per request
+_UNAUTHORIZED = json.dumps({"error": "Unauthorized"}, separators=(",", ":")) + "\n"
+_FORBIDDEN = json.dumps({"error": "Forbidden"}, separators=(",", ":")) + "\n"
+
+
+def unauthorized():
+    return Response(_UNAUTHORIZED, status=401, mimetype="application/json")
+
+
+def forbidden():
+    return Response(_FORBIDDEN, status=403, mimetype="application/json")
+
+
+def current_claims(refresh=False, verify_type=True):
+    """Returns the claims of the request's JWT, or None when it is missing
+    or invalid.
+
+    The token is verified once per request and set of flags; the claims
+    are cached on ``flask.g`` for every later guard and view asking for
+    the same verification (an access-token check never answers a
+    refresh-token one, or the reverse).
+    """
+    if "jwt_claims" not in g:
+        g.jwt_claims = {}
+    key = (refresh, verify_type)
+    if key not in g.jwt_claims:
+        try:
+            verify_jwt_in_request(refresh=refresh, verify_type=verify_type)
+            g.jwt_claims[key] = get_jwt()
+        except Exception as e:
+            log.info(f"JWT verification failed: {e}")
+            g.jwt_claims[key] = None
+    return g.jwt_claims[key]
+
+
+def is_admin():
+    claims = current_claims()
+    return claims is not None and claims.get("user_type") == "admin"
+
+
+def _check(roles, refresh, verify_type):
+    claims = current_claims(refresh, verify_type)
+    if claims is None:
+        return unauthorized()
+    if roles and claims.get("user_type") not in roles:
+        return forbidden()
+    return None
+
+
+def requires_role(*roles, refresh=False, verify_type=True):
+    """Decorates a view that needs a valid JWT and, when ``roles`` are given,
+    a ``user_type`` claim among them.
+
+    Requests without a valid token get a 401, those with a valid token but
+    another role a 403.
+    """
+    roles = frozenset(roles)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            error = _check(roles, refresh, verify_type)
+            if error is not None:
+                return error
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def role_guard(*roles):
+    """Same check as requires_role, as a ``before_request`` hook guarding a
+    whole blueprint."""
+    roles = frozenset(roles)
+
+    def guard():
+        return _check(roles, False, True)
+    return guard
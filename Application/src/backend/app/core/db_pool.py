@@ -0,0 +1,130 @@
+import threading
+import time
+from flask import g, has_request_context
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from logger import log
+
+
+class PoolMetrics:
+    """Counters for connection checkouts across every TimedQueuePool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.slow_checkout_ms = 100.0
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.checkout_timeouts = 0
+        self.saturated_checkouts = 0
+        self.in_use = 0
+        self.in_use_max = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        self.slow_checkout_ms = app.config["DB_SLOW_CHECKOUT_MS"]
+        # Must run before db.init_app(), which creates the engine
+        options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+        if "pool_size" in options:
+            options.setdefault("poolclass", TimedQueuePool)
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+        app.after_request(self._after_request)
+        app.extensions["db_pool_metrics"] = self
+
+    def record_wait(self, seconds, saturated):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            if seconds > self.checkout_seconds_max:
+                self.checkout_seconds_max = seconds
+            if saturated:
+                self.saturated_checkouts += 1
+        if has_request_context():
+            g.db_checkout_seconds = g.get("db_checkout_seconds", 0.0) + seconds
+
+    def record_timeout(self):
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.in_use += 1
+            if self.in_use > self.in_use_max:
+                self.in_use_max = self.in_use
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.in_use -= 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _after_request(self, response):
+        waited = g.get("db_checkout_seconds")
+        if waited is not None:
+            waited_ms = waited * 1000
+            response.headers.add("Server-Timing", f"db-checkout;dur={waited_ms:.2f}")
+            if waited_ms > self.slow_checkout_ms:
+                log.warning(f"Slow DB connection checkout: {waited_ms:.1f} ms")
+        return response
+
+    def stats(self, pool=None):
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "checkout_seconds_total": self.checkout_seconds_total,
+                "checkout_seconds_max": self.checkout_seconds_max,
+                "checkout_seconds_avg": (
+                    self.checkout_seconds_total / self.checkouts
+                    if self.checkouts else 0.0
+                ),
+                "checkout_timeouts": self.checkout_timeouts,
+                "saturated_checkouts": self.saturated_checkouts,
+                "in_use": self.in_use,
+                "in_use_max": self.in_use_max,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        # Every base connection is in use: this checkout either opens an
+        # overflow connection or waits for a checkin.
+        saturated = self.checkedout() >= self.size()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start, saturated)
+
+
+event.listen(TimedQueuePool, "checkout", pool_metrics._on_checkout)
+event.listen(TimedQueuePool, "checkin", pool_metrics._on_checkin)
+event.listen(TimedQueuePool, "connect", pool_metrics._on_connect)
+event.listen(TimedQueuePool, "invalidate", pool_metrics._on_invalidate)
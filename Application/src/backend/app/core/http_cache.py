@@ -0,0 +1,66 @@
+import hashlib
+from datetime import timezone
+from operator import attrgetter, itemgetter
+from flask import current_app, request, jsonify, make_response
+
+
+def user_etag(user_id, version):
+    return f"u{user_id}.{version}"
+
+
+def listing_etag(rows, fields=()):
+    """ETag of a list of rows with ``id`` and ``version``: changes when any
+    row is updated, added to or removed from the list, or with the
+    ``fields`` it is rendered with."""
+    rows = list(rows)
+    row_fields = getattr(rows[0], "_fields", None) if rows else None
+    if row_fields is not None:
+        # Result rows are much cheaper to read by position than by name
+        row_version = itemgetter(row_fields.index("id"), row_fields.index("version"))
+    else:
+        row_version = attrgetter("id", "version")
+    validators = ",".join(fields) + ";" + ";".join(
+        "%s.%s" % row_version(row) for row in rows
+    )
+    return hashlib.blake2b(validators.encode(), digest_size=12).hexdigest()
+
+
+def _http_date(value):
+    # The columns hold naive UTC datetimes; HTTP dates have 1 s resolution
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def is_not_modified(etag, last_modified=None):
+    """Whether the client's copy (If-None-Match, or If-Modified-Since when
+    no ETag is sent) is still current."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return _http_date(last_modified) <= request.if_modified_since
+    return False
+
+
+def conditional_response(body, etag, last_modified=None):
+    """A 200 with the JSON of ``body()``, or an empty 304 when the client's
+    copy is current; ``body`` is only called for the 200, so an unchanged
+    resource is never serialized.
+
+    The responses depend on the caller's token: they may only be kept by
+    the client (private) and are revalidated with the ETag before reuse,
+    unless HTTP_CACHE_MAX_AGE allows reusing them for a while.
+    """
+    if is_not_modified(etag, last_modified):
+        response = make_response("", 304)
+    else:
+        response = make_response(jsonify(body()), 200)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    max_age = current_app.config["HTTP_CACHE_MAX_AGE"]
+    response.headers["Cache-Control"] = (
+        f"private, max-age={max_age}" if max_age > 0 else "private, no-cache"
+    )
+    response.vary.add("Authorization")
+    return response
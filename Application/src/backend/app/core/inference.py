@@ -0,0 +1,187 @@
+import importlib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from logger import log
+from .metrics import metrics
+
+
+def _load_interpreter_class():
+    # Any of the TFLite runtimes will do; the full TensorFlow is the last resort
+    for module_name in ("ai_edge_litert.interpreter", "tflite_runtime.interpreter"):
+        try:
+            return importlib.import_module(module_name).Interpreter
+        except ImportError:
+            pass
+    try:
+        import tensorflow as tf
+        return tf.lite.Interpreter
+    except ImportError:
+        return None
+
+
+class _PendingRequest:
+    __slots__ = ("inputs", "size", "future", "enqueued_at")
+
+    def __init__(self, inputs, size):
+        self.inputs = inputs
+        self.size = size
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class _PooledInterpreter:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.inputs = {}
+        for detail in interpreter.get_input_details():
+            # Exported names look like "serving_default_eeg_input:0"
+            for name in ("eeg_input", "hr_input", "eda_input"):
+                if name in detail["name"]:
+                    self.inputs[name] = detail
+        self.output = interpreter.get_output_details()[0]
+        self.batch_size = int(self.output["shape"][0])
+
+    def run(self, inputs, batch_size):
+        if batch_size != self.batch_size:
+            for name, detail in self.inputs.items():
+                self.interpreter.resize_tensor_input(
+                    detail["index"], [batch_size, *detail["shape"][1:]]
+                )
+            self.interpreter.allocate_tensors()
+            self.batch_size = batch_size
+        for name, detail in self.inputs.items():
+            self.interpreter.set_tensor(detail["index"], inputs[name])
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output["index"]).copy()
+
+
+class BatchedPredictor:
+    """Scores EEG/HR/EDA epochs with the TFLite model in micro-batches.
+
+    Requests arriving within ``max_wait`` of each other are concatenated
+    and scored with a single invoke() on one of the pooled interpreters.
+    """
+
+    def __init__(self):
+        self.available = False
+        self.input_shapes = {}
+        self.max_batch = 32
+        self.max_wait = 0.005
+        self._interpreters = queue.Queue()
+        self._requests = queue.Queue()
+        self._executor = None
+        self._batcher = None
+
+        self.latency = metrics.histogram(
+            "inference_duration_seconds",
+            "Time spent in a batched TFLite invoke",
+        )
+        self.request_latency = metrics.histogram(
+            "inference_request_duration_seconds",
+            "Time from enqueueing an inference request to its result",
+        )
+        self.batch_size = metrics.histogram(
+            "inference_batch_size",
+            "Epochs scored per TFLite invoke",
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+        )
+
+    def init_app(self, app):
+        model_path = app.config["TFLITE_MODEL_PATH"]
+        interpreter_cls = _load_interpreter_class()
+        if interpreter_cls is None:
+            log.warning("No TFLite runtime installed, /predict is disabled")
+            return
+        if not os.path.exists(model_path):
+            log.warning(f"TFLite model {model_path} not found, /predict is disabled")
+            return
+
+        self.max_batch = app.config["INFERENCE_MAX_BATCH"]
+        self.max_wait = app.config["INFERENCE_MAX_WAIT_MS"] / 1000
+        # The model is read from disk once and shared by every interpreter
+        with open(model_path, "rb") as model_file:
+            model_content = model_file.read()
+        pool_size = app.config["INFERENCE_INTERPRETERS"]
+        for _ in range(pool_size):
+            interpreter = interpreter_cls(
+                model_content=model_content,
+                num_threads=app.config["INFERENCE_THREADS_PER_INTERPRETER"],
+            )
+            interpreter.allocate_tensors()
+            self._interpreters.put(_PooledInterpreter(interpreter))
+
+        pooled = self._interpreters.queue[0]
+        self.input_shapes = {
+            name: tuple(int(dim) for dim in detail["shape"][1:])
+            for name, detail in pooled.inputs.items()
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="inference"
+        )
+        self._batcher = threading.Thread(
+            target=self._batch_loop, name="inference-batcher", daemon=True
+        )
+        self._batcher.start()
+        self.available = True
+        app.extensions["predictor"] = self
+
+    def predict(self, inputs, timeout=None):
+        """Scores ``inputs`` ({input name: float32 array (n, *shape)}) and
+        returns the (n, classes) softmax scores."""
+        size = next(iter(inputs.values())).shape[0]
+        request = _PendingRequest(inputs, size)
+        self._requests.put(request)
+        return request.future.result(timeout=timeout)
+
+    def _batch_loop(self):
+        carried = None
+        while True:
+            batch = [carried or self._requests.get()]
+            carried = None
+            size = batch[0].size
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if size + request.size > self.max_batch:
+                    # Opens the next batch, so that max_batch is an upper
+                    # bound (a single larger request still runs alone)
+                    carried = request
+                    break
+                batch.append(request)
+                size += request.size
+            self._executor.submit(self._run_batch, batch, size)
+
+    def _run_batch(self, batch, size):
+        pooled = self._interpreters.get()
+        try:
+            inputs = {
+                name: np.concatenate([request.inputs[name] for request in batch])
+                for name in self.input_shapes
+            }
+            start = time.perf_counter()
+            scores = pooled.run(inputs, size)
+            self.latency.observe(time.perf_counter() - start)
+            self.batch_size.observe(size)
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        finally:
+            self._interpreters.put(pooled)
+
+        offset = 0
+        now = time.perf_counter()
+        for request in batch:
+            request.future.set_result(scores[offset:offset + request.size])
+            offset += request.size
+            self.request_latency.observe(now - request.enqueued_at)
@@ -0,0 +1,149 @@
+import os
+import socket
+import threading
+import time
+import traceback
+from .database import db
+from .metrics import metrics
+from logger import log
+
+
+class JobQueue:
+    """Background jobs persisted in the application database.
+
+    Every server process runs ``JOB_WORKERS`` threads that claim queued jobs
+    from the ``jobs`` table, so no external broker is needed and jobs
+    survive restarts. Failed jobs are retried with exponential backoff up
+    to their ``max_attempts``.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.repository = None
+        self.handlers = {}
+        self.workers = 0
+        self.poll_interval = 1.0
+        self.retry_backoff = 5.0
+        self.max_attempts = 3
+        self.stale_after = 600
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+        self.duration = metrics.histogram(
+            "job_duration_seconds",
+            "Background job run time",
+            ("kind", "outcome"),
+            buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+        )
+        self.wait = metrics.histogram(
+            "job_queue_wait_seconds",
+            "Time from enqueueing a job to a worker starting it",
+            ("kind",),
+            buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0, 300.0),
+        )
+        self.processed = metrics.counter(
+            "jobs_processed_total",
+            "Background job attempts by outcome (succeeded, retried, failed)",
+            ("kind", "outcome"),
+        )
+
+    def init_app(self, app, repository):
+        self.app = app
+        self.repository = repository
+        self.workers = app.config["JOB_WORKERS"]
+        self.poll_interval = app.config["JOB_POLL_INTERVAL"]
+        self.retry_backoff = app.config["JOB_RETRY_BACKOFF"]
+        self.max_attempts = app.config["JOB_MAX_ATTEMPTS"]
+        self.stale_after = app.config["JOB_STALE_AFTER"]
+        metrics.register_collector("job_queue", "Jobs by status", self.depth)
+        app.extensions["job_queue"] = self
+
+    def register(self, kind, handler):
+        """Registers ``handler(**payload)`` for jobs of the given kind."""
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind, payload, max_attempts=None, user_id=None):
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind {kind}")
+        job = self.repository.create(
+            kind, payload, max_attempts or self.max_attempts, user_id
+        )
+        self._wakeup.set()
+        return job
+
+    def get(self, job_id):
+        return self.repository.get_by_id(job_id)
+
+    def depth(self):
+        counts = self.repository.count_by_status()
+        return {status: counts.get(status, 0)
+                for status in ('queued', 'running', 'succeeded', 'failed')}
+
+    def start(self):
+        # Called once per server process, after the fork
+        if self._threads or self.workers <= 0:
+            return
+        with self.app.app_context():
+            requeued = self.repository.requeue_stale(self.stale_after)
+            if requeued:
+                log.warning(f"Requeued {requeued} stale background jobs")
+        worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(f"{worker_prefix}:{index}",),
+                name=f"job-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self, worker):
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    ran = self.run_next(worker)
+            except Exception:
+                log.error(f"Job worker {worker} error:\n{traceback.format_exc()}")
+                ran = False
+            if not ran:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def run_next(self, worker="inline"):
+        """Claims and runs one job; returns False when the queue is empty."""
+        job = self.repository.claim_next(worker)
+        if job is None:
+            return False
+        self.wait.observe(
+            max(0.0, (job.started_at - job.run_after).total_seconds()), job.kind
+        )
+        start = time.perf_counter()
+        try:
+            self.handlers[job.kind](**job.payload)
+        except Exception as e:
+            db.session.rollback()
+            elapsed = time.perf_counter() - start
+            if job.attempts < job.max_attempts:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                self.repository.mark_failed(job, repr(e), retry_delay=delay)
+                outcome = "retried"
+            else:
+                self.repository.mark_failed(job, repr(e))
+                outcome = "failed"
+            log.warning(f"Job {job.id} ({job.kind}) {outcome}: {e!r}")
+        else:
+            elapsed = time.perf_counter() - start
+            self.repository.mark_succeeded(job)
+            outcome = "succeeded"
+        self.duration.observe(elapsed, job.kind, outcome)
+        self.processed.inc(job.kind, outcome)
+        return True
@@ -0,0 +1,74 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o):
+    # Dates go out as ISO 8601 with either encoder (Flask's default would
+    # use the HTTP date format for them)
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider encoding with orjson when it is installed.
+
+    Without orjson it falls back to the stdlib encoder with the same
+    output: sorted keys, compact separators and ISO 8601 dates.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.fast = orjson is not None
+
+    def _orjson_options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if self.fast and not kwargs:
+            return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode()
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.fast and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (
+            self.compact is None and self._app.debug
+        )
+        if self.fast:
+            # Bytes straight into the response, with no str round trip
+            body = orjson.dumps(
+                obj, default=_default, option=self._orjson_options(indent=pretty)
+            ) + b"\n"
+        elif pretty:
+            body = self.dumps(obj, indent=2) + "\n"
+        else:
+            body = self.dumps(obj, separators=(",", ":")) + "\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
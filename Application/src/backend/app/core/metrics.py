@@ -0,0 +1,244 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import Response, g, request, jsonify, make_response
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escape(value):
+    return (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def _format_labels(labelnames, labelvalues, extra=()):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            lines.extend(self._render_sample(labelvalues, value))
+        return lines
+
+    def _render_sample(self, labelvalues, value):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labelvalues)} "
+            f"{_format_value(value)}"
+        ]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues, amount=1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                # Per-bucket counts (not cumulative), sum, count
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *labelvalues):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def _render_sample(self, labelvalues, state):
+        counts, total, count = state[0][:], state[1], state[2]
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            labels = _format_labels(
+                self.labelnames, labelvalues, [("le", _format_value(bound))]
+            )
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, labelvalues)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text format.
+
+    Each server worker keeps its own registry, so the values scraped from
+    /metrics belong to the worker that served the scrape.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = {}
+        self.token = None
+
+        self.request_latency = self.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route",
+            ("method", "route"),
+        )
+        self.requests = self.counter(
+            "http_requests_total",
+            "HTTP responses by route and status",
+            ("method", "route", "status"),
+        )
+        self.in_flight = self.gauge(
+            "http_requests_in_flight", "HTTP requests being served"
+        )
+        self.in_flight.set(0)
+        self.db_query_latency = self.histogram(
+            "db_query_duration_seconds", "Repository query latency", ("query",)
+        )
+        self.password_hash_latency = self.histogram(
+            "password_hash_duration_seconds",
+            "Password hashing latency, including the wait for a pool slot",
+            ("operation",),
+            buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+        )
+        self.schema_validation_latency = self.histogram(
+            "schema_validation_duration_seconds",
+            "JSON schema validation latency",
+            ("schema",),
+            buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+        )
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, prefix, documentation, collect):
+        """Exposes every numeric value of the dict returned by ``collect()``
+        as a gauge named ``<prefix>_<key>``."""
+        self._collectors[prefix] = (documentation, collect)
+
+    def init_app(self, app):
+        self.token = app.config.get("METRICS_TOKEN")
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule("/metrics", "metrics", self.metrics_view, methods=["GET"])
+        app.extensions["metrics"] = self
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_in_flight = True
+        self.in_flight.inc()
+
+    def _after_request(self, response):
+        start = g.get("metrics_start")
+        if start is not None:
+            # The rule pattern keeps label cardinality bounded
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            self.request_latency.observe(
+                time.perf_counter() - start, request.method, route
+            )
+            self.requests.inc(request.method, route, str(response.status_code))
+        return response
+
+    def _teardown_request(self, exc):
+        if g.pop("metrics_in_flight", False):
+            self.in_flight.dec()
+
+    def timed_query(self, query):
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.db_query_latency.time(query):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for prefix, (documentation, collect) in self._collectors.items():
+            for key, value in collect().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{key}"
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def metrics_view(self):
+        if self.token and request.headers.get("Authorization") != f"Bearer {self.token}":
+            return make_response(jsonify({"error": "Unauthorized"}), 401)
+        return Response(
+            self.render(), mimetype="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+
+metrics = MetricsRegistry()
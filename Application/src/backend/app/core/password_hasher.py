@@ -0,0 +1,123 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+from exceptions import HashingPoolSaturatedError
+from .metrics import metrics
+
+
+def stored_method(method):
+    """The method string werkzeug writes in the hashes it generates for
+    ``method``, i.e. with its default for every parameter left out
+    ("scrypt" and "scrypt:32768" -> "scrypt:32768:8:1")."""
+    name, *args = method.split(":")
+    if name == "scrypt":
+        defaults = [str(2 ** 15), "8", "1"]
+    elif name == "pbkdf2":
+        defaults = ["sha256", str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        return method
+    return ":".join([name, *args, *defaults[len(args):]])
+
+
+class PasswordHasher:
+    """Runs password hashing and verification in a bounded process pool.
+
+    At most ``max_pending`` operations may be queued or running at once;
+    callers that cannot get a slot within ``queue_timeout`` seconds get a
+    HashingPoolSaturatedError instead of piling up on the request threads.
+    """
+
+    def __init__(self):
+        self.method = "scrypt:32768:8:1"
+        self.salt_length = 16
+        self.workers = 2
+        self.max_pending = 16
+        self.queue_timeout = 0.5
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config["PASSWORD_HASH_METHOD"]
+        self.salt_length = app.config["PASSWORD_SALT_LENGTH"]
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.max_pending = app.config["PASSWORD_HASH_MAX_PENDING"]
+        self.queue_timeout = app.config["PASSWORD_HASH_QUEUE_TIMEOUT"]
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        app.extensions["password_hasher"] = self
+
+    def _get_executor(self):
+        # Created on first use so that every server worker process owns its
+        # pool; spawned children do not inherit the parent's threads or sockets.
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    atexit.register(self.shutdown)
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingPoolSaturatedError("Password hashing pool is saturated.")
+        try:
+            if self.workers == 0:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        with metrics.password_hash_latency.time("hash"):
+            return self._run(
+                generate_password_hash, password, self.method, self.salt_length
+            )
+
+    def hash_many(self, passwords):
+        # Every password takes its own slot, so a bulk import shares the
+        # pool with interactive logins instead of monopolising it.
+        if self.workers == 0:
+            return [self.hash(password) for password in passwords]
+        start = time.perf_counter()
+        futures = []
+        try:
+            for password in passwords:
+                if not self._slots.acquire(timeout=self.queue_timeout):
+                    raise HashingPoolSaturatedError(
+                        "Password hashing pool is saturated."
+                    )
+                future = self._get_executor().submit(
+                    generate_password_hash, password, self.method, self.salt_length
+                )
+                future.add_done_callback(lambda _: self._slots.release())
+                futures.append(future)
+        except HashingPoolSaturatedError:
+            for future in futures:
+                future.cancel()
+            raise
+        results = [future.result() for future in futures]
+        metrics.password_hash_latency.observe(
+            time.perf_counter() - start, "hash_many"
+        )
+        return results
+
+    def verify(self, pwhash, password):
+        with metrics.password_hash_latency.time("verify"):
+            return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        # Stored hashes look like "<method>$<salt>$<hash>", with the full
+        # parameters in <method> whatever PASSWORD_HASH_METHOD spells out
+        return pwhash.split("$", 1)[0] != stored_method(self.method)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
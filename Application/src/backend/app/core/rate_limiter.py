@@ -0,0 +1,118 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from flask import request, jsonify, make_response
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate):
+    """Parses "<count>/<second|minute|hour|day>" into (tokens per second, burst)."""
+    count, period = rate.split("/")
+    return int(count) / PERIODS[period.strip()], int(count)
+
+
+class RateLimitStore(ABC):
+    """Backend holding the token buckets.
+
+    The in-memory store is per server process; a store shared by all the
+    workers (e.g. on Redis) only has to implement consume().
+    """
+
+    @abstractmethod
+    def consume(self, key, rate, capacity, cost=1.0):
+        """Takes ``cost`` tokens from the bucket for ``key``.
+
+        Returns 0 when allowed, otherwise the seconds until enough tokens
+        are available again.
+        """
+
+
+class InMemoryTokenBucketStore(RateLimitStore):
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def consume(self, key, rate, capacity, cost=1.0):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Least recently seen keys go first; an evicted key simply
+            # starts again from a full bucket.
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        return retry_after
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+def client_ip():
+    return request.remote_addr
+
+
+def json_field(field):
+    def key_func():
+        data = request.get_json(silent=True)
+        if isinstance(data, dict) and isinstance(data.get(field), str):
+            return data[field].strip().lower()
+        return None
+    return key_func
+
+
+class RateLimiter:
+    def __init__(self, store=None):
+        self.store = store
+        self.enabled = True
+        self.limits = {}
+
+    def init_app(self, app):
+        self.enabled = app.config["RATE_LIMIT_ENABLED"]
+        self.limits = {
+            name: parse_rate(rate)
+            for name, rate in app.config["RATE_LIMITS"].items()
+        }
+        if self.store is None:
+            self.store = InMemoryTokenBucketStore(app.config["RATE_LIMIT_MAX_KEYS"])
+        app.extensions["rate_limiter"] = self
+
+    def limit(self, *rules):
+        """Decorates a view with one or more (limit name, key function) rules.
+
+        The limit parameters are looked up by name in RATE_LIMITS at request
+        time; rules whose key function returns None are skipped.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.enabled:
+                    for name, key_func in rules:
+                        key = key_func()
+                        if key is None:
+                            continue
+                        rate, capacity = self.limits[name]
+                        retry_after = self.store.consume(f"{name}:{key}", rate, capacity)
+                        if retry_after:
+                            return self._too_many_requests(retry_after)
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _too_many_requests(self, retry_after):
+        response = make_response(jsonify({"error": "Too many requests"}), 429)
+        response.headers["Retry-After"] = str(math.ceil(retry_after))
+        return response
@@ -0,0 +1,152 @@
+import importlib.util
+import os
+import re
+from datetime import datetime
+import click
+import sqlalchemy as sa
+from .database import db
+from logger import log
+
+_MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+_LOCK_NAME = "foodback_schema_migrations"
+
+_metadata = sa.MetaData()
+schema_version = sa.Table(
+    "schema_version", _metadata,
+    sa.Column("version", sa.Integer, primary_key=True, autoincrement=False),
+    sa.Column("name", sa.String(255), nullable=False),
+    sa.Column("applied_at", sa.DateTime, nullable=False),
+)
+
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def load(self):
+        spec = importlib.util.spec_from_file_location(
+            f"migrations.m{self.version:04d}_{self.name}", self.path
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+
+class MigrationRunner:
+    """Versioned schema migrations.
+
+    Each ``migrations/NNNN_name.py`` file defines ``upgrade(connection)``;
+    the versions applied so far are recorded in the ``schema_version``
+    table. On MySQL a named lock serializes concurrent runs, e.g. every
+    server worker migrating at startup.
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.lock_timeout = 60
+
+    def init_app(self, app):
+        self.directory = app.config["MIGRATIONS_DIR"]
+        self.lock_timeout = app.config["DB_MIGRATE_LOCK_TIMEOUT"]
+        app.cli.add_command(self._build_cli())
+        app.extensions["schema_migrations"] = self
+
+    def discover(self):
+        migrations = []
+        for filename in sorted(os.listdir(self.directory)):
+            match = _MIGRATION_FILE.match(filename)
+            if match:
+                migrations.append(Migration(
+                    int(match.group(1)), match.group(2),
+                    os.path.join(self.directory, filename)
+                ))
+        versions = [migration.version for migration in migrations]
+        if len(versions) != len(set(versions)):
+            raise RuntimeError("Duplicate migration versions")
+        return migrations
+
+    def applied_versions(self, connection):
+        schema_version.create(connection, checkfirst=True)
+        return {
+            row.version
+            for row in connection.execute(sa.select(schema_version.c.version))
+        }
+
+    def pending(self):
+        with db.engine.connect() as connection:
+            applied = self.applied_versions(connection)
+            connection.commit()
+        return [m for m in self.discover() if m.version not in applied]
+
+    def upgrade(self, target=None):
+        """Applies the pending migrations up to ``target`` (all by default)
+        and returns them."""
+        applied_now = []
+        with db.engine.connect() as connection:
+            locked = self._acquire_lock(connection)
+            try:
+                applied = self.applied_versions(connection)
+                connection.commit()
+                for migration in self.discover():
+                    if migration.version in applied:
+                        continue
+                    if target is not None and migration.version > target:
+                        break
+                    log.info(f"Applying migration {migration.version:04d}_{migration.name}")
+                    # MySQL commits DDL implicitly, so a failed migration may
+                    # be partly applied: migrations are written to be re-runnable
+                    with connection.begin():
+                        migration.load().upgrade(connection)
+                        connection.execute(schema_version.insert().values(
+                            version=migration.version,
+                            name=migration.name,
+                            applied_at=datetime.utcnow()
+                        ))
+                    applied_now.append(migration)
+            finally:
+                if locked:
+                    self._release_lock(connection)
+        return applied_now
+
+    def _acquire_lock(self, connection):
+        if connection.dialect.name != "mysql":
+            return False
+        acquired = connection.execute(
+            sa.text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": _LOCK_NAME, "timeout": self.lock_timeout}
+        ).scalar()
+        connection.commit()
+        if acquired != 1:
+            raise RuntimeError("Timed out waiting for the schema migration lock")
+        return True
+
+    def _release_lock(self, connection):
+        connection.execute(sa.text("SELECT RELEASE_LOCK(:name)"), {"name": _LOCK_NAME})
+        connection.commit()
+
+    def _build_cli(self):
+        runner = self
+
+        @click.group("migrate", help="Database schema migrations.")
+        def cli():
+            pass
+
+        @cli.command("upgrade", help="Apply pending migrations.")
+        @click.option("--target", type=int, default=None, help="Stop at this version.")
+        def upgrade_command(target):
+            applied = runner.upgrade(target)
+            for migration in applied:
+                click.echo(f"Applied {migration.version:04d}_{migration.name}")
+            if not applied:
+                click.echo("Schema is up to date")
+
+        @cli.command("status", help="List applied and pending migrations.")
+        def status_command():
+            pending = {m.version for m in runner.pending()}
+            for migration in runner.discover():
+                state = "pending" if migration.version in pending else "applied"
+                click.echo(f"{migration.version:04d}_{migration.name}: {state}")
+
+        return cli
@@ -0,0 +1,67 @@
+import json
+import os
+import threading
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+from .metrics import metrics
+
+
+class SchemaRegistry:
+    def __init__(self, schemas_dir=None):
+        self.schemas_dir = schemas_dir
+        self._names = set()
+        self._validators = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.schemas_dir = app.config.get("SCHEMAS_DIR", self.schemas_dir)
+        self._discover()
+        # Schemas are otherwise checked and compiled on first use, keeping
+        # that work off the startup path
+        if app.config.get("SCHEMAS_PRELOAD"):
+            self.load()
+        app.extensions["schema_registry"] = self
+
+    def _discover(self):
+        self._names = {
+            file_name[:-len(".json")]
+            for file_name in os.listdir(self.schemas_dir)
+            if file_name.endswith(".json")
+        }
+        self._validators = {}
+
+    def load(self):
+        # Every schema is read, checked against its metaschema and compiled
+        # into a validator exactly once, so requests never touch the disk.
+        self._discover()
+        for name in sorted(self._names):
+            self.get(name)
+
+    def _compile(self, name):
+        with open(os.path.join(self.schemas_dir, f"{name}.json"), "r") as schema_file:
+            schema = json.load(schema_file)
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        return validator_cls(schema)
+
+    def get(self, name):
+        validator = self._validators.get(name)
+        if validator is None:
+            if name not in self._names:
+                raise KeyError(name)
+            with self._lock:
+                validator = self._validators.get(name)
+                if validator is None:
+                    validator = self._validators[name] = self._compile(name)
+        return validator
+
+    def validate(self, name, instance):
+        # Same error selection as jsonschema.validate, without rebuilding
+        # the validator on each call.
+        with metrics.schema_validation_latency.time(name):
+            error = best_match(self.get(name).iter_errors(instance))
+        if error is not None:
+            raise error
+
+    def __contains__(self, name):
+        return name in self._names
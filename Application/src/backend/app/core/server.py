@@ -0,0 +1,37 @@
+from gunicorn.app.base import BaseApplication
+
+
+class StandaloneServer(BaseApplication):
+    """Serves the app through a pre-forked gunicorn worker pool.
+
+    The factory is called inside every worker after the fork, so each
+    process gets its own database engine and connection pool.
+    """
+
+    def __init__(self, app_factory, options=None):
+        self.app_factory = app_factory
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.app_factory()
+
+
+def serve(app_factory, config):
+    options = {
+        "bind": f"{config.SERVER_HOST}:{config.SERVER_PORT}",
+        "workers": config.WEB_WORKERS,
+        "threads": config.WEB_THREADS,
+        "worker_class": "gthread",
+        "keepalive": config.WEB_KEEPALIVE,
+        "timeout": config.WEB_TIMEOUT,
+        "graceful_timeout": config.WEB_GRACEFUL_TIMEOUT,
+        "max_requests": config.WEB_MAX_REQUESTS,
+        "max_requests_jitter": config.WEB_MAX_REQUESTS_JITTER,
+    }
+    StandaloneServer(app_factory, options).run()
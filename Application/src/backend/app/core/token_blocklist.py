@@ -0,0 +1,108 @@
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from .metrics import metrics
+
+
+class BlocklistStore(ABC):
+    """Backend holding the JTIs of revoked tokens until they expire."""
+
+    @abstractmethod
+    def add(self, jti, expires_at, user_id=None, token_type=None):
+        """Revokes ``jti`` until ``expires_at`` (Unix timestamp)."""
+
+    @abstractmethod
+    def contains(self, jti):
+        """Tells whether ``jti`` is revoked."""
+
+    def size(self):
+        """Number of revoked tokens not yet expired."""
+        return 0
+
+
+class InMemoryBlocklistStore(BlocklistStore):
+    """Revoked JTIs in a per-process hash map.
+
+    A JTI only has to be remembered until its token expires, since expired
+    tokens are rejected before the blocklist is consulted: entries are
+    dropped then, so memory stays bounded by the revoked tokens still alive.
+    """
+
+    def __init__(self):
+        self._expiry = {}
+        # (expires_at, jti) min-heap, to drop expired entries in order
+        self._heap = []
+        self._lock = threading.Lock()
+        self.expirations = 0
+
+    def add(self, jti, expires_at, user_id=None, token_type=None):
+        with self._lock:
+            self._purge(time.time())
+            if jti not in self._expiry:
+                heapq.heappush(self._heap, (expires_at, jti))
+            self._expiry[jti] = expires_at
+
+    def contains(self, jti):
+        # A plain dict lookup: the GIL makes it safe without the lock
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def purge(self):
+        with self._lock:
+            self._purge(time.time())
+
+    def _purge(self, now):
+        while self._heap and self._heap[0][0] <= now:
+            _, jti = heapq.heappop(self._heap)
+            self._expiry.pop(jti, None)
+            self.expirations += 1
+
+    def size(self):
+        return len(self._expiry)
+
+
+class TokenBlocklist:
+    """Rejects revoked JWTs through flask_jwt_extended's blocklist hook.
+
+    The in-memory store is per server process, so a token revoked on one
+    worker stays valid on the others: use a shared (database) store when
+    running more than one worker.
+    """
+
+    def __init__(self):
+        self.store = None
+        self.revoked = metrics.counter(
+            "jwt_revoked_total", "Tokens revoked by type", ("type",)
+        )
+        self.rejected = metrics.counter(
+            "jwt_rejected_revoked_total", "Requests rejected with a revoked token"
+        )
+
+    def init_app(self, app, jwt, store=None):
+        self.store = store if store is not None else InMemoryBlocklistStore()
+        jwt.token_in_blocklist_loader(self.is_revoked)
+        metrics.register_collector(
+            "token_blocklist", "Revoked token blocklist statistics", self.stats
+        )
+        app.extensions["token_blocklist"] = self
+
+    def is_revoked(self, jwt_header, jwt_payload):
+        revoked = self.store.contains(jwt_payload["jti"])
+        if revoked:
+            self.rejected.inc()
+        return revoked
+
+    def revoke(self, jwt_payload):
+        """Revokes the token with the given decoded payload."""
+        token_type = jwt_payload.get("type", "access")
+        self.store.add(
+            jwt_payload["jti"],
+            jwt_payload["exp"],
+            jwt_payload.get("sub"),
+            token_type
+        )
+        self.revoked.inc(token_type)
+
+    def stats(self):
+        return {"size": self.store.size()}
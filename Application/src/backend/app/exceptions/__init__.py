@@ -1,2 +1,4 @@
 from .user_exceptions import UserAlreadyExistsError, UserNotFoundError
-from .auth_exceptions import InvalidCredentialsError, TokenExpiredError
\ No newline at end of file
+from .auth_exceptions import InvalidCredentialsError, TokenExpiredError, HashingPoolSaturatedError
+from .session_exceptions import SessionNotFoundError, SessionClosedError
+from .session_exceptions import InvalidChunkError, ChunkOffsetMismatchError
\ No newline at end of file
@@ -4,4 +4,8 @@ class InvalidCredentialsError(Exception):
 
 class TokenExpiredError(Exception):
     """Eccezione sollevata quando il token di accesso è scaduto."""
-    pass
\ No newline at end of file
+    pass
+
+class HashingPoolSaturatedError(Exception):
+    """Eccezione sollevata quando il pool di hashing delle password è saturo."""
+    pass
@@ -0,0 +1,18 @@
+
+class SessionNotFoundError(Exception):
+    """Eccezione sollevata quando la sessione non viene trovata nel sistema."""
+    pass
+
+class SessionClosedError(Exception):
+    """Eccezione sollevata quando si caricano dati in una sessione già completata."""
+    pass
+
+class InvalidChunkError(Exception):
+    """Eccezione sollevata quando un chunk non contiene frame completi."""
+    pass
+
+class ChunkOffsetMismatchError(Exception):
+    """Eccezione sollevata quando l'offset del chunk non corrisponde ai dati già ricevuti."""
+    def __init__(self, expected_offset):
+        super().__init__(f"Expected chunk offset {expected_offset}.")
+        self.expected_offset = expected_offset
@@ -0,0 +1,90 @@
+"""Baseline: the tables as db.create_all() created them before migrations.
+
+Tables that already exist (from db/init.sql or an earlier create_all) are
+left untouched, so this applies cleanly to existing databases.
+"""
+import sqlalchemy as sa
+
+
+def upgrade(connection):
+    metadata = sa.MetaData()
+
+    sa.Table(
+        "users", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("surname", sa.String(100), nullable=False),
+        sa.Column("dateOfBirth", sa.Date, nullable=False),
+        sa.Column("gender", sa.String(10), nullable=False),
+        sa.Column("email", sa.String(100), unique=True, nullable=False),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column(
+            "user_type", sa.Enum("admin", "user", name="user_type"),
+            nullable=False, default="user"
+        ),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.current_timestamp()),
+    )
+
+    sa.Table(
+        "sessions", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column(
+            "user_id", sa.Integer,
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False, index=True
+        ),
+        sa.Column("food", sa.String(100), nullable=True),
+        sa.Column("rating", sa.SmallInteger, nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("recording", "uploaded", "processing", "processed", "failed",
+                    name="session_status"),
+            nullable=False, default="recording"
+        ),
+        sa.Column("eeg_channels", sa.SmallInteger, nullable=False, default=6),
+        sa.Column("eeg_sampling_rate", sa.Float, nullable=False),
+        sa.Column("hr_sampling_rate", sa.Float, nullable=False),
+        sa.Column("eda_sampling_rate", sa.Float, nullable=False),
+        sa.Column("eeg_bytes", sa.BigInteger, nullable=False, default=0),
+        sa.Column("hr_bytes", sa.BigInteger, nullable=False, default=0),
+        sa.Column("eda_bytes", sa.BigInteger, nullable=False, default=0),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.current_timestamp()),
+    )
+
+    sa.Table(
+        "jobs", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("kind", sa.String(50), nullable=False),
+        sa.Column("payload", sa.JSON, nullable=False),
+        sa.Column(
+            "user_id", sa.Integer,
+            sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+        ),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "running", "succeeded", "failed", name="job_status"),
+            nullable=False, default="queued"
+        ),
+        sa.Column("attempts", sa.Integer, nullable=False, default=0),
+        sa.Column("max_attempts", sa.Integer, nullable=False, default=3),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("worker", sa.String(100), nullable=True),
+        sa.Column("run_after", sa.DateTime, nullable=False),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.current_timestamp()),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+        sa.Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    sa.Table(
+        "revoked_tokens", metadata,
+        sa.Column("jti", sa.String(36), primary_key=True),
+        sa.Column("user_id", sa.Integer, nullable=True),
+        sa.Column("token_type", sa.String(10), nullable=True),
+        sa.Column("expires_at", sa.DateTime, nullable=False, index=True),
+        sa.Column("revoked_at", sa.DateTime, server_default=sa.func.current_timestamp()),
+    )
+
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,18 @@
+"""users.gender as ENUM('Male', 'Female'), as in db/init.sql and the
+registration schema; databases created by db.create_all() had a VARCHAR.
+"""
+import sqlalchemy as sa
+
+
+def upgrade(connection):
+    connection.execute(sa.text(
+        "UPDATE users SET gender = 'Male' WHERE LOWER(gender) = 'male'"
+    ))
+    connection.execute(sa.text(
+        "UPDATE users SET gender = 'Female' WHERE LOWER(gender) = 'female'"
+    ))
+    # SQLite has no ENUM type, the column stays as it is there
+    if connection.dialect.name == "mysql":
+        connection.execute(sa.text(
+            "ALTER TABLE users MODIFY gender ENUM('Male', 'Female') NOT NULL"
+        ))
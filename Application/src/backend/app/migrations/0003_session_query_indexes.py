@@ -0,0 +1,28 @@
+"""Composite indexes for the session (rating) lookups.
+
+- (user_id, completed_at): a user's sessions by date, also the index of
+  the user_id foreign key, so it replaces ix_sessions_user_id;
+- (food, rating): ratings of a food.
+"""
+import sqlalchemy as sa
+
+
+def _indexes(connection, table):
+    return {index["name"] for index in sa.inspect(connection).get_indexes(table)}
+
+
+def upgrade(connection):
+    existing = _indexes(connection, "sessions")
+    metadata = sa.MetaData()
+    sessions = sa.Table("sessions", metadata, autoload_with=connection)
+
+    for name, columns in (
+        ("ix_sessions_user_id_completed_at", ("user_id", "completed_at")),
+        ("ix_sessions_food_rating", ("food", "rating")),
+    ):
+        if name not in existing:
+            sa.Index(name, *(sessions.c[column] for column in columns)).create(connection)
+
+    # Dropped after its replacement exists: MySQL needs an index on the FK
+    if "ix_sessions_user_id" in existing:
+        sa.Index("ix_sessions_user_id", sessions.c.user_id).drop(connection)
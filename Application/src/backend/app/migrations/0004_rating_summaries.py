@@ -0,0 +1,79 @@
+"""rating_summaries: per-user, per-food and overall rating counters,
+updated with each rated session, with all-time ('total') and daily rows.
+
+The counters are backfilled once from the sessions already rated.
+"""
+from collections import defaultdict
+from datetime import date
+import sqlalchemy as sa
+
+ALL_TIME = date(1970, 1, 1)
+
+
+def upgrade(connection):
+    metadata = sa.MetaData()
+    summaries = sa.Table(
+        "rating_summaries", metadata,
+        sa.Column(
+            "scope", sa.Enum("user", "food", "all", name="rating_scope"),
+            primary_key=True
+        ),
+        sa.Column("subject", sa.String(100), primary_key=True),
+        sa.Column(
+            "period", sa.Enum("total", "day", name="rating_period"),
+            primary_key=True
+        ),
+        sa.Column("period_start", sa.Date, primary_key=True),
+        sa.Column("count", sa.Integer, nullable=False, default=0),
+        sa.Column("rating_sum", sa.Integer, nullable=False, default=0),
+        *(
+            sa.Column(f"rating_{value}", sa.Integer, nullable=False, default=0)
+            for value in range(1, 6)
+        ),
+        sa.Column("first_rated_at", sa.DateTime, nullable=True),
+        sa.Column("last_rated_at", sa.DateTime, nullable=True),
+    )
+    summaries.create(connection, checkfirst=True)
+
+    sessions = sa.Table("sessions", metadata, autoload_with=connection)
+    rated = connection.execute(
+        sa.select(
+            sessions.c.user_id, sessions.c.food, sessions.c.rating,
+            sessions.c.completed_at
+        ).where(
+            sessions.c.rating.is_not(None), sessions.c.completed_at.is_not(None)
+        )
+    )
+    rows = defaultdict(lambda: {
+        "count": 0, "rating_sum": 0,
+        **{f"rating_{value}": 0 for value in range(1, 6)},
+        "first_rated_at": None, "last_rated_at": None,
+    })
+    for user_id, food, rating, completed_at in rated:
+        keys = [("user", str(user_id)), ("all", "")]
+        if food:
+            keys.append(("food", food))
+        for scope, subject in keys:
+            for period, period_start in (
+                ("total", ALL_TIME), ("day", completed_at.date())
+            ):
+                row = rows[scope, subject, period, period_start]
+                row["count"] += 1
+                row["rating_sum"] += rating
+                row[f"rating_{rating}"] += 1
+                if row["first_rated_at"] is None or completed_at < row["first_rated_at"]:
+                    row["first_rated_at"] = completed_at
+                if row["last_rated_at"] is None or completed_at > row["last_rated_at"]:
+                    row["last_rated_at"] = completed_at
+
+    # Recomputed from scratch, also over counters a create_all() table
+    # may have collected before this migration ran
+    connection.execute(summaries.delete())
+    if rows:
+        connection.execute(summaries.insert(), [
+            {
+                "scope": scope, "subject": subject,
+                "period": period, "period_start": period_start, **counters
+            }
+            for (scope, subject, period, period_start), counters in rows.items()
+        ])
@@ -0,0 +1,23 @@
+"""users.version and users.updated_at, the validators of the conditional
+GETs of the user resources (ETag and Last-Modified).
+
+Existing users start at version 1, last modified when they were created.
+"""
+import sqlalchemy as sa
+
+
+def upgrade(connection):
+    columns = {
+        column["name"] for column in sa.inspect(connection).get_columns("users")
+    }
+    if "version" not in columns:
+        connection.execute(sa.text(
+            "ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+        ))
+    if "updated_at" not in columns:
+        connection.execute(sa.text(
+            "ALTER TABLE users ADD COLUMN updated_at DATETIME NULL"
+        ))
+    connection.execute(sa.text(
+        "UPDATE users SET updated_at = created_at WHERE updated_at IS NULL"
+    ))
@@ -1 +1,5 @@
-from .user_model import User
\ No newline at end of file
+from .user_model import User
+from .session_model import TastingSession
+from .job_model import Job
+from .revoked_token_model import RevokedToken
+from .rating_summary_model import RatingSummary
\ No newline at end of file
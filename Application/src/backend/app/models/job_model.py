@@ -0,0 +1,31 @@
+# app/models/job_model.py
+from core import db
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        # Claim query: next queued job whose retry delay has passed
+        db.Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    # User the job was created for, if any (used for access checks)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'),
+        nullable=True)
+    status = db.Column(
+        db.Enum('queued', 'running', 'succeeded', 'failed', name='job_status'),
+        nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    last_error = db.Column(db.Text, nullable=True)
+    worker = db.Column(db.String(100), nullable=True)
+    run_after = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.kind} {self.status}>'
@@ -0,0 +1,43 @@
+# app/models/rating_summary_model.py
+from datetime import date
+from core import db
+
+class RatingSummary(db.Model):
+    """Running rating counters, updated as each session is rated.
+
+    One row per scope ('user', 'food' or 'all'), subject (the user id, the
+    food name, '' for 'all') and period: 'total' (all time) or 'day' (one
+    row per UTC day, for trends).
+    """
+    __tablename__ = 'rating_summaries'
+
+    # period_start of the 'total' rows
+    ALL_TIME = date(1970, 1, 1)
+    RATINGS = (1, 2, 3, 4, 5)
+
+    scope = db.Column(
+        db.Enum('user', 'food', 'all', name='rating_scope'), primary_key=True)
+    subject = db.Column(db.String(100), primary_key=True)
+    period = db.Column(
+        db.Enum('total', 'day', name='rating_period'), primary_key=True)
+    period_start = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
+    first_rated_at = db.Column(db.DateTime, nullable=True)
+    last_rated_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def mean(self):
+        return self.rating_sum / self.count if self.count else None
+
+    @property
+    def distribution(self):
+        return {value: getattr(self, f'rating_{value}') for value in self.RATINGS}
+
+    def __repr__(self):
+        return f'<RatingSummary {self.scope}:{self.subject} {self.period} {self.period_start}>'
@@ -0,0 +1,15 @@
+# app/models/revoked_token_model.py
+from core import db
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+
+    # JTIs are UUID4 strings; the primary key makes each check a point lookup
+    jti = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    token_type = db.Column(db.String(10), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti}>"
@@ -0,0 +1,45 @@
+# app/models/session_model.py
+from core import db
+
+class TastingSession(db.Model):
+    __tablename__ = 'sessions'
+    __table_args__ = (
+        # A user's sessions by date; also serves the user_id foreign key
+        db.Index('ix_sessions_user_id_completed_at', 'user_id', 'completed_at'),
+        # Ratings of a food
+        db.Index('ix_sessions_food_rating', 'food', 'rating'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'),
+        nullable=False)
+    food = db.Column(db.String(100), nullable=True)
+    # 1-5 appreciation given by the subject at the end of the tasting
+    rating = db.Column(db.SmallInteger, nullable=True)
+    status = db.Column(
+        db.Enum('recording', 'uploaded', 'processing', 'processed', 'failed',
+                name='session_status'),
+        nullable=False, default='recording')
+    eeg_channels = db.Column(db.SmallInteger, nullable=False, default=6)
+    eeg_sampling_rate = db.Column(db.Float, nullable=False)
+    hr_sampling_rate = db.Column(db.Float, nullable=False)
+    eda_sampling_rate = db.Column(db.Float, nullable=False)
+    # Bytes received per stream (little-endian float32 frames)
+    eeg_bytes = db.Column(db.BigInteger, nullable=False, default=0)
+    hr_bytes = db.Column(db.BigInteger, nullable=False, default=0)
+    eda_bytes = db.Column(db.BigInteger, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    STREAMS = ('eeg', 'hr', 'eda')
+
+    def channels(self, stream):
+        return self.eeg_channels if stream == 'eeg' else 1
+
+    def frame_size(self, stream):
+        return 4 * self.channels(stream)
+
+    def __repr__(self):
+        return f'<TastingSession {self.id} user={self.user_id}>'
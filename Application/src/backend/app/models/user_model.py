@@ -1,4 +1,5 @@
 # app/models/user_model.py
+from datetime import datetime
 from core import db
 from enum import Enum
 
@@ -9,13 +10,20 @@ class User(db.Model):
     name = db.Column(db.String(100), nullable=False)
     surname = db.Column(db.String(100), nullable=False)
     dateOfBirth = db.Column(db.Date, nullable=False)
-    gender = db.Column(db.String(10), nullable=False)
+    gender = db.Column(
+        db.Enum('Male', 'Female', name='gender'),
+        nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
     user_type = db.Column(
         db.Enum('admin','user', name='user_type'), 
         nullable=False, default='user')
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    
+    # Validators of the user resources (ETag and Last-Modified). Writes
+    # that change a serialized field must bump version and set updated_at
+    # themselves; the others (e.g. the password rehash) leave them alone.
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+
     def __repr__(self):
         return f'<User {self.email}>'
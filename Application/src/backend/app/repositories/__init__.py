@@ -1 +1,6 @@
-from .user_repository import UserRepository
\ No newline at end of file
+from .user_repository import UserRepository
+from .session_repository import SessionRepository
+from .session_file_store import SessionFileStore
+from .job_repository import JobRepository
+from .revoked_token_repository import RevokedTokenRepository
+from .rating_summary_repository import RatingSummaryRepository
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, update
+from models import Job
+from core import db, metrics
+
+class JobRepository:
+    @metrics.timed_query("jobs.create")
+    def create(self, kind, payload, max_attempts=3, user_id=None):
+        job = Job(
+            kind=kind,
+            payload=payload,
+            user_id=user_id,
+            max_attempts=max_attempts,
+            run_after=datetime.utcnow()
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    @metrics.timed_query("jobs.get_by_id")
+    def get_by_id(self, job_id):
+        return db.session.get(Job, job_id)
+
+    @metrics.timed_query("jobs.claim_next")
+    def claim_next(self, worker):
+        # Candidate lookup plus a conditional UPDATE: if another worker (in
+        # any process) claimed the job first, rowcount is 0 and we move on.
+        now = datetime.utcnow()
+        # Ordered along ix_jobs_status_run_after, oldest due job first
+        candidates = db.session.query(Job.id).filter(
+            Job.status == 'queued', Job.run_after <= now
+        ).order_by(Job.run_after, Job.id).limit(5).all()
+        for (job_id,) in candidates:
+            claimed = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == 'queued')
+                .values(
+                    status='running',
+                    worker=worker,
+                    attempts=Job.attempts + 1,
+                    started_at=now
+                )
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(Job, job_id, populate_existing=True)
+        db.session.rollback()
+        return None
+
+    @metrics.timed_query("jobs.mark_succeeded")
+    def mark_succeeded(self, job):
+        job.status = 'succeeded'
+        job.last_error = None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    @metrics.timed_query("jobs.mark_failed")
+    def mark_failed(self, job, error, retry_delay=None):
+        job.last_error = error
+        if retry_delay is None:
+            job.status = 'failed'
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = 'queued'
+            job.run_after = datetime.utcnow() + timedelta(seconds=retry_delay)
+        db.session.commit()
+
+    @metrics.timed_query("jobs.requeue_stale")
+    def requeue_stale(self, older_than):
+        # Jobs left running by a worker that died
+        cutoff = datetime.utcnow() - timedelta(seconds=older_than)
+        requeued = db.session.execute(
+            update(Job)
+            .where(
+                Job.status == 'running', Job.started_at < cutoff,
+                Job.attempts < Job.max_attempts
+            )
+            .values(status='queued', run_after=datetime.utcnow())
+        ).rowcount
+        db.session.execute(
+            update(Job)
+            .where(Job.status == 'running', Job.started_at < cutoff)
+            .values(
+                status='failed',
+                last_error='Worker stopped while running the job',
+                finished_at=datetime.utcnow()
+            )
+        )
+        db.session.commit()
+        return requeued
+
+    @metrics.timed_query("jobs.count_by_status")
+    def count_by_status(self):
+        rows = db.session.query(Job.status, func.count(Job.id)).group_by(Job.status).all()
+        return {status: count for status, count in rows}
@@ -0,0 +1,105 @@
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import mysql, sqlite
+from models import RatingSummary, TastingSession
+from core import db, metrics
+
+class RatingSummaryRepository:
+    def record(self, user_id, food, rating, rated_at):
+        """Adds one rating to every summary it belongs to.
+
+        Only stages the upserts: the caller commits them in the same
+        transaction as the rating itself, so the summaries never drift.
+        """
+        day = rated_at.date()
+        keys = [('user', str(user_id)), ('all', '')]
+        if food:
+            keys.append(('food', food))
+        rows = [
+            {
+                "scope": scope,
+                "subject": subject,
+                "period": period,
+                "period_start": period_start,
+                "count": 1,
+                "rating_sum": rating,
+                **{f"rating_{value}": int(value == rating) for value in RatingSummary.RATINGS},
+                "first_rated_at": rated_at,
+                "last_rated_at": rated_at,
+            }
+            for scope, subject in keys
+            for period, period_start in (('total', RatingSummary.ALL_TIME), ('day', day))
+        ]
+        # Sorted primary keys: concurrent upserts lock rows in the same order
+        rows.sort(key=lambda row: (row["scope"], row["subject"], row["period"], row["period_start"]))
+        for row in rows:
+            db.session.execute(self._upsert(row, rating))
+
+    def _upsert(self, row, rating):
+        # A single INSERT ... ON DUPLICATE KEY / ON CONFLICT UPDATE per row:
+        # the increments are atomic without reading the row first
+        increments = {
+            "count": RatingSummary.count + 1,
+            "rating_sum": RatingSummary.rating_sum + rating,
+            f"rating_{rating}": getattr(RatingSummary, f"rating_{rating}") + 1,
+        }
+        if db.session.get_bind().dialect.name == "mysql":
+            # Concurrent ratings may commit out of order
+            increments["last_rated_at"] = func.greatest(
+                RatingSummary.last_rated_at, row["last_rated_at"]
+            )
+            return mysql.insert(RatingSummary).values(**row).on_duplicate_key_update(
+                **increments
+            )
+        increments["last_rated_at"] = func.max(
+            RatingSummary.last_rated_at, row["last_rated_at"]
+        )
+        return sqlite.insert(RatingSummary).values(**row).on_conflict_do_update(
+            index_elements=["scope", "subject", "period", "period_start"],
+            set_=increments
+        )
+
+    @metrics.timed_query("rating_summaries.get_total")
+    def get_total(self, scope, subject):
+        return db.session.get(
+            RatingSummary, (scope, subject, 'total', RatingSummary.ALL_TIME)
+        )
+
+    @metrics.timed_query("rating_summaries.get_totals")
+    def get_totals(self, scope):
+        return db.session.execute(
+            select(RatingSummary).where(
+                RatingSummary.scope == scope, RatingSummary.period == 'total'
+            ).order_by(RatingSummary.subject)
+        ).scalars().all()
+
+    @metrics.timed_query("rating_summaries.get_days")
+    def get_days(self, scope, subject, since):
+        return db.session.execute(
+            select(RatingSummary).where(
+                RatingSummary.scope == scope,
+                RatingSummary.subject == subject,
+                RatingSummary.period == 'day',
+                RatingSummary.period_start >= since
+            ).order_by(RatingSummary.period_start)
+        ).scalars().all()
+
+    @metrics.timed_query("rating_summaries.get_history")
+    def get_history(self, user_id, before=None, limit=50):
+        """Rated sessions of a user, newest first; ``before`` is the
+        (completed_at, id) of the last session of the previous page."""
+        query = select(
+            TastingSession.id, TastingSession.food, TastingSession.rating,
+            TastingSession.started_at, TastingSession.completed_at
+        ).where(
+            TastingSession.user_id == user_id,
+            TastingSession.rating.is_not(None)
+        )
+        if before is not None:
+            query = query.where(
+                tuple_(TastingSession.completed_at, TastingSession.id) < before
+            )
+        # Walks ix_sessions_user_id_completed_at backwards
+        return db.session.execute(
+            query.order_by(TastingSession.completed_at.desc(), TastingSession.id.desc())
+            .limit(limit)
+        ).all()
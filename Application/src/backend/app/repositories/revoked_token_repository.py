@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from models import RevokedToken
+from core import db, metrics
+from core.token_blocklist import BlocklistStore
+
+class RevokedTokenRepository(BlocklistStore):
+    """Blocklist store shared by every server process through the database."""
+
+    @metrics.timed_query("revoked_tokens.add")
+    def add(self, jti, expires_at, user_id=None, token_type=None):
+        # Expired rows are never needed again; they are cleared on each revoke
+        db.session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+        )
+        db.session.add(RevokedToken(
+            jti=jti,
+            user_id=int(user_id) if user_id is not None else None,
+            token_type=token_type,
+            expires_at=datetime.utcfromtimestamp(expires_at)
+        ))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Already revoked
+            db.session.rollback()
+
+    @metrics.timed_query("revoked_tokens.contains")
+    def contains(self, jti):
+        return db.session.execute(
+            select(RevokedToken.jti).where(
+                RevokedToken.jti == jti,
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+        ).first() is not None
+
+    @metrics.timed_query("revoked_tokens.size")
+    def size(self):
+        return db.session.execute(
+            select(db.func.count()).select_from(RevokedToken).where(
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+        ).scalar()
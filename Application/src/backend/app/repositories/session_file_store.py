@@ -0,0 +1,76 @@
+import os
+import threading
+from exceptions import ChunkOffsetMismatchError, InvalidChunkError
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+COPY_BUFFER_SIZE = 64 * 1024
+# Appends to one stream are serialised by one of a fixed set of locks, so
+# the store does not keep a lock for every stream it has ever seen
+LOCK_STRIPES = 64
+
+
+class SessionFileStore:
+    """Raw session streams on disk, one append-only file per stream.
+
+    Files hold the frames exactly as uploaded (little-endian float32, one
+    value per channel per frame), so they can be memory-mapped directly
+    with numpy.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def path(self, session_id, stream):
+        return os.path.join(self.base_dir, str(session_id), f"{stream}.f32")
+
+    def size(self, session_id, stream):
+        try:
+            return os.path.getsize(self.path(session_id, stream))
+        except FileNotFoundError:
+            return 0
+
+    def _lock(self, path):
+        return self._locks[hash(path) % LOCK_STRIPES]
+
+    def append(self, session_id, stream, source, length, frame_size, offset=None):
+        """Copies ``length`` bytes from the ``source`` stream to the end of
+        the stream file and returns the new file size.
+
+        When ``offset`` is given it must match the bytes already stored, so a
+        client can safely retry or resume an interrupted upload.
+        """
+        if length <= 0 or length % frame_size:
+            raise InvalidChunkError(
+                f"Chunk must contain whole frames of {frame_size} bytes."
+            )
+        path = self.path(session_id, stream)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock(path), open(path, "ab") as target:
+            if fcntl is not None:
+                # Serialises appends coming from different server processes
+                fcntl.flock(target, fcntl.LOCK_EX)
+            try:
+                current = os.fstat(target.fileno()).st_size
+                if offset is not None and offset != current:
+                    raise ChunkOffsetMismatchError(current)
+                remaining = length
+                while remaining:
+                    block = source.read(min(COPY_BUFFER_SIZE, remaining))
+                    if not block:
+                        break
+                    target.write(block)
+                    remaining -= len(block)
+                target.flush()
+                if remaining:
+                    # Client went away mid-chunk: drop the partial frames
+                    target.truncate(current)
+                    raise InvalidChunkError("Chunk body shorter than Content-Length.")
+                return current + length
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(target, fcntl.LOCK_UN)
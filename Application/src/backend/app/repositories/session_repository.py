@@ -0,0 +1,74 @@
+from datetime import datetime
+from models import TastingSession
+from core import db, metrics
+from .rating_summary_repository import RatingSummaryRepository
+
+class SessionRepository:
+    def __init__(self):
+        self.rating_summaries = RatingSummaryRepository()
+
+    @metrics.timed_query("sessions.create")
+    def create(
+        self, user_id, eeg_sampling_rate, hr_sampling_rate,
+        eda_sampling_rate, eeg_channels=6, food=None, started_at=None
+        ):
+        session = TastingSession(
+            user_id=user_id,
+            food=food,
+            eeg_channels=eeg_channels,
+            eeg_sampling_rate=eeg_sampling_rate,
+            hr_sampling_rate=hr_sampling_rate,
+            eda_sampling_rate=eda_sampling_rate,
+            started_at=started_at
+        )
+        db.session.add(session)
+        db.session.commit()
+        return session
+
+    @metrics.timed_query("sessions.get_by_id")
+    def get_by_id(self, session_id):
+        return db.session.get(TastingSession, session_id)
+
+    @metrics.timed_query("sessions.add_stream_bytes")
+    def add_stream_bytes(self, session_id, stream, received):
+        # Single atomic UPDATE, safe with concurrent chunk uploads
+        column = getattr(TastingSession, f"{stream}_bytes")
+        db.session.query(TastingSession).filter(
+            TastingSession.id == session_id
+        ).update({column: column + received}, synchronize_session=False)
+        db.session.commit()
+
+    @metrics.timed_query("sessions.complete")
+    def complete(self, session, rating, food=None):
+        """Returns the completed session, or None when it was no longer
+        recording (e.g. completed by a concurrent request)."""
+        values = {
+            TastingSession.rating: rating,
+            TastingSession.status: 'uploaded',
+            TastingSession.completed_at: datetime.utcnow(),
+        }
+        if food is not None:
+            values[TastingSession.food] = food
+        # The conditional UPDATE claims the transition: of two concurrent
+        # completions, only one matches the row
+        claimed = db.session.query(TastingSession).filter(
+            TastingSession.id == session.id,
+            TastingSession.status == 'recording'
+        ).update(values, synchronize_session=False)
+        if claimed != 1:
+            db.session.rollback()
+            return None
+        # Same transaction: the summaries count each rating exactly once
+        self.rating_summaries.record(
+            session.user_id, food if food is not None else session.food,
+            rating, values[TastingSession.completed_at]
+        )
+        db.session.commit()
+        db.session.refresh(session)
+        return session
+
+    @metrics.timed_query("sessions.set_status")
+    def set_status(self, session, status):
+        session.status = status
+        db.session.commit()
+        return session
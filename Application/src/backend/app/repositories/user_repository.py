@@ -1,7 +1,17 @@
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from models import User
-from core import db
+from core import db, user_profile_cache, metrics
+from exceptions import UserAlreadyExistsError
 
 class UserRepository:
+    # Only the columns the listing serializes (and its ETag) are loaded
+    LISTING_COLUMNS = (
+        User.id, User.name, User.surname,
+        User.user_type, User.dateOfBirth, User.email, User.version
+    )
+
+    @metrics.timed_query("users.create")
     def create(
         self, name, surname, dateOfBirth,
         gender, email, password, user_type='user'
@@ -16,14 +26,91 @@ class UserRepository:
             user_type=user_type
         )
         db.session.add(new_user)
-        db.session.commit()
+        # The UNIQUE index on users.email is the only duplicate check, so
+        # concurrent signups for the same email cannot both succeed.
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise UserAlreadyExistsError("User with email already exists.")
+        user_profile_cache.invalidate(new_user.id)
         return new_user
 
+    @metrics.timed_query("users.bulk_create")
+    def bulk_create(self, rows, batch_size=500):
+        # Each batch is a single executemany INSERT in its own transaction.
+        # A batch that hits a constraint is retried row by row so only the
+        # offending rows are rejected. Returns the emails that failed.
+        failed = []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                db.session.execute(insert(User), batch)
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                for row in batch:
+                    try:
+                        db.session.execute(insert(User), [row])
+                        db.session.commit()
+                    except IntegrityError:
+                        db.session.rollback()
+                        failed.append(row["email"])
+        return failed
+
+    @metrics.timed_query("users.get_existing_emails")
+    def get_existing_emails(self, emails):
+        if not emails:
+            return set()
+        rows = db.session.query(User.email).filter(User.email.in_(emails)).all()
+        return {row.email for row in rows}
+
+    @metrics.timed_query("users.get_ids_by_emails")
+    def get_ids_by_emails(self, emails):
+        if not emails:
+            return {}
+        rows = db.session.query(User.id, User.email).filter(
+            User.email.in_(emails)
+        ).all()
+        return {row.email: row.id for row in rows}
+
+    @metrics.timed_query("users.update_password")
+    def update_password(self, user, password):
+        # The password is not part of the user resources: version and
+        # updated_at (their validators) are left as they are
+        user.password = password
+        db.session.commit()
+        user_profile_cache.invalidate(user.id)
+        return user
+
+    @metrics.timed_query("users.get_by_id")
     def get_by_id(self, user_id):
         return User.query.get(user_id)
 
+    @metrics.timed_query("users.get_by_email")
     def get_by_email(self, email):
         return User.query.filter_by(email=email).first()
 
+    @metrics.timed_query("users.get_all_users")
     def get_all_users(self):
-        return User.query.filter(User.user_type != "admin").all()
\ No newline at end of file
+        return User.query.filter(User.user_type != "admin").all()
+
+    @metrics.timed_query("users.get_users_page")
+    def get_users_page(self, after_id=None, limit=100):
+        # Keyset pagination on the primary key: each page is an index range
+        # scan, whatever the page depth.
+        query = db.session.query(*self.LISTING_COLUMNS).filter(
+            User.user_type != "admin"
+        )
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+        return query.order_by(User.id).limit(limit).all()
+
+    def iter_users(self, after_id=None, batch_size=500):
+        # Walks the table page by page so only one batch is held in memory
+        while True:
+            page = self.get_users_page(after_id, batch_size)
+            if not page:
+                return
+            yield from page
+            after_id = page[-1].id
\ No newline at end of file
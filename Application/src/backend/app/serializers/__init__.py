@@ -0,0 +1,3 @@
+from .model_serializer import ModelSerializer
+from .user_serializer import user_serializer, user_profile_serializer
+from .rating_serializer import rating_history_serializer
\ No newline at end of file
@@ -0,0 +1,72 @@
+from operator import attrgetter, itemgetter
+
+
+class ModelSerializer:
+    """Turns model instances (or result rows) into dicts of a fixed set of
+    fields.
+
+    The field list is resolved once into a single ``attrgetter``, so each
+    dump is one C-level attribute fetch and a ``dict(zip(...))``; result
+    rows (e.g. from UserRepository.LISTING_COLUMNS) are read by position,
+    which is much cheaper than their named attributes. Values are left as
+    they are (e.g. dates): encoding them is the JSON provider's job.
+    """
+
+    def __init__(self, fields):
+        # {output name: attribute name}, or a sequence of names used for both
+        if not isinstance(fields, dict):
+            fields = {name: name for name in fields}
+        self.fields = dict(fields)
+        self.names = tuple(self.fields)
+        self._attr_values = self._tuple_getter(attrgetter, self.fields.values())
+        # Row field layout -> positional getter
+        self._row_values = {}
+        # Field names -> projection, see only()
+        self._projections = {}
+
+    def _tuple_getter(self, getter_factory, keys):
+        getter = getter_factory(*keys)
+        if len(self.fields) == 1:
+            # The operator getters return a bare value, not a tuple, for one key
+            return lambda obj: (getter(obj),)
+        return getter
+
+    def _values_getter(self, obj):
+        row_fields = getattr(obj, "_fields", None)
+        if row_fields is None:
+            return self._attr_values
+        getter = self._row_values.get(row_fields)
+        if getter is None:
+            if not set(self.fields.values()) <= set(row_fields):
+                return self._attr_values
+            getter = self._row_values[row_fields] = self._tuple_getter(
+                itemgetter, [row_fields.index(attr) for attr in self.fields.values()]
+            )
+        return getter
+
+    def dump(self, obj):
+        return dict(zip(self.names, self._values_getter(obj)(obj)))
+
+    def dump_many(self, objs):
+        objs = list(objs)
+        if not objs:
+            return []
+        names = self.names
+        values = self._values_getter(objs[0])
+        return [dict(zip(names, values(obj))) for obj in objs]
+
+    def only(self, names):
+        """Serializer restricted to ``names`` (in the order of this one's
+        fields); unknown names raise KeyError."""
+        names = frozenset(names)
+        projection = self._projections.get(names)
+        if projection is None:
+            unknown = names - self.fields.keys()
+            if unknown:
+                raise KeyError(", ".join(sorted(unknown)))
+            # Only valid subsets are cached, so the cache stays bounded by
+            # the number of field combinations
+            projection = self._projections[names] = ModelSerializer(
+                {name: attr for name, attr in self.fields.items() if name in names}
+            )
+        return projection
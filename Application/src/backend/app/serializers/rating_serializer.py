@@ -0,0 +1,7 @@
+from .model_serializer import ModelSerializer
+
+# A rated session, as listed in the rating history
+# (matches RatingSummaryRepository.get_history)
+rating_history_serializer = ModelSerializer(
+    ("id", "food", "rating", "started_at", "completed_at")
+)
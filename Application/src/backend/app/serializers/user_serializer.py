@@ -0,0 +1,11 @@
+from .model_serializer import ModelSerializer
+
+# Admin listing and detail (matches UserRepository.LISTING_COLUMNS)
+user_serializer = ModelSerializer(
+    ("id", "name", "surname", "user_type", "dateOfBirth", "email")
+)
+
+# The user's own profile, as returned by login and /auth/me
+user_profile_serializer = ModelSerializer(
+    ("id", "name", "surname", "email", "user_type")
+)
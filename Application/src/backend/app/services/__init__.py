@@ -1,2 +1,5 @@
 from .user_service import UserService
-from .auth_service import AuthService
\ No newline at end of file
+from .auth_service import AuthService
+from .session_service import SessionService
+from .preprocessing_service import PreprocessingService
+from .rating_service import RatingService
@@ -1,6 +1,6 @@
 from repositories import UserRepository
-from werkzeug.security import check_password_hash
-from exceptions import UserNotFoundError
+from core import password_hasher
+from exceptions import UserNotFoundError, HashingPoolSaturatedError
 from models import User
 
 class AuthService:
@@ -14,6 +14,15 @@ class AuthService:
         if not user:
             raise UserNotFoundError(f"User with email {email} not found.")
         
-        if user and check_password_hash(user.password, password):
-            return user
-        return None
+        if not password_hasher.verify(user.password, password):
+            return None
+
+        # Transparently upgrade hashes created with older parameters
+        if password_hasher.needs_rehash(user.password):
+            try:
+                self.user_repository.update_password(
+                    user, password_hasher.hash(password)
+                )
+            except HashingPoolSaturatedError:
+                pass  # retried on the next successful login
+        return user
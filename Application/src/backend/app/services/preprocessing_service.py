@@ -0,0 +1,152 @@
+import os
+from fractions import Fraction
+import numpy as np
+from repositories import SessionRepository
+from exceptions import SessionNotFoundError
+from .session_service import SessionService
+
+# Same layout as ml-model.ipynb: 2 s epochs of raw EEG at 500 Hz for the
+# model (which filters internally) and HR/EDA interpolated to 125 Hz
+EPOCH_DURATION = 2
+EEG_CHANNELS = 6
+EEG_SAMPLING_FREQUENCY = 500
+FS_TARGET = 125
+EEG_SAMPLES_PER_EPOCH = EPOCH_DURATION * EEG_SAMPLING_FREQUENCY
+WEARABLE_SAMPLES_PER_EPOCH = EPOCH_DURATION * FS_TARGET
+
+EPOCHS_FILE = 'epochs.npz'
+
+
+class PreprocessingService:
+    def __init__(self):
+        self.session_repository = SessionRepository()
+        self.session_service = SessionService()
+        self._filters = None
+
+    @property
+    def filters(self):
+        # scipy takes about a second to import: it is loaded, and the
+        # filters designed, by the first job rather than at server startup
+        if self._filters is None:
+            from scipy import signal
+            self._filters = (
+                # 0.5-50 Hz band-pass and 49-51 Hz notch, as in the acquisition scripts
+                signal.butter(
+                    4, [0.5, 50.0], btype='bandpass', fs=EEG_SAMPLING_FREQUENCY, output='sos'
+                ),
+                signal.butter(
+                    2, [49.0, 51.0], btype='bandstop', fs=EEG_SAMPLING_FREQUENCY, output='sos'
+                ),
+            )
+        return self._filters
+
+    def epochs_path(self, session_id):
+        return os.path.join(
+            os.path.dirname(self.session_service.file_store.path(session_id, 'eeg')),
+            EPOCHS_FILE
+        )
+
+    def preprocess_session(self, session_id):
+        """Turns the raw streams of a session into model-ready epoch arrays.
+
+        Writes epochs.npz next to the raw files with eeg_input (n, 6, 1000, 1),
+        hr_input and eda_input (n, 1, 250, 1), eeg_filtered (n, 6, 250, 1):
+        band-passed, notched and decimated to 125 Hz, for training; and the
+        session rating repeated per epoch.
+        """
+        session = self.session_repository.get_by_id(session_id)
+        if not session:
+            raise SessionNotFoundError(f"Session {session_id} not found.")
+        self.session_repository.set_status(session, 'processing')
+        try:
+            eeg = self._load_stream(session, 'eeg')
+            if eeg.shape[0] < EEG_CHANNELS:
+                raise ValueError(f"Expected {EEG_CHANNELS} EEG channels")
+            eeg = self._resample(
+                eeg[:EEG_CHANNELS], session.eeg_sampling_rate, EEG_SAMPLING_FREQUENCY
+            )
+            n_epochs = eeg.shape[1] // EEG_SAMPLES_PER_EPOCH
+            if n_epochs == 0:
+                raise ValueError("Session shorter than one epoch")
+            duration = n_epochs * EPOCH_DURATION
+
+            eeg = eeg[:, :n_epochs * EEG_SAMPLES_PER_EPOCH]
+            eeg_input = self._epochs(eeg, EEG_SAMPLES_PER_EPOCH)
+            eeg_filtered = self._epochs(
+                self.filter_eeg(eeg), WEARABLE_SAMPLES_PER_EPOCH
+            )
+            hr_input = self._epochs(
+                self._interpolate(
+                    self._load_stream(session, 'hr'), session.hr_sampling_rate, duration
+                ),
+                WEARABLE_SAMPLES_PER_EPOCH
+            )
+            eda_input = self._epochs(
+                self._interpolate(
+                    self._load_stream(session, 'eda'), session.eda_sampling_rate, duration
+                ),
+                WEARABLE_SAMPLES_PER_EPOCH
+            )
+
+            path = self.epochs_path(session.id)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as epochs_file:
+                np.savez(
+                    epochs_file,
+                    eeg_input=eeg_input,
+                    hr_input=hr_input,
+                    eda_input=eda_input,
+                    eeg_filtered=eeg_filtered,
+                    rating=np.full(n_epochs, session.rating or 0, dtype=np.int8)
+                )
+            # Readers never see a half-written file
+            os.replace(tmp_path, path)
+        except Exception:
+            self.session_repository.set_status(session, 'failed')
+            raise
+        self.session_repository.set_status(session, 'processed')
+        return path
+
+    def filter_eeg(self, eeg):
+        from scipy import signal
+        bandpass, notch = self.filters
+        filtered = signal.sosfiltfilt(bandpass, eeg, axis=1)
+        filtered = signal.sosfiltfilt(notch, filtered, axis=1)
+        # resample_poly applies its own anti-aliasing FIR before decimating
+        return signal.resample_poly(
+            filtered, FS_TARGET, EEG_SAMPLING_FREQUENCY, axis=1
+        )
+
+    def _load_stream(self, session, stream):
+        path = self.session_service.file_store.path(session.id, stream)
+        channels = session.channels(stream)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            raise ValueError(f"No {stream} data uploaded")
+        # Memory-mapped: the raw file is never copied whole into memory
+        frames = np.memmap(path, dtype='<f4', mode='r')
+        frames = frames[:len(frames) - len(frames) % channels]
+        return frames.reshape(-1, channels).T
+
+    def _resample(self, data, fs_in, fs_out):
+        from scipy import signal
+        if fs_in == fs_out:
+            return np.asarray(data, dtype=np.float64)
+        ratio = Fraction(fs_out / fs_in).limit_denominator(1000)
+        return signal.resample_poly(
+            data, ratio.numerator, ratio.denominator, axis=1
+        )
+
+    def _interpolate(self, data, fs_in, duration):
+        # HR and EDA are slow signals: linear interpolation onto the 125 Hz
+        # grid, as the mobile app does before inference
+        t_in = np.arange(data.shape[1]) / fs_in
+        t_out = np.arange(int(duration * FS_TARGET)) / FS_TARGET
+        return np.interp(t_out, t_in, data[0])[np.newaxis, :]
+
+    def _epochs(self, data, samples_per_epoch):
+        channels, samples = data.shape
+        n_epochs = samples // samples_per_epoch
+        epochs = data[:, :n_epochs * samples_per_epoch].reshape(
+            channels, n_epochs, samples_per_epoch
+        )
+        return epochs.transpose(1, 0, 2)[..., np.newaxis].astype(np.float32)
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from repositories import RatingSummaryRepository, SessionRepository
+from models import RatingSummary
+
+class RatingService:
+    BUCKETS = ('day', 'week', 'month')
+
+    def __init__(self):
+        self.rating_summary_repository = RatingSummaryRepository()
+        self.session_repository = SessionRepository()
+
+    def get_history(self, user_id, cursor=None, limit=50):
+        """A page of the user's rated sessions, newest first.
+
+        ``cursor`` is the id of the last session of the previous page;
+        ValueError if it is not one of the user's rated sessions.
+        """
+        before = None
+        if cursor is not None:
+            session = self.session_repository.get_by_id(cursor)
+            if (not session or session.user_id != int(user_id)
+                    or session.rating is None):
+                raise ValueError(f"Invalid cursor {cursor}")
+            before = (session.completed_at, session.id)
+        return self.rating_summary_repository.get_history(int(user_id), before, limit)
+
+    def get_summary(self, scope, subject=''):
+        summary = self.rating_summary_repository.get_total(scope, str(subject))
+        # Nothing rated yet: empty counters rather than a missing row
+        return summary or self._empty(scope, str(subject), 'total', RatingSummary.ALL_TIME)
+
+    def get_food_summaries(self):
+        return self.rating_summary_repository.get_totals('food')
+
+    def get_trend(self, scope, subject='', days=30, bucket='day'):
+        """Summaries of the last ``days`` days (today included), one per
+        day, week (starting on Monday) or month; buckets without ratings
+        are left out.
+
+        Weeks and months are rolled up from the daily rows, which are at
+        most a few hundred per subject.
+        """
+        if bucket not in self.BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket}")
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        rows = self.rating_summary_repository.get_days(scope, str(subject), since)
+        if bucket == 'day':
+            return rows
+
+        trend = {}
+        for row in rows:
+            start = row.period_start
+            if bucket == 'week':
+                start -= timedelta(days=start.weekday())
+            else:
+                start = start.replace(day=1)
+            total = trend.get(start)
+            if total is None:
+                total = trend[start] = self._empty(scope, str(subject), bucket, start)
+            total.count += row.count
+            total.rating_sum += row.rating_sum
+            for value in RatingSummary.RATINGS:
+                name = f'rating_{value}'
+                setattr(total, name, getattr(total, name) + getattr(row, name))
+            total.first_rated_at = min(
+                filter(None, (total.first_rated_at, row.first_rated_at)), default=None
+            )
+            total.last_rated_at = max(
+                filter(None, (total.last_rated_at, row.last_rated_at)), default=None
+            )
+        return list(trend.values())
+
+    def _empty(self, scope, subject, period, period_start):
+        # Transient: never added to the database session
+        return RatingSummary(
+            scope=scope, subject=subject, period=period, period_start=period_start,
+            count=0, rating_sum=0,
+            **{f'rating_{value}': 0 for value in RatingSummary.RATINGS}
+        )
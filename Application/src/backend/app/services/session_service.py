@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from flask import current_app
+from core import job_queue
+from repositories import SessionRepository, SessionFileStore
+from exceptions import SessionNotFoundError, SessionClosedError
+from models import TastingSession
+
+class SessionService:
+    def __init__(self):
+        self.session_repository = SessionRepository()
+        self._file_store = None
+
+    @property
+    def file_store(self):
+        # Built on first use, when the app configuration is available
+        if self._file_store is None:
+            self._file_store = SessionFileStore(
+                current_app.config["SESSION_DATA_DIR"]
+            )
+        return self._file_store
+
+    def create_session(
+        self, user_id, eeg_sampling_rate, hr_sampling_rate,
+        eda_sampling_rate, eeg_channels=6, food=None, started_at=None
+        ):
+        if started_at is not None:
+            started_at = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+            # Stored as naive UTC (the DateTime column drops the offset);
+            # times without an offset are taken as UTC already
+            if started_at.tzinfo is not None:
+                started_at = started_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return self.session_repository.create(
+            user_id, eeg_sampling_rate, hr_sampling_rate,
+            eda_sampling_rate, eeg_channels, food, started_at
+            )
+
+    def get_session(self, session_id, user_id, is_admin=False) -> TastingSession:
+        session = self.session_repository.get_by_id(session_id)
+        # Other users' sessions are reported as missing
+        if not session or (not is_admin and session.user_id != int(user_id)):
+            raise SessionNotFoundError(f"Session {session_id} not found.")
+        return session
+
+    def append_chunk(self, session, stream, source, length, offset=None):
+        if session.status != 'recording':
+            raise SessionClosedError(f"Session {session.id} is already complete.")
+        size = self.file_store.append(
+            session.id, stream, source, length, session.frame_size(stream), offset
+        )
+        self.session_repository.add_stream_bytes(session.id, stream, length)
+        return size
+
+    def complete_session(self, session, rating, food=None):
+        """Closes the session and queues its preprocessing.
+
+        Returns the session and the queued job.
+        """
+        if session.status != 'recording':
+            raise SessionClosedError(f"Session {session.id} is already complete.")
+        session = self.session_repository.complete(session, rating, food)
+        if session is None:
+            raise SessionClosedError("Session is already complete.")
+        job = job_queue.enqueue(
+            "preprocess_session", {"session_id": session.id}, user_id=session.user_id
+        )
+        return session, job
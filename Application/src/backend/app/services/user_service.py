@@ -1,16 +1,16 @@
+from datetime import date
+from jsonschema import ValidationError
 from repositories import UserRepository
-from werkzeug.security import generate_password_hash
-from exceptions import UserAlreadyExistsError
+from core import password_hasher, user_profile_cache, schema_registry
+from serializers import user_profile_serializer
 
 class UserService:
     def __init__(self):
         self.user_repository = UserRepository()
 
     def create_user(self, name, surname, dateOfBirth, gender,email, password):
-        if self.user_repository.get_by_email(email):
-            raise UserAlreadyExistsError("User with email already exists.")
-        
-        hashed_password = generate_password_hash(password)
+        # Duplicates are rejected by the insert itself (UserAlreadyExistsError)
+        hashed_password = password_hasher.hash(password)
         return self.user_repository.create(
             name, surname, dateOfBirth, gender, email, hashed_password
             )
@@ -18,5 +18,93 @@ class UserService:
     def get_user_by_id(self, user_id):
         return self.user_repository.get_by_id(user_id)
     
+    def get_user_profile(self, user_id):
+        """Returns (profile, version, updated_at), None for an unknown user.
+
+        Cached with the validators, so a conditional /auth/me from a warm
+        cache needs neither a query nor a serialization.
+        """
+        user_id = int(user_id)
+        entry = user_profile_cache.get(user_id)
+        if entry is None:
+            user = self.user_repository.get_by_id(user_id)
+            if not user:
+                return None
+            entry = (user_profile_serializer.dump(user), user.version, user.updated_at)
+            user_profile_cache.set(user_id, entry)
+        return entry
+
     def get_all_users(self):
-        return self.user_repository.get_all_users()
\ No newline at end of file
+        return self.user_repository.get_all_users()
+
+    def get_users_page(self, after_id=None, limit=100):
+        return self.user_repository.get_users_page(after_id, limit)
+
+    def iter_users(self, after_id=None, batch_size=500):
+        return self.user_repository.iter_users(after_id, batch_size)
+
+    def bulk_create_users(self, rows, batch_size=500):
+        """Registers many users at once and reports the outcome of every row.
+
+        Each result is {"row", "email", "status"} plus "id" for created users
+        or "error" otherwise; status is "created", "invalid" or "duplicate".
+        """
+        results = [
+            {"row": index, "email": row.get('email') if isinstance(row, dict) else None}
+            for index, row in enumerate(rows)
+        ]
+        valid = []
+        seen = set()
+        for index, row in enumerate(rows):
+            result = results[index]
+            try:
+                schema_registry.validate('registration_schema', row)
+                birth_date = date.fromisoformat(row['dateOfBirth'])
+            except ValidationError as e:
+                result.update(status="invalid", error=e.message)
+                continue
+            except ValueError:
+                result.update(status="invalid", error="Invalid dateOfBirth")
+                continue
+            if row['email'] in seen:
+                result.update(status="duplicate", error="Email repeated in import")
+                continue
+            seen.add(row['email'])
+            valid.append((index, dict(row, dateOfBirth=birth_date)))
+
+        # One IN query for all the emails already registered
+        existing = self.user_repository.get_existing_emails(list(seen))
+        to_insert = []
+        for index, row in valid:
+            if row['email'] in existing:
+                results[index].update(
+                    status="duplicate", error="Email already registered"
+                )
+            else:
+                to_insert.append((index, row))
+
+        hashes = password_hasher.hash_many([row['password'] for _, row in to_insert])
+        new_rows = [
+            {
+                "name": row['name'],
+                "surname": row['surname'],
+                "dateOfBirth": row['dateOfBirth'],
+                "gender": row['gender'],
+                "email": row['email'],
+                "password": hashed_password,
+                "user_type": 'user'
+            }
+            for (_, row), hashed_password in zip(to_insert, hashes)
+        ]
+        failed = set(self.user_repository.bulk_create(new_rows, batch_size))
+        ids = self.user_repository.get_ids_by_emails(
+            [row['email'] for row in new_rows if row['email'] not in failed]
+        )
+        for index, row in to_insert:
+            if row['email'] in failed:
+                results[index].update(
+                    status="duplicate", error="Email already registered"
+                )
+            else:
+                results[index].update(status="created", id=ids.get(row['email']))
+        return results
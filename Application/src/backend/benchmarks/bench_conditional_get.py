@@ -0,0 +1,69 @@
+"""Measure what a revalidated (304) user listing saves over a full 200.
+
+Serves a page of --users rows of the admin listing query (from an
+in-memory SQLite table) through core.http_cache.conditional_response and
+compares the time and body size of an unconditional GET with those of a
+GET sending back the page's ETag.
+
+Run from Application/src/backend:
+
+    python benchmarks/bench_conditional_get.py --users 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from flask import Flask
+from core.http_cache import conditional_response, listing_etag
+from core.json_provider import FastJSONProvider
+from fixtures import make_users
+from serializers import user_serializer
+
+
+def build_app(users):
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config["HTTP_CACHE_MAX_AGE"] = 0
+
+    def listing():
+        return conditional_response(
+            lambda: user_serializer.dump_many(users),
+            listing_etag(users, user_serializer.names)
+        )
+
+    app.add_url_rule("/users", view_func=listing, methods=["GET"])
+    return app
+
+
+def bench(client, headers, n_requests):
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        response = client.get("/users", headers=headers)
+    return (time.perf_counter() - start) / n_requests, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    client = build_app(make_users(args.users)).test_client()
+    etag = client.get("/users").headers["ETag"]
+    full, response = bench(client, {}, args.requests)
+    assert response.status_code == 200
+    body = len(response.data)
+    revalidated, response = bench(client, {"If-None-Match": etag}, args.requests)
+    assert response.status_code == 304
+    print(
+        f"{args.users} users: 200 {full * 1e3:.2f} ms ({body} bytes), "
+        f"304 {revalidated * 1e3:.2f} ms ({len(response.data)} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
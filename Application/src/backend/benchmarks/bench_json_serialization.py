@@ -0,0 +1,90 @@
+"""Measure the time to serialize a page of users into a JSON response.
+
+The users are the rows of the admin listing query (the columns of
+UserRepository.LISTING_COLUMNS, from an in-memory SQLite table). Compares
+the previous path (a dict built by hand per user, with
+dateOfBirth.isoformat(), encoded by Flask's default provider) with
+user_serializer encoded by FastJSONProvider, both with its stdlib
+fallback and with orjson when installed.
+
+Run from Application/src/backend:
+
+    python benchmarks/bench_json_serialization.py --users 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from core.json_provider import FastJSONProvider
+from fixtures import make_users
+from serializers import user_serializer
+
+
+def serialize_by_hand(user):
+    return {
+        "id": user.id,
+        "name": user.name,
+        "surname": user.surname,
+        "user_type": user.user_type,
+        "dateOfBirth": user.dateOfBirth.isoformat(),
+        "email": user.email
+    }
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    users = make_users(args.users)
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fallback_provider = FastJSONProvider(app)
+    fallback_provider.fast = False
+    fast_provider = FastJSONProvider(app)
+
+    cases = [
+        ("hand-built dicts + default provider",
+         lambda: default_provider.response([serialize_by_hand(u) for u in users])),
+        ("user_serializer + stdlib fallback",
+         lambda: fallback_provider.response(user_serializer.dump_many(users))),
+    ]
+    if fast_provider.fast:
+        cases.append(
+            ("user_serializer + orjson",
+             lambda: fast_provider.response(user_serializer.dump_many(users)))
+        )
+    else:
+        print("orjson is not installed, skipping the orjson case")
+
+    with app.app_context():
+        results = [(name, *timed(fn, args.repeat)) for name, fn in cases]
+        _, baseline, expected = results[0]
+        for name, elapsed, response in results:
+            same = fast_provider.loads(response.get_data()) == fast_provider.loads(
+                expected.get_data()
+            )
+            print(
+                f"{name:<38} {elapsed * 1000:8.2f} ms "
+                f"({baseline / elapsed:4.1f}x){'' if same else '  OUTPUT DIFFERS'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
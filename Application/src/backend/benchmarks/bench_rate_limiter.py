@@ -0,0 +1,106 @@
+"""Measure the per-request overhead of the auth rate limiter.
+
+Reports the raw cost of InMemoryTokenBucketStore.consume() with a key set
+larger than the store (so eviction is exercised) and the end-to-end cost
+of the limit() decorator on a Flask view, compared with the same view
+undecorated.
+
+Run from Application/src/backend:
+
+    python benchmarks/bench_rate_limiter.py
+"""
+import argparse
+import os
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from flask import Flask, jsonify
+from core.rate_limiter import (
+    InMemoryTokenBucketStore, RateLimiter, client_ip, json_field
+)
+
+
+def bench_store(n_calls, n_keys, max_keys):
+    store = InMemoryTokenBucketStore(max_keys=max_keys)
+    keys = [f"login_ip:10.0.{i // 256}.{i % 256}" for i in range(n_keys)]
+    start = time.perf_counter()
+    for i in range(n_calls):
+        store.consume(keys[i % n_keys], 1000.0, 1000)
+    elapsed = time.perf_counter() - start
+    return elapsed / n_calls, store.evictions
+
+
+def build_app(max_keys):
+    app = Flask(__name__)
+    app.config.update(
+        RATE_LIMIT_ENABLED=True,
+        RATE_LIMIT_MAX_KEYS=max_keys,
+        # High enough that nothing is rejected: only the overhead is measured
+        RATE_LIMITS={"login_ip": "1000000/second", "login_email": "1000000/second"},
+    )
+    limiter = RateLimiter()
+    limiter.init_app(app)
+
+    def plain():
+        return jsonify({})
+
+    def limited():
+        return jsonify({})
+
+    app.add_url_rule("/plain", view_func=plain, methods=["POST"])
+    app.add_url_rule(
+        "/limited",
+        view_func=limiter.limit(
+            ("login_ip", client_ip), ("login_email", json_field("email"))
+        )(limited),
+        methods=["POST"],
+    )
+    return app
+
+
+def bench_view(client, path, n_requests):
+    payload = {"email": "admin@example.com", "password": "secret"}
+    start = time.perf_counter()
+    for i in range(n_requests):
+        response = client.post(
+            path, json=payload,
+            environ_base={"REMOTE_ADDR": f"10.1.{(i // 256) % 256}.{i % 256}"},
+        )
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / n_requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--keys", type=int, default=50000)
+    parser.add_argument("--max-keys", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    per_call, evictions = bench_store(args.calls, args.keys, args.max_keys)
+    print(
+        f"store.consume: {per_call * 1e6:.2f} us/call "
+        f"({args.keys} keys, max {args.max_keys}, {evictions} evictions)"
+    )
+
+    client = build_app(args.max_keys).test_client()
+    bench_view(client, "/plain", 200)
+    bench_view(client, "/limited", 200)
+    plain = bench_view(client, "/plain", args.requests)
+    limited = bench_view(client, "/limited", args.requests)
+    overhead = limited - plain
+    print(
+        f"view: plain {plain * 1e6:.1f} us, limited {limited * 1e6:.1f} us, "
+        f"limiter overhead {overhead * 1e6:.1f} us/request"
+    )
+    if overhead >= 1e-3:
+        print("WARNING: limiter overhead is above 1 ms per request")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare per-request schema loading against the precompiled SchemaRegistry.
+
+Run from Application/src/backend:
+
+    python benchmarks/bench_schema_validation.py --requests 5000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from flask import Flask, request, jsonify, make_response
+from jsonschema import validate, ValidationError
+from core.schema_registry import SchemaRegistry
+
+SCHEMAS_DIR = os.path.join(APP_DIR, "schemas")
+
+PAYLOADS = {
+    "registration_schema": {
+        "name": "Steve",
+        "surname": "Rogers",
+        "dateOfBirth": "1918-07-04",
+        "gender": "Male",
+        "email": "steve.rogers@example.com",
+        "password": "secret",
+    },
+    "login_schema": {
+        "email": "steve.rogers@example.com",
+        "password": "secret",
+    },
+}
+
+
+def build_app(registry):
+    app = Flask(__name__)
+
+    # Old path: the schema file is opened and parsed on every request
+    @app.post("/before/<name>")
+    def before(name):
+        data = request.get_json()
+        with open(os.path.join(SCHEMAS_DIR, f"{name}.json"), "r") as schema_file:
+            schema = json.load(schema_file)
+        try:
+            validate(instance=data, schema=schema)
+        except ValidationError as e:
+            return make_response(jsonify({"error": e.message}), 400)
+        return make_response(jsonify({}), 200)
+
+    # New path: validators are compiled once at startup
+    @app.post("/after/<name>")
+    def after(name):
+        data = request.get_json()
+        try:
+            registry.validate(name, data)
+        except ValidationError as e:
+            return make_response(jsonify({"error": e.message}), 400)
+        return make_response(jsonify({}), 200)
+
+    return app
+
+
+def run(client, path, payload, n_requests):
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        response = client.post(path, json=payload)
+        assert response.status_code == 200, response.get_json()
+    return n_requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    registry = SchemaRegistry(SCHEMAS_DIR)
+    registry.load()
+    client = build_app(registry).test_client()
+
+    for name, payload in PAYLOADS.items():
+        # Warm up both paths before measuring
+        run(client, f"/before/{name}", payload, 50)
+        run(client, f"/after/{name}", payload, 50)
+        before = run(client, f"/before/{name}", payload, args.requests)
+        after = run(client, f"/after/{name}", payload, args.requests)
+        print(
+            f"{name:<22} before: {before:9.1f} req/s   "
+            f"after: {after:9.1f} req/s   speedup: {after / before:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Measure backend cold start: imports, create_app() and the first request.
+
+Each run is a fresh interpreter, so nothing is cached between runs
+except the OS page cache. The import breakdown comes from a run under
+``python -X importtime``. With --server the production entry point
+(python app.py with APP_ENV=production) is started instead and timed
+until it serves its first /metrics request.
+
+All runs share one scratch SQLite database (or DATABASE_URL), so only
+the first run applies the migrations.
+
+Run from Application/src/backend:
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --server
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+APP_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+response = application.test_client().get("/metrics")
+assert response.status_code == 200, response.status_code
+served = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "create_app": created - imported,
+    "first_request": served - created,
+    "total": served - start,
+}))
+"""
+
+
+def environment(extra=None):
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-of-a-sensible-length")
+    env.setdefault("JOB_WORKERS", "0")
+    env.setdefault("PASSWORD_HASH_WORKERS", "0")
+    env.update(extra or {})
+    return env
+
+
+def run_probe(env, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    result = subprocess.run(
+        command + ["-c", PROBE], cwd=APP_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, result.stderr
+
+
+def top_imports(stderr, count):
+    """Slowest imports of app.py and its direct dependencies, as
+    (cumulative microseconds, module) from the -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # the header line
+        module = parts[2].rstrip()
+        # Nesting is shown by indentation: " app", then "   flask", ...
+        if len(module) - len(module.lstrip()) <= 3:
+            entries.append((int(parts[1]), module.strip()))
+    return sorted(entries, reverse=True)[:count]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_server(env, timeout):
+    port = free_port()
+    env = environment({
+        **env, "APP_ENV": "production", "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port), "WEB_WORKERS": "1",
+    })
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=APP_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1):
+                    return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                if process.poll() is not None:
+                    raise RuntimeError("Server exited during startup")
+                time.sleep(0.01)
+        raise RuntimeError("Server did not start in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--server", action="store_true")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    env = environment()
+    if "DATABASE_URL" not in env:
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}"
+    # Applies the migrations, so the measured runs start from a ready schema
+    run_probe(env)
+
+    if args.server:
+        times = [run_server(env, args.timeout) for _ in range(args.runs)]
+        print(
+            f"time to first served request: median {statistics.median(times) * 1000:.0f} ms, "
+            f"min {min(times) * 1000:.0f} ms over {args.runs} runs"
+        )
+        return
+
+    runs = [run_probe(env)[0] for _ in range(args.runs)]
+    for phase in ("import", "create_app", "first_request", "total"):
+        values = [run[phase] for run in runs]
+        print(
+            f"{phase:<14} median {statistics.median(values) * 1000:8.1f} ms   "
+            f"min {min(values) * 1000:8.1f} ms"
+        )
+
+    _, stderr = run_probe(env, importtime=True)
+    print("\nslowest imports (python -X importtime):")
+    for cumulative_us, module in top_imports(stderr, args.top):
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
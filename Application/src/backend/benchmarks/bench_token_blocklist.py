@@ -0,0 +1,116 @@
+"""Measure the per-request cost of the revoked-token blocklist check.
+
+Reports the raw cost of a blocklist lookup with --revoked tokens revoked,
+for the in-memory store and the database store (a SQLite file, or --url),
+and the end-to-end cost of a JWT-protected Flask view with and without
+the blocklist hook.
+
+Run from Application/src/backend:
+
+    python benchmarks/bench_token_blocklist.py --revoked 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token, verify_jwt_in_request
+from core import db
+from core.token_blocklist import InMemoryBlocklistStore, TokenBlocklist
+from repositories import RevokedTokenRepository
+
+
+def fill(store, n_revoked):
+    expires_at = time.time() + 3600
+    jtis = [str(uuid.uuid4()) for _ in range(n_revoked)]
+    for jti in jtis:
+        store.add(jti, expires_at)
+    return jtis
+
+
+def bench_lookups(store, jtis, n_calls):
+    misses = [str(uuid.uuid4()) for _ in range(1000)]
+    start = time.perf_counter()
+    for i in range(n_calls):
+        # Most requests carry a live token: mostly misses, some hits
+        store.contains(jtis[i % len(jtis)] if i % 10 == 0 else misses[i % 1000])
+    return (time.perf_counter() - start) / n_calls
+
+
+def build_app(url, with_blocklist, store=None):
+    app = Flask(__name__)
+    app.config.update(
+        JWT_SECRET_KEY="benchmark-secret-key-of-a-sensible-length",
+        SQLALCHEMY_DATABASE_URI=url,
+    )
+    jwt = JWTManager(app)
+    db.init_app(app)
+    if with_blocklist:
+        TokenBlocklist().init_app(app, jwt, store)
+
+    def protected():
+        verify_jwt_in_request()
+        return jsonify({})
+
+    app.add_url_rule("/protected", view_func=protected)
+    return app
+
+
+def bench_view(app, n_requests):
+    with app.app_context():
+        token = create_access_token(identity="1")
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(200):
+        client.get("/protected", headers=headers)
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        response = client.get("/protected", headers=headers)
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / n_requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--revoked", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    memory_store = InMemoryBlocklistStore()
+    jtis = fill(memory_store, args.revoked)
+    per_call = bench_lookups(memory_store, jtis, args.calls)
+    print(f"memory store: {per_call * 1e6:.3f} us/lookup ({args.revoked} revoked)")
+
+    app = build_app(url, True, RevokedTokenRepository())
+    with app.app_context():
+        db.create_all()
+        database_store = RevokedTokenRepository()
+        # A few thousand rows are enough to show the indexed lookup cost
+        db_jtis = fill(database_store, min(args.revoked, 5000))
+        per_call = bench_lookups(database_store, db_jtis, min(args.calls, 20000))
+    print(f"database store: {per_call * 1e6:.1f} us/lookup ({url.split('@')[-1]})")
+
+    plain = bench_view(build_app(url, False), args.requests)
+    memory = bench_view(build_app(url, True, memory_store), args.requests)
+    database = bench_view(app, args.requests)
+    print(
+        f"view: no blocklist {plain * 1e6:.1f} us, "
+        f"memory {memory * 1e6:.1f} us (+{(memory - plain) * 1e6:.1f}), "
+        f"database {database * 1e6:.1f} us (+{(database - plain) * 1e6:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
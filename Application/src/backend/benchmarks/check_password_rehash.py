@@ -0,0 +1,63 @@
+"""Check that PasswordHasher.needs_rehash accepts the hashes of its own method.
+
+For every way of spelling PASSWORD_HASH_METHOD that werkzeug accepts
+(bare, partial or full parameters), a hash generated with that method
+must not need a rehash, while a hash made with other parameters must.
+The spellings werkzeug refuses to hash with (scrypt takes all three
+parameters or none) are only checked to expand like the others. Exits
+with status 1 on a mismatch.
+
+Run from Application/src/backend:
+
+    python benchmarks/check_password_rehash.py
+"""
+import argparse
+import os
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from werkzeug.security import generate_password_hash
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+from core.password_hasher import PasswordHasher, stored_method
+
+METHODS = [
+    "scrypt",
+    "scrypt:32768:8:1",
+    "scrypt:16384:8:2",
+    "pbkdf2",
+    "pbkdf2:sha512",
+    "pbkdf2:sha256:1000",
+]
+EXPANSIONS = {
+    "scrypt:16384": "scrypt:16384:8:1",
+    "scrypt:16384:4": "scrypt:16384:4:1",
+    "pbkdf2:sha512": f"pbkdf2:sha512:{DEFAULT_PBKDF2_ITERATIONS}",
+}
+OTHER_HASH_METHOD = "pbkdf2:sha1:500"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    hasher = PasswordHasher()
+    failures = 0
+    for method in METHODS:
+        hasher.method = method
+        own = hasher.needs_rehash(generate_password_hash("secret", method))
+        other = hasher.needs_rehash(generate_password_hash("secret", OTHER_HASH_METHOD))
+        ok = not own and other
+        failures += not ok
+        print(f"{method:<20} own hash rehash={own!s:<5} other hash rehash={other!s:<5} "
+              f"{'ok' if ok else 'FAILED'}")
+    for method, expected in EXPANSIONS.items():
+        ok = stored_method(method) == expected
+        failures += not ok
+        print(f"{method:<20} stored as {stored_method(method):<39} {'ok' if ok else 'FAILED'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Data shared by the benchmarks.
+
+Imported by the benchmark scripts (which run with this directory on
+sys.path) after they have put app/ on sys.path.
+"""
+from datetime import date
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from models import User
+from repositories import UserRepository
+
+
+def make_users(n_users):
+    """The rows of the admin listing query (UserRepository.LISTING_COLUMNS)
+    for ``n_users`` users, from an in-memory SQLite table."""
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {
+                "id": i,
+                "name": f"Name{i}",
+                "surname": f"Surname{i}",
+                "dateOfBirth": date(1950 + i % 50, 1 + i % 12, 1 + i % 28),
+                "gender": "Female" if i % 2 else "Male",
+                "email": f"user{i}@example.com",
+                "password": "x",
+                "user_type": "user",
+            }
+            for i in range(1, n_users + 1)
+        ])
+        return session.query(*UserRepository.LISTING_COLUMNS).order_by(User.id).all()
@@ -0,0 +1,161 @@
+"""Measure backend throughput for an increasing number of server workers.
+
+For each worker count the production server (APP_ENV=production) is
+started as a subprocess, hammered by concurrent clients for a fixed
+duration and then stopped. The database settings (DB_HOST, DB_USER, ...)
+are taken from the environment, as for a normal start.
+
+The clients all come from one address (and, by default, log in as one
+user), so the server runs with RATE_LIMIT_ENABLED=false unless
+--rate-limit is given; otherwise the numbers would mostly measure 429s.
+Any 429 in a run is reported as a warning.
+
+Run from Application/src/backend:
+
+    python benchmarks/load_test.py --workers 1 2 4 --concurrency 32 \\
+        --path /auth/login --body '{"email": "admin", "password": "..."}'
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+
+
+def wait_for_port(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def start_server(workers, threads, port, rate_limit):
+    env = dict(
+        os.environ,
+        APP_ENV="production",
+        SERVER_PORT=str(port),
+        WEB_WORKERS=str(workers),
+        WEB_THREADS=str(threads),
+        RATE_LIMIT_ENABLED="true" if rate_limit else "false",
+    )
+    return subprocess.Popen(
+        [sys.executable, "app.py"],
+        cwd=APP_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def client_loop(url, method, body, stop_at, latencies, statuses, lock):
+    data = body.encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    local_latencies, local_statuses = [], {}
+    while time.monotonic() < stop_at:
+        req = urllib.request.Request(url, data=data, method=method, headers=headers)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except OSError:
+            status = "error"
+        local_latencies.append(time.perf_counter() - start)
+        local_statuses[status] = local_statuses.get(status, 0) + 1
+    with lock:
+        latencies.extend(local_latencies)
+        for status, count in local_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+
+def run_load(url, method, body, concurrency, duration):
+    latencies, statuses, lock = [], {}, threading.Lock()
+    stop_at = time.monotonic() + duration
+    clients = [
+        threading.Thread(
+            target=client_loop,
+            args=(url, method, body, stop_at, latencies, statuses, lock),
+        )
+        for _ in range(concurrency)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    return latencies, statuses
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--method", default="POST")
+    parser.add_argument("--path", default="/auth/login")
+    parser.add_argument(
+        "--body",
+        default=json.dumps({"email": "admin", "password": "admin"}),
+        help="JSON request body (empty string for none)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="keep the rate limiter enabled (measures the 429 path too)",
+    )
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    body = args.body or None
+
+    print(f"{'workers':>7} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}  statuses")
+    for workers in args.workers:
+        server = start_server(workers, args.threads, args.port, args.rate_limit)
+        try:
+            if not wait_for_port("127.0.0.1", args.port, timeout=60):
+                print(f"{workers:>7} server did not start")
+                continue
+            # Let every worker finish booting before measuring
+            run_load(url, args.method, body, args.concurrency, 2.0)
+            latencies, statuses = run_load(
+                url, args.method, body, args.concurrency, args.duration
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+        print(
+            f"{workers:>7} {len(latencies) / args.duration:>10.1f} "
+            f"{percentile(latencies, 50) * 1000:>9.1f} "
+            f"{percentile(latencies, 99) * 1000:>9.1f}  {statuses}"
+        )
+        if statuses.get(429):
+            print(
+                f"warning: {statuses[429]} of {len(latencies)} responses were 429s, "
+                "the numbers above include the rate limiter's rejections"
+            )
+
+
+if __name__ == "__main__":
+    main()
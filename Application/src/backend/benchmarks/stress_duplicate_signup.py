@@ -0,0 +1,123 @@
+"""Fire parallel duplicate signups and check that exactly one succeeds.
+
+Every round sends --concurrency simultaneous /auth/signup requests for
+the same fresh email against a running server. Exactly one of them must
+get 201 and all the others 409. Latency percentiles are printed for all
+rounds together.
+
+All the requests come from one address, so the server must run with
+RATE_LIMIT_ENABLED=false (signup_ip allows 10/minute by default); the
+script stops at the first 429.
+
+To compare two versions of the server, save the numbers of a run
+against the first one and pass them as the baseline of a run against
+the second (same --concurrency and --rounds):
+
+    RATE_LIMIT_ENABLED=false python app.py          # in another shell
+    python benchmarks/stress_duplicate_signup.py --save before.json
+    # restart the server on the other version
+    python benchmarks/stress_duplicate_signup.py --baseline before.json
+
+Run from Application/src/backend.
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+
+def signup(base_url, payload, barrier, results, index):
+    req = urllib.request.Request(
+        f"{base_url}/auth/signup",
+        data=json.dumps(payload).encode(),
+        method="POST",
+        headers={"Content-Type": "application/json"},
+    )
+    barrier.wait()
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    results[index] = (status, time.perf_counter() - start)
+
+
+def run_round(base_url, concurrency):
+    payload = {
+        "name": "Stress",
+        "surname": "Test",
+        "dateOfBirth": "1990-01-01",
+        "gender": "Female",
+        "email": f"stress-{uuid.uuid4().hex}@example.com",
+        "password": "secret",
+    }
+    barrier = threading.Barrier(concurrency)
+    results = [None] * concurrency
+    threads = [
+        threading.Thread(target=signup, args=(base_url, payload, barrier, results, i))
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--save", help="write the latency percentiles to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of a previous run (--save) to compare with")
+    args = parser.parse_args()
+
+    latencies, failures = [], 0
+    for round_number in range(args.rounds):
+        results = run_round(args.base_url, args.concurrency)
+        statuses = [status for status, _ in results]
+        if 429 in statuses:
+            print("Rate limited (429): restart the server with RATE_LIMIT_ENABLED=false")
+            sys.exit(1)
+        latencies.extend(latency for _, latency in results)
+        created = statuses.count(201)
+        conflicts = statuses.count(409)
+        if created != 1 or conflicts != args.concurrency - 1:
+            failures += 1
+            print(f"round {round_number}: unexpected statuses {sorted(statuses)}")
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    result = {
+        "rounds": args.rounds,
+        "concurrency": args.concurrency,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+    print(
+        f"{args.rounds} rounds x {args.concurrency} signups: "
+        f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, "
+        f"{failures} failed rounds"
+    )
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline["rounds"], baseline["concurrency"]) != (args.rounds, args.concurrency):
+            print("warning: the baseline was run with other --rounds/--concurrency")
+        for key in ("p50_ms", "p99_ms"):
+            change = (result[key] / baseline[key] - 1) * 100
+            print(f"{key[:3]}: baseline {baseline[key]:.1f} ms -> {result[key]:.1f} ms ({change:+.0f}%)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,14 @@ CREATE TABLE IF NOT EXISTS users (
     email VARCHAR(100) NOT NULL UNIQUE, 
     password VARCHAR(255) NOT NULL,
     user_type ENUM('admin', 'user') NOT NULL DEFAULT 'user',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    version INT NOT NULL DEFAULT 1,
+    updated_at DATETIME NULL
 );
 
 INSERT INTO users (name, surname, dateOfBirth, gender, email, password, user_type)
 VALUES (
-    'Admin', 'FoodBack', '1990-01-01', 'male',
+    'Admin', 'FoodBack', '1990-01-01', 'Male',
     'admin', 
     'scrypt:32768:8:1$ZSsde058VzygOIM5$035c36d29e21d7d39886a121d164f3fd5652652a93dde2c033a06a1c4b690972d09bd422ff9ad089d05f9aad26e87c5552086158faf95108e6fba955104e2225',
     'admin'